@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \dev_bench_expr_vm.py
+# Created Date: Sunday, October 18th 2026, 7:48:21 pm
+# Author: Christian Perwass
+# <LICENSE id="Apache-2.0">
+#
+#   Functional JSON module
+#   Copyright 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# </LICENSE>
+###
+
+
+# Benchmark of the expression VM against the recursive expression processing.
+# The lambda calculus samples of the documentation are processed with both engines,
+# as well as a document with many nested arithmetic expressions.
+# The results of both engines are compared, before they are timed.
+
+import sys
+import json
+import time
+from pathlib import Path
+
+pathFile = Path(__file__)
+sPathIson = pathFile.parent.parent.as_posix()
+if sPathIson not in sys.path:
+    sys.path.insert(0, sPathIson)
+# endif
+
+import ison
+
+
+################################################################################
+def LoadNotebookData(_pathNotebook: Path) -> list[dict]:
+    dicNotebook = json.loads(_pathNotebook.read_text())
+    lData = []
+    for dicCell in dicNotebook["cells"]:
+        if dicCell["cell_type"] != "code":
+            continue
+        # endif
+        sSource = "".join(dicCell["source"]).split("dicResult =")[0]
+        dicVars = {}
+        exec(sSource, dicVars)
+        if isinstance(dicVars.get("dicData"), dict):
+            lData.append(dicVars["dicData"])
+        # endif
+    # endfor
+    return lData
+
+
+# enddef
+
+
+################################################################################
+def CreateArithmeticData(_iCount: int) -> dict:
+    return {
+        "__globals__": {"iA": 2, "lValues": [1, 2, 3]},
+        "lResult": [
+            f"$sum{{$prod{{${{iA}}, {i}}}, $div{{$sum{{*${{lValues}}}}, 3}}, $len{{${{lValues}}}}}}"
+            for i in range(_iCount)
+        ],
+    }
+
+
+# enddef
+
+
+################################################################################
+def TimeRun(_lData: list[dict], _bExprVM: bool, _iRepeat: int) -> float:
+    dStart = time.perf_counter()
+    for iIdx in range(_iRepeat):
+        for dicData in _lData:
+            ison.run.Run(xData=dicData, bExprVM=_bExprVM)
+        # endfor
+    # endfor
+    return (time.perf_counter() - dStart) / _iRepeat
+
+
+# enddef
+
+pathDocs = pathFile.parent.parent.parent / "docs" / "source" / "ipy"
+dicBench = {
+    "lambda-calc": LoadNotebookData(pathDocs / "ison-lambda-calc.ipynb"),
+    "lambda": LoadNotebookData(pathDocs / "ison-lambda.ipynb"),
+    "arithmetic": [CreateArithmeticData(2000)],
+}
+
+print(f"{'benchmark':>12} {'tree [ms]':>10} {'vm [ms]':>10} {'speed-up':>9}")
+for sName, lData in dicBench.items():
+    for dicData in lData:
+        if ison.run.Run(xData=dicData) != ison.run.Run(xData=dicData, bExprVM=True):
+            raise RuntimeError(f"Results of benchmark '{sName}' differ")
+        # endif
+    # endfor
+
+    dTree = TimeRun(lData, False, 10)
+    dVM = TimeRun(lData, True, 10)
+    print(f"{sName:>12} {dTree * 1e3:10.2f} {dVM * 1e3:10.2f} {dTree / dVM:9.2f}")
+# endfor
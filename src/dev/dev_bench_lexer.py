@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \dev_bench_lexer.py
+# Created Date: Tuesday, October 13th 2026, 2:17:45 pm
+# Author: Christian Perwass
+# <LICENSE id="Apache-2.0">
+#
+#   Functional JSON module
+#   Copyright 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# </LICENSE>
+###
+
+# Benchmark of the expression lexer against the former character by character
+# algorithm, for expressions of increasing nesting depth.
+# Each expression is analyzed like the parser does it: the match list of the string
+# is obtained and then, recursively, the match lists of all function arguments.
+
+import sys
+import time
+from pathlib import Path
+
+pathFile = Path(__file__)
+sPathIson = pathFile.parent.parent.as_posix()
+if sPathIson not in sys.path:
+    sys.path.insert(0, sPathIson)
+# endif
+
+from ison.core import expr_lexer
+from ison.core.defines import reVarStart
+
+
+################################################################################
+# Former implementation of text.FindBalancedChar()
+def FindBalancedChar_CharWise(_sValue, _iStartIdx, _sEndChar):
+    iStartCnt = 1
+    sStartChar = _sValue[_iStartIdx]
+
+    iIdx = _iStartIdx + 1
+    iCnt = len(_sValue)
+    while iIdx < iCnt:
+        sChar = _sValue[iIdx]
+        if sChar == _sEndChar:
+            iStartCnt -= 1
+            if iStartCnt == 0:
+                break
+            # endif
+        elif sChar == sStartChar:
+            iStartCnt += 1
+        # endif
+        iIdx += 1
+    # endwhile
+
+    return iIdx
+
+
+# enddef
+
+
+################################################################################
+# Former implementation of text.SplitArgs() without error handling
+def SplitArgs_CharWise(_sValue, sSplitChar=","):
+    lArgs = []
+    sOpen = "([{"
+    sClose = ")]}"
+    lBrkCnt = [0, 0, 0]
+
+    sStringChars = "'`\""
+    sActStrChar = None
+
+    iStart = 0
+    sChar = None
+    for iIdx in range(len(_sValue)):
+        sPrevChar = sChar
+        sChar = _sValue[iIdx]
+        if sChar in sStringChars and sPrevChar != "\\":
+            if sActStrChar is None:
+                sActStrChar = sChar
+            elif sActStrChar == sChar:
+                sActStrChar = None
+            # endif
+        # endif
+
+        if sActStrChar is not None:
+            continue
+        # endif
+
+        iOpenIdx = sOpen.find(sChar)
+        iCloseIdx = sClose.find(sChar)
+
+        if sChar == sSplitChar and all((x == 0 for x in lBrkCnt)):
+            lArgs.append(_sValue[iStart:iIdx].strip())
+            iStart = iIdx + 1
+        elif iOpenIdx >= 0:
+            lBrkCnt[iOpenIdx] += 1
+        elif iCloseIdx >= 0:
+            lBrkCnt[iCloseIdx] -= 1
+        # endif
+    # endfor
+
+    lArgs.append(_sValue[iStart:].strip())
+    return lArgs
+
+
+# enddef
+
+
+################################################################################
+def GetVarMatchList_CharWise(_sValue):
+    lMatch = []
+    iSearchIdx = 0
+    while True:
+        xMatch = reVarStart.search(_sValue, iSearchIdx)
+        if xMatch is None:
+            break
+        # endif
+
+        if xMatch.group("func") is not None:
+            iEnd = FindBalancedChar_CharWise(_sValue, xMatch.end() - 1, "}")
+            lArgs = SplitArgs_CharWise(_sValue[xMatch.end() : iEnd])
+        else:
+            iEnd = xMatch.end() - 1
+            lArgs = []
+        # endif
+        lMatch.append(lArgs)
+        iSearchIdx = iEnd + 1
+    # endwhile
+
+    return lMatch
+
+
+# enddef
+
+
+################################################################################
+def AnalyzeCharWise(_sValue):
+    for lArgs in GetVarMatchList_CharWise(_sValue):
+        for sArg in lArgs:
+            if "$" in sArg:
+                AnalyzeCharWise(sArg)
+            # endif
+        # endfor
+    # endfor
+
+
+# enddef
+
+
+################################################################################
+def AnalyzeLexer(_sValue):
+    expr_lexer.GetVarMatchTree(_sValue, reVarStart)
+
+
+# enddef
+
+
+################################################################################
+def CreateExpression(_iDepth):
+    sExpr = "${a:b}"
+    for iLevel in range(_iDepth):
+        sExpr = f"$sum{{{iLevel}, 'text, {iLevel}', {sExpr}, [1, 2, 3]}}"
+    # endfor
+    return sExpr
+
+
+# enddef
+
+
+################################################################################
+def TimeFunc(_funcAnalyze, _sExpr, _iRepeat):
+    dStart = time.perf_counter()
+    for iIdx in range(_iRepeat):
+        _funcAnalyze(_sExpr)
+    # endfor
+    return (time.perf_counter() - dStart) / _iRepeat
+
+
+# enddef
+
+print(f"{'depth':>6} {'length':>8} {'char-wise [ms]':>15} {'lexer [ms]':>11} {'speed-up':>9}")
+for iDepth in [1, 2, 4, 8, 16, 32, 64, 128, 256]:
+    sExpr = CreateExpression(iDepth)
+    iRepeat = max(3, 2000 // (iDepth * iDepth))
+    dCharWise = TimeFunc(AnalyzeCharWise, sExpr, iRepeat)
+    dLexer = TimeFunc(AnalyzeLexer, sExpr, iRepeat)
+    print(f"{iDepth:6d} {len(sExpr):8d} {dCharWise * 1e3:15.3f} {dLexer * 1e3:11.3f} {dCharWise / dLexer:9.1f}")
+# endfor
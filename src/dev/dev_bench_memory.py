@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \dev_bench_memory.py
+# Created Date: Thursday, October 15th 2026, 9:48:12 am
+# Author: Christian Perwass
+# <LICENSE id="Apache-2.0">
+#
+#   Functional JSON module
+#   Copyright 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# </LICENSE>
+###
+
+
+# Memory benchmark of the copy-on-write data handling.
+# Each mode is run in a separate process, so that the peak resident set size (RSS)
+# of the processing can be measured. Mode 'deepcopy' restores the former behavior,
+# where the input data and all variable and include updates are deep copied.
+# Mode 'copy-on-write' is the current implementation.
+
+import sys
+import copy
+import json
+import time
+import resource
+import tempfile
+import subprocess
+from pathlib import Path
+
+pathFile = Path(__file__)
+sPathIson = pathFile.parent.parent.as_posix()
+if sPathIson not in sys.path:
+    sys.path.insert(0, sPathIson)
+# endif
+
+import ison
+from ison.util import data
+
+
+################################################################################
+def CreateLibrary(_iMatCnt):
+    dicLib = {
+        "__globals__": {"fRoughness": 0.5},
+        "dicMaterials": {},
+    }
+    for iIdx in range(_iMatCnt):
+        dicLib["dicMaterials"][f"mat_{iIdx}"] = {
+            "sType": "principled",
+            "lBaseColor": [0.8, 0.2, 0.1, 1.0],
+            "lTextures": [f"tex/mat_{iIdx}_{x}.png" for x in ["diffuse", "normal", "rough"]],
+            "fRoughness": "${fRoughness}" if iIdx % 100 == 0 else 0.3,
+        }
+    # endfor
+    return dicLib
+
+
+# enddef
+
+
+################################################################################
+def CreateDocument(_iVertexCnt):
+    return {
+        "__includes__": ["library.json"],
+        "__globals__": {"sName": "scene", "iSamples": 128},
+        "sTitle": "${sName} with $sum{${iSamples}, 0} samples",
+        "dicMesh": {
+            "lVertices": [[float(i), float(i + 1), float(i + 2)] for i in range(_iVertexCnt)],
+            "lFaces": [[i, i + 1, i + 2] for i in range(0, _iVertexCnt - 2, 3)],
+        },
+    }
+
+
+# enddef
+
+
+################################################################################
+def UseDeepCopy():
+    funcUpdateDict = data.UpdateDict
+
+    def UpdateDictDeepCopy(*args, bCopyOnWrite=False, **kwargs):
+        return funcUpdateDict(*args, **kwargs)
+
+    # enddef
+
+    data.UpdateDict = UpdateDictDeepCopy
+    data.CopyDataSpine = lambda _xData, _dicShared=None, **kwargs: copy.deepcopy(_xData)
+    data.CollectStaticData = lambda _xData, _dicStatic: False
+
+
+# enddef
+
+
+################################################################################
+def RunMode(_sMode, _sPathData):
+    if _sMode == "deepcopy":
+        UseDeepCopy()
+    # endif
+
+    pathData = Path(_sPathData)
+    dicData = json.loads((pathData / "document.json").read_text())
+    iRssStart = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    dStart = time.perf_counter()
+    xParser = ison.Parser({})
+    dicResult = xParser.Process(dicData, sImportPath=pathData.as_posix())
+    dTime = time.perf_counter() - dStart
+
+    iRssPeak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({"iRssStart": iRssStart, "iRssPeak": iRssPeak, "dTime": dTime, "sTitle": dicResult["sTitle"]}))
+
+
+# enddef
+
+
+################################################################################
+def Main():
+    with tempfile.TemporaryDirectory() as sPathData:
+        pathData = Path(sPathData)
+        (pathData / "library.json").write_text(json.dumps(CreateLibrary(20000)))
+        (pathData / "document.json").write_text(json.dumps(CreateDocument(300000)))
+
+        print(f"{'mode':>14} {'RSS start [MB]':>15} {'RSS peak [MB]':>14} {'processing [MB]':>16} {'time [s]':>9}")
+        for sMode in ["deepcopy", "copy-on-write"]:
+            xProc = subprocess.run([sys.executable, __file__, sMode, sPathData], capture_output=True, text=True)
+            if xProc.returncode != 0:
+                raise RuntimeError(f"Benchmark mode '{sMode}' failed:\n{xProc.stderr}")
+            # endif
+            dicRes = json.loads(xProc.stdout.strip().splitlines()[-1])
+            # ru_maxrss is given in kilobytes on Linux and in bytes on macOS
+            dScale = 1024.0 * 1024.0 if sys.platform == "darwin" else 1024.0
+            dStart = dicRes["iRssStart"] / dScale
+            dPeak = dicRes["iRssPeak"] / dScale
+            print(f"{sMode:>14} {dStart:15.1f} {dPeak:14.1f} {dPeak - dStart:16.1f} {dicRes['dTime']:9.2f}")
+        # endfor
+    # endwith
+
+
+# enddef
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2:
+        RunMode(sys.argv[1], sys.argv[2])
+    else:
+        Main()
+    # endif
+# endif
@@ -28,6 +28,9 @@
 from .core.cls_parser import CParser as Parser
 from .core.cls_parser_error import CParserError as ParserError
 from .core.cls_parser_trace import EWarningType
+from .core.cls_server import CServer as Server
+from .core.cls_client import CClient as Client
 from .core import lambda_parser
 from . import util
 from . import run
+from .run import Prepare
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \cls_client.py
+# Created Date: Monday, October 19th 2026, 2:05:11 pm
+# Author: Christian Perwass
+# <LICENSE id="Apache-2.0">
+#
+#   Functional JSON module
+#   Copyright 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# </LICENSE>
+###
+
+import json
+import socket
+from typing import Optional
+
+from ..util import io
+
+
+####################################################################################
+# Client of an ISON server (see CServer). The connection is opened with the first request
+# and kept open for further requests, until Close() is called.
+class CClient:
+    def __init__(self, _sSocketPath: str, *, fTimeout: Optional[float] = None):
+        self.sSocketPath: str = io.ToAbsPath(_sSocketPath)
+        self.fTimeout: Optional[float] = fTimeout
+
+        self._xSocket: Optional[socket.socket] = None
+        self._xIn = None
+        self._iNextId: int = 0
+
+    # enddef
+
+    ################################################################################
+    def __enter__(self):
+        return self
+
+    # enddef
+
+    ################################################################################
+    def __exit__(self, _xType, _xValue, _xTraceback):
+        self.Close()
+
+    # enddef
+
+    ################################################################################
+    def Connect(self):
+        if self._xSocket is not None:
+            return
+        # endif
+
+        xSocket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        xSocket.settimeout(self.fTimeout)
+        try:
+            xSocket.connect(self.sSocketPath)
+        except OSError as xEx:
+            xSocket.close()
+            raise RuntimeError("Cannot connect to ISON server on socket '{}': {}".format(self.sSocketPath, str(xEx)))
+        # endtry
+
+        self._xSocket = xSocket
+        self._xIn = xSocket.makefile("rb")
+
+    # enddef
+
+    ################################################################################
+    def Close(self):
+        if self._xSocket is not None:
+            self._xIn.close()
+            self._xSocket.close()
+            self._xIn = None
+            self._xSocket = None
+        # endif
+
+    # enddef
+
+    ################################################################################
+    # Send the request and return the response of the server (see CServer)
+    def Request(self, _dicRequest: dict) -> dict:
+        self.Connect()
+
+        dicRequest = dict(_dicRequest)
+        self._iNextId += 1
+        dicRequest["xId"] = self._iNextId
+
+        try:
+            self._xSocket.sendall((json.dumps(dicRequest, ensure_ascii=False) + "\n").encode("utf-8"))
+            bytLine = self._xIn.readline()
+        except OSError as xEx:
+            self.Close()
+            raise RuntimeError("Connection to the ISON server failed: {}".format(str(xEx)))
+        # endtry
+
+        if len(bytLine) == 0:
+            self.Close()
+            raise RuntimeError("Connection closed by the ISON server")
+        # endif
+
+        dicResponse = json.loads(bytLine)
+        if dicResponse.get("xId") != dicRequest["xId"]:
+            self.Close()
+            raise RuntimeError("Response of the ISON server does not match the request")
+        # endif
+
+        return dicResponse
+
+    # enddef
+
+    ################################################################################
+    # Process a document on the server and return the result, like ison.run.Run().
+    # The document is given as data or JSON text in 'xData', or as path of a document file in 'sFile'.
+    # The server keeps a document file prepared, as long as it does not change.
+    def Run(
+        self,
+        *,
+        xData=None,
+        sFile: Optional[str] = None,
+        dicConstVars: Optional[dict] = None,
+        sResultKey: Optional[str] = None,
+        lSelectPaths: Optional[list] = None,
+        bStripVars: bool = True,
+        sImportPath: Optional[str] = None,
+    ):
+        dicRequest = {"sCmd": "run", "bStripVars": bStripVars}
+        if sFile is not None:
+            dicRequest["sFile"] = io.ToAbsPath(sFile)
+        else:
+            dicRequest["xData"] = xData
+        # endif
+
+        for sKey, xValue in [
+            ("dicConstVars", dicConstVars),
+            ("sResultKey", sResultKey),
+            ("lSelectPaths", lSelectPaths),
+            ("sImportPath", sImportPath),
+        ]:
+            if xValue is not None:
+                dicRequest[sKey] = xValue
+            # endif
+        # endfor
+
+        dicResponse = self.Request(dicRequest)
+        if dicResponse.get("bOk") is not True:
+            raise RuntimeError("Error running ISON parser:\n{}".format(dicResponse["dicError"]["sMessage"]))
+        # endif
+
+        return dicResponse["xResult"]
+
+    # enddef
+
+    ################################################################################
+    def Ping(self) -> bool:
+        return self.Request({"sCmd": "ping"}).get("xResult") == "pong"
+
+    # enddef
+
+    ################################################################################
+    def GetStats(self) -> dict:
+        return self.Request({"sCmd": "stats"})["xResult"]
+
+    # enddef
+
+    ################################################################################
+    # Stop the server, after it responded to this request
+    def Shutdown(self):
+        self.Request({"sCmd": "shutdown"})
+        self.Close()
+
+    # enddef
+
+
+# endclass
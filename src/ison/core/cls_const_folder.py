@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \cls_const_folder.py
+# Created Date: Sunday, October 18th 2026, 2:41:07 pm
+# Author: Christian Perwass
+# <LICENSE id="Apache-2.0">
+#
+#   Functional JSON module
+#   Copyright 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# </LICENSE>
+###
+
+import copy
+
+from ..util import data
+from ..util import text
+from .cls_parser import CParser
+
+
+####################################################################################
+# Evaluates the strings of a document, whose value is the same for every processing,
+# and replaces them by their value. A string is folded, if it only calls pure functions
+# and only references literal variables. Literal variables are the global variables
+# of the top level dictionary, whose value is static and which are defined nowhere else.
+# Global variables take precedence over constant variables, so their value cannot be
+# changed when the document is processed.
+# Strings that give an error or a warning are not changed, so that the error is raised
+# with its full context, when the document is processed.
+# The given data is not changed. Containers with folded elements are copied.
+class CConstFolder:
+    def __init__(self):
+        self.xParser = CParser({})
+        self.dicLitVars: dict = {}
+        self.iFoldCnt: int = 0
+
+    # enddef
+
+    ################################################################################
+    # Fold the main data and the data of its include files.
+    # If not all include files are available, variables are never folded, since
+    # the missing files may define variables of the same name.
+    def Fold(self, _xData, _dicIncludeData: dict, *, bIncludesComplete: bool = True):
+        self.dicLitVars = {}
+        if bIncludesComplete is True and isinstance(_xData, dict):
+            self._CollectLiteralVars(_xData, list(_dicIncludeData.values()))
+        # endif
+
+        xData = self._FoldData(_xData)
+        dicIncludeData = {sPath: self._FoldData(xIncData) for sPath, xIncData in _dicIncludeData.items()}
+
+        return xData, dicIncludeData
+
+    # enddef
+
+    ################################################################################
+    def _CollectLiteralVars(self, _dicData: dict, _lIncData: list):
+        dicGlobals = _dicData.get("__globals__")
+        if not isinstance(dicGlobals, dict):
+            return
+        # endif
+
+        dicDefCnt = {}
+        for xData in [_dicData] + _lIncData:
+            if self._CountVarDefs(xData, dicDefCnt) is False:
+                return
+            # endif
+        # endfor
+
+        lNames = [sName for sName in dicGlobals if dicDefCnt.get(sName) == 1]
+
+        # Literal variables may reference other literal variables, independent of their order
+        bChanged = True
+        while bChanged is True:
+            bChanged = False
+            for sName in lNames:
+                if sName in self.dicLitVars:
+                    continue
+                # endif
+
+                xValue = self._FoldData(dicGlobals[sName], _bCount=False)
+                if data.IsStaticData(xValue) is True:
+                    self.dicLitVars[sName] = xValue
+                    self.xParser.dicVarData[sName] = copy.deepcopy(xValue)
+                    bChanged = True
+                # endif
+            # endfor
+        # endwhile
+
+    # enddef
+
+    ################################################################################
+    # Count the definitions of each variable name. Returns False, if the names
+    # of the defined variables cannot be determined.
+    def _CountVarDefs(self, _xData, _dicDefCnt: dict) -> bool:
+        if isinstance(_xData, dict):
+            for sKey, xValue in _xData.items():
+                if sKey in self.xParser.lValidVarTags:
+                    if not isinstance(xValue, dict):
+                        return False
+                    # endif
+                    for sName in xValue:
+                        if not isinstance(sName, str) or "$" in sName:
+                            return False
+                        # endif
+                        _dicDefCnt[sName] = _dicDefCnt.get(sName, 0) + 1
+                    # endfor
+                # endif
+
+                if self._CountVarDefs(xValue, _dicDefCnt) is False:
+                    return False
+                # endif
+            # endfor
+
+        elif isinstance(_xData, list):
+            for xEl in _xData:
+                if self._CountVarDefs(xEl, _dicDefCnt) is False:
+                    return False
+                # endif
+            # endfor
+        # endif
+
+        return True
+
+    # enddef
+
+    ################################################################################
+    def _FoldData(self, _xData, *, _bCount: bool = True):
+        if isinstance(_xData, str):
+            return self._FoldString(_xData, _bCount=_bCount)
+
+        elif isinstance(_xData, dict):
+            # The body of a lambda function is only processed when it is called
+            if "__lambda__" in _xData:
+                return _xData
+            # endif
+
+            dicResult = None
+            for sKey, xValue in _xData.items():
+                # Function variables are processed with their arguments, and include paths
+                # have to stay unchanged for the preloaded include files.
+                if sKey in ["__func_globals__", "__func_locals__", "__includes__"]:
+                    continue
+                # endif
+
+                xNewValue = self._FoldData(xValue, _bCount=_bCount)
+                if xNewValue is not xValue:
+                    if dicResult is None:
+                        dicResult = dict(_xData)
+                    # endif
+                    dicResult[sKey] = xNewValue
+                # endif
+            # endfor
+            return _xData if dicResult is None else dicResult
+
+        elif isinstance(_xData, list):
+            if len(_xData) > 0 and _xData[0] == "__lambda__":
+                return _xData
+            # endif
+
+            lResult = None
+            for iIdx, xEl in enumerate(_xData):
+                xNewEl = self._FoldData(xEl, _bCount=_bCount)
+                if xNewEl is not xEl:
+                    if lResult is None:
+                        lResult = list(_xData)
+                    # endif
+                    lResult[iIdx] = xNewEl
+                # endif
+            # endfor
+            return _xData if lResult is None else lResult
+
+        # endif
+
+        return _xData
+
+    # enddef
+
+    ################################################################################
+    def _FoldString(self, _sValue: str, *, _bCount: bool):
+        if data.IsStaticString(_sValue) or self._IsConstExpr(_sValue) is False:
+            return _sValue
+        # endif
+
+        try:
+            xValue = self.xParser.Process(_sValue)
+        except Exception:
+            return _sValue
+        # endtry
+
+        if (
+            self.xParser.bIsFullyProcessed is False
+            or self.xParser.GetWarnings().bHasWarnings is True
+            or data.IsStaticData(xValue) is False
+        ):
+            return _sValue
+        # endif
+
+        if _bCount is True:
+            self.iFoldCnt += 1
+        # endif
+
+        # The value may share data with the literal variables of the parser
+        return copy.deepcopy(xValue)
+
+    # enddef
+
+    ################################################################################
+    # An expression is constant, if all functions it calls are pure and all variables
+    # it references are literal variables. Strings that contain lambda parameters
+    # are not constant, as they may be the body of a lambda function.
+    def _IsConstExpr(self, _sValue: str) -> bool:
+        if "%" in _sValue:
+            return False
+        # endif
+
+        try:
+            lMatch = self.xParser._GetVarMatchList(_sValue)
+        except Exception:
+            return False
+        # endtry
+
+        if len(lMatch) == 0:
+            return False
+        # endif
+
+        for xMatch in lMatch:
+            sFunc = xMatch["sFunc"]
+            lArgs = xMatch["lArgs"]
+
+            if sFunc == "":
+                if len(lArgs) != 1 or "$" in lArgs[0]:
+                    return False
+                # endif
+
+                try:
+                    sName = text.SplitVarPath(lArgs[0])[0]
+                except Exception:
+                    return False
+                # endtry
+
+                if sName not in self.dicLitVars:
+                    return False
+                # endif
+
+            elif self.xParser.IsPureFunc(sFunc) is False:
+                return False
+
+            else:
+                for sArg in lArgs:
+                    if "$" in sArg and self._IsConstExpr(sArg) is False:
+                        return False
+                    # endif
+                # endfor
+            # endif
+        # endfor
+
+        return True
+
+    # enddef
+
+
+# endclass
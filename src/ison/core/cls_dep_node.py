@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \cls_dep_node.py
+# Created Date: Sunday, October 18th 2026, 11:38:04 pm
+# Author: Christian Perwass
+# <LICENSE id="Apache-2.0">
+#
+#   Functional JSON module
+#   Copyright 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# </LICENSE>
+###
+
+
+from pathlib import Path
+from typing import Optional
+
+from ..util import io
+from .cls_parser_trace import CWarningList
+
+
+####################################################################################
+# Dependencies and cached result of an element of the top level dictionary.
+# A node records the names of the variables the element read, the paths of the constant
+# variables it read, the include files and the files read with '$read' or listed
+# with '$dir'. Other top level elements, referenced via '@top', are recorded by their key.
+# A node is volatile, if its result may change without any of these changes,
+# e.g. because it calls an impure function like '$rand' or '$print'.
+# The dependencies of the document outside of the top level elements, like the top
+# level variables and includes, are recorded in a node of their own.
+# Nodes can be pickled, so that workers can return the dependencies they recorded.
+class CDepNode:
+    __slots__ = (
+        "setVars",
+        "setConstPaths",
+        "setFiles",
+        "setTopKeys",
+        "bVolatile",
+        "bDefinesRtVars",
+        "fsDefs",
+        "dicResult",
+        "bIsProcessed",
+        "bIsFullyProcessed",
+        "xWarnings",
+        "dicGlobals",
+        "setGlobalsEval",
+        "dicFuncGlobals",
+    )
+
+    def __init__(self):
+        self.setVars: set[str] = set()
+        self.setConstPaths: set[tuple] = set()
+        self.setFiles: set[str] = set()
+        self.setTopKeys: set[str] = set()
+        self.bVolatile: bool = False
+        # Runtime variables defined in an element can be read by any other element
+        self.bDefinesRtVars: bool = False
+
+        # The names of the global and function global variables, which are defined by the element
+        self.fsDefs: frozenset = frozenset()
+
+        # The result of the element and the global variables it defined
+        self.dicResult: Optional[dict] = None
+        self.bIsProcessed: bool = True
+        self.bIsFullyProcessed: bool = True
+        self.xWarnings: Optional[CWarningList] = None
+        self.dicGlobals: dict = {}
+        self.setGlobalsEval: set = set()
+        self.dicFuncGlobals: dict = {}
+
+    # enddef
+
+    ################################################################################
+    # Files are identified by their absolute, normalized posix path
+    @staticmethod
+    def ToFileKey(_xPath) -> str:
+        return Path(io.ToAbsPath(str(_xPath))).as_posix()
+
+    # enddef
+
+    ################################################################################
+    def AddFile(self, _xPath) -> str:
+        sFile = CDepNode.ToFileKey(_xPath)
+        self.setFiles.add(sFile)
+        return sFile
+
+    # enddef
+
+    ################################################################################
+    # Add the dependencies recorded by another node, e.g. by a worker of a parallel call
+    def AddDeps(self, _xNode: "CDepNode"):
+        self.setVars.update(_xNode.setVars)
+        self.setConstPaths.update(_xNode.setConstPaths)
+        self.setFiles.update(_xNode.setFiles)
+        self.setTopKeys.update(_xNode.setTopKeys)
+        self.bVolatile = self.bVolatile or _xNode.bVolatile
+        self.bDefinesRtVars = self.bDefinesRtVars or _xNode.bDefinesRtVars
+
+    # enddef
+
+    ################################################################################
+    # Test whether the node depends on one of the changed constant variable paths or files.
+    # A constant variable path depends on a changed path, if one of them starts with the other.
+    def IsAffected(self, _setChangedPaths: set[tuple], _setChangedFiles: set[str]) -> bool:
+        if self.bVolatile is True or not self.setFiles.isdisjoint(_setChangedFiles):
+            return True
+        # endif
+
+        for tPath in self.setConstPaths:
+            for tChanged in _setChangedPaths:
+                iLen = min(len(tPath), len(tChanged))
+                if tPath[:iLen] == tChanged[:iLen]:
+                    return True
+                # endif
+            # endfor
+        # endfor
+
+        return False
+
+    # enddef
+
+
+# endclass
+
+
+################################################################################
+# Add the paths of the elements that differ between the two values to the given set.
+# Paths are tuples of dictionary keys and list indices as strings, like the elements
+# of a variable path. Lists of different length are changed as a whole.
+def CollectChangedPaths(_xOld, _xNew, _tPath: tuple, _setPaths: set):
+    if isinstance(_xOld, dict) and isinstance(_xNew, dict):
+        for sKey in set(_xOld.keys()).union(_xNew.keys()):
+            if sKey not in _xOld or sKey not in _xNew:
+                _setPaths.add(_tPath + (str(sKey),))
+            else:
+                CollectChangedPaths(_xOld[sKey], _xNew[sKey], _tPath + (str(sKey),), _setPaths)
+            # endif
+        # endfor
+
+    elif isinstance(_xOld, list) and isinstance(_xNew, list) and len(_xOld) == len(_xNew):
+        for iIdx, (xOld, xNew) in enumerate(zip(_xOld, _xNew)):
+            CollectChangedPaths(xOld, xNew, _tPath + (str(iIdx),), _setPaths)
+        # endfor
+
+    elif type(_xOld) is not type(_xNew) or _xOld != _xNew:
+        _setPaths.add(_tPath)
+    # endif
+
+
+# enddef
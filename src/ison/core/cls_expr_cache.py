@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \cls_expr_cache.py
+# Created Date: Monday, October 12th 2026, 9:32:40 am
+# Author: Christian Perwass
+# <LICENSE id="Apache-2.0">
+#
+#   Functional JSON module
+#   Copyright 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# </LICENSE>
+###
+
+import threading
+from collections import OrderedDict
+
+from . import expr_lexer
+from .cls_var_match import CVarMatch
+
+
+####################################################################################
+# Least recently used cache of parsed ISON expressions.
+# Maps a string to the tuple of variable matches found by text.GetVarMatchList().
+# When a string is parsed, the argument strings of its nested functions are added as well.
+# Strings that cannot be parsed are not cached, so that the error is raised
+# again with the full context, whenever the string is processed.
+class CExprCache:
+    def __init__(self, *, _reVarStart, _iMaxSize: int = 16384):
+        self.reVarStart = _reVarStart
+        self.iMaxSize: int = _iMaxSize
+        self.iHits: int = 0
+        self.iMisses: int = 0
+        self.iEvictions: int = 0
+
+        self._dicCache: OrderedDict = OrderedDict()
+        self._xLock = threading.Lock()
+
+    # enddef
+
+    ################################################################################
+    def __len__(self):
+        return len(self._dicCache)
+
+    # enddef
+
+    ################################################################################
+    def GetVarMatchList(self, _sValue: str) -> tuple[CVarMatch]:
+        with self._xLock:
+            tMatch = self._dicCache.get(_sValue)
+            if tMatch is not None:
+                self._dicCache.move_to_end(_sValue)
+                self.iHits += 1
+                return tMatch
+            # endif
+            self.iMisses += 1
+        # endwith
+
+        # Parse the string together with the argument strings of all nested functions,
+        # which are processed next, when the string is evaluated.
+        dicExprMatch = self.ParseExpr(_sValue)
+        tMatch = dicExprMatch[_sValue]
+
+        with self._xLock:
+            for sExpr, tExprMatch in dicExprMatch.items():
+                if sExpr not in self._dicCache:
+                    self._dicCache[sExpr] = tExprMatch
+                # endif
+            # endfor
+            while len(self._dicCache) > self.iMaxSize:
+                self._dicCache.popitem(last=False)
+                self.iEvictions += 1
+            # endwhile
+        # endwith
+
+        return tMatch
+
+    # enddef
+
+    ################################################################################
+    # Parse a string without using the cache. Returns a dictionary that maps the string
+    # and the argument strings of all its nested functions to their variable matches.
+    def ParseExpr(self, _sValue: str) -> dict[str, tuple[CVarMatch]]:
+        lMatch, dicArgMatch = expr_lexer.GetVarMatchTree(_sValue, self.reVarStart)
+
+        dicExprMatch = {_sValue: tuple(CVarMatch.FromDict(dicMatch) for dicMatch in lMatch)}
+        for sArg, lArgMatch in dicArgMatch.items():
+            if sArg not in dicExprMatch:
+                dicExprMatch[sArg] = tuple(CVarMatch.FromDict(dicMatch) for dicMatch in lArgMatch)
+            # endif
+        # endfor
+
+        return dicExprMatch
+
+    # enddef
+
+    ################################################################################
+    def SetMaxSize(self, _iMaxSize: int):
+        with self._xLock:
+            self.iMaxSize = max(0, int(_iMaxSize))
+            while len(self._dicCache) > self.iMaxSize:
+                self._dicCache.popitem(last=False)
+                self.iEvictions += 1
+            # endwhile
+        # endwith
+
+    # enddef
+
+    ################################################################################
+    def Clear(self, *, _bResetStats: bool = True):
+        with self._xLock:
+            self._dicCache.clear()
+            if _bResetStats is True:
+                self.iHits = 0
+                self.iMisses = 0
+                self.iEvictions = 0
+            # endif
+        # endwith
+
+    # enddef
+
+    ################################################################################
+    def GetStats(self) -> dict:
+        with self._xLock:
+            iLookups = self.iHits + self.iMisses
+            return {
+                "iHits": self.iHits,
+                "iMisses": self.iMisses,
+                "iEvictions": self.iEvictions,
+                "iSize": len(self._dicCache),
+                "iMaxSize": self.iMaxSize,
+                "fHitRate": (self.iHits / iLookups) if iLookups > 0 else 0.0,
+            }
+        # endwith
+
+    # enddef
+
+
+# endclass
@@ -0,0 +1,559 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \cls_expr_vm.py
+# Created Date: Sunday, October 18th 2026, 5:26:13 pm
+# Author: Christian Perwass
+# <LICENSE id="Apache-2.0">
+#
+#   Functional JSON module
+#   Copyright 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# </LICENSE>
+###
+
+import threading
+from collections import OrderedDict
+
+from ..util import data
+from ..util import text
+from . import expr_lexer
+from .expr_lexer import EArgKind
+from .cls_parser_trace import EParseContext, CParseContextElement
+from .cls_lazy_seq import CLazySeq, ToData
+from .cls_parser_error import (
+    CParserError_Message,
+    CParserError_ProcArgListElement,
+    CParserError_ProcFunc,
+    CParserError_ProcFuncArgs,
+    CParserError_ProcRefPath,
+    CParserError_ProcStr,
+    CParserError_StrMatch,
+)
+
+# Instructions are tuples, whose first element is the op code and whose second
+# element is the error frame. The error frame is a linked list of the errors
+# that wrap an exception raised by the instruction, from the inner to the outer error.
+# Each error is given as tuple of error class and constructor arguments.
+
+# Start processing a string: (op, frame, string, match count, end index, nested)
+OP_BEGIN = 0
+# Enter a function with processed arguments: (op, frame, context)
+OP_FUNC = 1
+# Push an argument value: (op, frame, value, is processed)
+OP_PUSH = 2
+# Enter and exit an argument context: (op, frame, context) and (op, frame)
+OP_ARG_ENTER = 3
+OP_ARG_EXIT = 4
+# Process an argument, which is not a plain expression, like the parser does:
+# (op, frame, argument, index of the result instruction)
+OP_ARG_FALLBACK = 5
+# Process an argument string that cannot be compiled: (op, frame, argument)
+OP_ARG_EVAL = 6
+# Call a function: (op, frame, context, name, implementation, function parts, literal args, raw args)
+OP_CALL = 7
+# Load a variable with a constant path: (op, frame, context, path, raw args)
+OP_LOAD_VAR = 8
+# Add the function result to the string: (op, frame, match start, match end, is single var)
+OP_RESULT = 9
+# Finish processing a string: (op, frame)
+OP_END = 10
+
+
+####################################################################################
+# Compiles ISON expression strings into flat instruction lists and executes them
+# on an explicit value stack. This is an alternative to the recursive processing of
+# strings by CParser._ProcessString(), with the same results, warnings and errors.
+# The argument strings of functions are compiled into the instruction list of the
+# expression. Results of functions that have to be processed again, are processed
+# by the parser, which in turn uses the compiled programs of these strings.
+# Compiled programs are cached by their function table, since the function
+# implementations are resolved when a string is compiled.
+class CExprVM:
+    def __init__(self, *, _iMaxSize: int = 16384):
+        self.iMaxSize: int = _iMaxSize
+        self.iHits: int = 0
+        self.iMisses: int = 0
+
+        self._dicCache: OrderedDict = OrderedDict()
+        self._dicFuncTables: dict = {}
+        self._xLock = threading.Lock()
+
+    # enddef
+
+    ################################################################################
+    def __len__(self):
+        return len(self._dicCache)
+
+    # enddef
+
+    ################################################################################
+    # Returns an id that is the same for all parsers with the same function table
+    def GetFuncTableId(self, _xParser) -> int:
+        lLiteral = _xParser.lLiteralArgsFuncs
+        lTable = [(sFunc, funcExec, sFunc in lLiteral) for sFunc, funcExec in _xParser.dicFunc.items()]
+        tTable = tuple(sorted(lTable, key=lambda x: x[0]))
+        with self._xLock:
+            return self._dicFuncTables.setdefault(tTable, len(self._dicFuncTables))
+        # endwith
+
+    # enddef
+
+    ################################################################################
+    # Get the compiled program of a string. Returns None, if the string cannot be compiled.
+    def GetProgram(self, _xParser, _sValue: str):
+        tKey = (_xParser._iFuncTableId, _sValue)
+        with self._xLock:
+            tCode = self._dicCache.get(tKey)
+            if tCode is not None:
+                self._dicCache.move_to_end(tKey)
+                self.iHits += 1
+                return tCode
+            # endif
+            self.iMisses += 1
+        # endwith
+
+        tCode = _CCompiler(_xParser).Compile(_sValue)
+        if tCode is None:
+            return None
+        # endif
+
+        with self._xLock:
+            self._dicCache[tKey] = tCode
+            while len(self._dicCache) > self.iMaxSize:
+                self._dicCache.popitem(last=False)
+            # endwhile
+        # endwith
+
+        return tCode
+
+    # enddef
+
+    ################################################################################
+    def Clear(self):
+        with self._xLock:
+            self._dicCache.clear()
+            self.iHits = 0
+            self.iMisses = 0
+        # endwith
+
+    # enddef
+
+    ################################################################################
+    def GetStats(self) -> dict:
+        with self._xLock:
+            return {"iHits": self.iHits, "iMisses": self.iMisses, "iSize": len(self._dicCache)}
+        # endwith
+
+    # enddef
+
+    ################################################################################
+    # Execute a compiled program. Returns the same tuple as CParser._ProcessString().
+    @staticmethod
+    def Execute(_xParser, _tCode: tuple):
+        lVal = []
+        lProc = []
+        lMark = []
+        lLevel = []
+        xLevel = None
+
+        xValue = None
+        bIsLiteral = False
+
+        iPc = 0
+        try:
+            while True:
+                tOp = _tCode[iPc]
+                iOp = tOp[0]
+
+                if iOp == OP_PUSH:
+                    lVal.append(tOp[2])
+                    lProc.append(tOp[3])
+
+                elif iOp == OP_ARG_ENTER:
+                    _xParser.lParseContext.append(tOp[2])
+
+                elif iOp == OP_ARG_EXIT:
+                    if len(_xParser.lParseContext) > 0:
+                        _xParser.lParseContext.pop(-1)
+                    # endif
+
+                elif iOp == OP_LOAD_VAR:
+                    _xParser.lParseContext.append(tOp[2])
+                    lPath = list(tOp[3])
+                    try:
+                        try:
+                            xValue, bIsLiteral = _xParser.ProcessRefPath(_xParser.GetVarData(), lPath, 0)
+                        except Exception as xEx:
+                            raise CParserError_ProcRefPath(
+                                sContext="variables", lMatch=lPath, iMatchIdx=0, xChildEx=xEx
+                            )
+                        # endtry
+                    except Exception as xEx:
+                        raise CParserError_ProcFunc(sFunc="", lArgs=list(tOp[4]), xChildEx=xEx)
+                    # endtry
+                    if len(_xParser.lParseContext) > 0:
+                        _xParser.lParseContext.pop(-1)
+                    # endif
+
+                elif iOp == OP_FUNC:
+                    _xParser.lParseContext.append(tOp[2])
+                    lMark.append((len(lVal), len(lProc)))
+
+                elif iOp == OP_CALL:
+                    sFunc = tOp[3]
+                    if tOp[6] is True:
+                        _xParser.lParseContext.append(tOp[2])
+                        lVarData = list(tOp[7])
+                        lVarIsProc = [False for x in lVarData]
+                    else:
+                        iVal, iProc = lMark.pop(-1)
+                        lVarData = lVal[iVal:]
+                        lVarIsProc = lProc[iProc:]
+                        del lVal[iVal:]
+                        del lProc[iProc:]
+                    # endif
+
+                    try:
+                        _xParser.MaterializeArgs(sFunc, lVarData)
+                        _xParser.RecordFuncCall(sFunc)
+                        funcExec = tOp[4]
+                        if funcExec is None:
+                            raise CParserError_Message(sMsg="Function '{0}' not available".format(sFunc))
+                        elif tOp[5] is None:
+                            xValue, bIsLiteral = funcExec(_xParser, lVarData, lVarIsProc, sFuncName=sFunc)
+                        else:
+                            xValue, bIsLiteral = funcExec(
+                                _xParser, lVarData, lVarIsProc, sFuncName=sFunc, lFuncParts=list(tOp[5])
+                            )
+                        # endif
+                    except Exception as xEx:
+                        raise CParserError_ProcFunc(sFunc=sFunc, lArgs=lVarData, xChildEx=xEx)
+                    # endtry
+
+                    if len(_xParser.lParseContext) > 0:
+                        _xParser.lParseContext.pop(-1)
+                    # endif
+
+                elif iOp == OP_RESULT:
+                    bIsProc = False
+
+                    if xValue is not None:
+                        bIsProc = True
+
+                        if bIsLiteral is False:
+                            while isinstance(xValue, str):
+                                try:
+                                    (
+                                        xValue,
+                                        iValMatchCnt,
+                                        iValProcCnt,
+                                        iValLiteralCnt,
+                                    ) = _xParser._ProcessString(xValue)
+                                except Exception as xEx:
+                                    raise CParserError_ProcStr(
+                                        sString=xValue,
+                                        sContext="Recurse string processing",
+                                        xChildEx=xEx,
+                                    )
+                                # endtry
+
+                                iValNonLitMatchCnt = iValMatchCnt - iValLiteralCnt
+
+                                if iValNonLitMatchCnt == 0 or iValProcCnt < iValMatchCnt or xValue is None:
+                                    bIsProc = iValProcCnt == iValMatchCnt
+                                    bIsLiteral = iValLiteralCnt > 0
+                                    break
+                                # endif
+                            # endwhile
+                        # endif
+                    # endif
+
+                    # Level: [string, result, start index, processed count, literal count, finished]
+                    xLevel[3] += 1 if bIsProc is True else 0
+                    xLevel[4] += 1 if bIsLiteral is True else 0
+
+                    if xValue is not None:
+                        if tOp[4] is True and not isinstance(xValue, str):
+                            xLevel[1] = xValue
+                            xLevel[5] = True
+                            iPc = _tCode[xLevel[6]][4]
+                            continue
+                        # endif
+
+                        if not isinstance(xValue, str):
+                            xValue = text.ToString(ToData(xValue))
+                        # endif
+
+                        xLevel[1] += xLevel[0][xLevel[2] : tOp[2]] + xValue
+                        xLevel[2] = tOp[3]
+                    # endif
+
+                    xValue = None
+                    bIsLiteral = False
+
+                elif iOp == OP_BEGIN:
+                    if tOp[5] is True:
+                        # A nested argument is processed by InnerProcess()
+                        _xParser.ProvideVariables()
+                    # endif
+                    xLevel = [tOp[2], "", 0, 0, 0, False, iPc]
+                    lLevel.append(xLevel)
+
+                elif iOp == OP_END:
+                    tBegin = _tCode[xLevel[6]]
+                    iMatchCnt = tBegin[3]
+                    iProcCnt = xLevel[3]
+                    iLiteralCnt = xLevel[4]
+
+                    if xLevel[5] is True:
+                        xResult = xLevel[1]
+                    else:
+                        xResult = xLevel[1] + xLevel[0][xLevel[2] :]
+                        if iLiteralCnt == 0 and iMatchCnt == iProcCnt:
+                            xResult = text.StripString(xResult, "`")
+                        # endif
+                    # endif
+
+                    lLevel.pop(-1)
+                    if tBegin[5] is False:
+                        return xResult, iMatchCnt, iProcCnt, iLiteralCnt
+                    # endif
+                    xLevel = lLevel[-1]
+
+                    # Finish the processing of the argument string like CParser.InnerProcess()
+                    bIsProcessed = iProcCnt == iMatchCnt
+                    if isinstance(xResult, CLazySeq):
+                        pass
+                    elif (not isinstance(xResult, str) or iMatchCnt > iLiteralCnt) and bIsProcessed:
+                        xResult, bIsProc = _xParser.InnerProcess(xResult)
+                        bIsProcessed = bIsProcessed and bIsProc
+                    # endif
+
+                    lVal.append(xResult)
+                    lProc.append(bIsProcessed)
+
+                elif iOp == OP_ARG_EVAL:
+                    xResult, bIsProcessed = _xParser.InnerProcess(tOp[2], bLazy=True)
+                    lVal.append(xResult)
+                    lProc.append(bIsProcessed)
+
+                elif iOp == OP_ARG_FALLBACK:
+                    lSubVal, lSubProc = _xParser._ProcessArgs([tOp[2]])
+                    if lSubVal is None:
+                        # The argument list cannot be processed, so the function is not called
+                        iVal, iProc = lMark.pop(-1)
+                        del lVal[iVal:]
+                        del lProc[iProc:]
+                        xValue = None
+                        bIsLiteral = False
+                        iPc = tOp[3]
+                        continue
+                    # endif
+                    lVal.extend(lSubVal)
+                    lProc.extend(lSubProc)
+
+                # endif
+
+                iPc += 1
+            # endwhile
+
+        except Exception as xEx:
+            xFrame = _tCode[iPc][1]
+            while xFrame is not None:
+                tError, xFrame = xFrame
+                xEx = tError[0](**tError[1], xChildEx=xEx)
+            # endwhile
+            raise xEx
+        # endtry
+
+    # enddef
+
+
+# endclass
+
+
+####################################################################################
+class _CCompiler:
+    def __init__(self, _xParser):
+        self.xParser = _xParser
+        self.lCode: list = []
+
+        # Variables with constant path are loaded directly, if the reference function is the default one
+        from ..func import core as func_core
+
+        self.bInlineRef: bool = _xParser.dicFunc.get("") is func_core.Reference
+
+    # enddef
+
+    ################################################################################
+    def Compile(self, _sValue: str):
+        try:
+            tMatch = self.xParser._GetVarMatchList(_sValue)
+        except Exception:
+            # The error is raised with its context by the parser
+            return None
+        # endtry
+
+        self._CompileString(_sValue, tMatch, None, False)
+        return tuple(self.lCode)
+
+    # enddef
+
+    ################################################################################
+    def _Emit(self, *_tOp) -> int:
+        self.lCode.append(_tOp)
+        return len(self.lCode) - 1
+
+    # enddef
+
+    ################################################################################
+    def _CompileString(self, _sValue: str, _tMatch: tuple, _xFrame, _bNested: bool):
+        iBegin = self._Emit(OP_BEGIN, _xFrame, _sValue, len(_tMatch), None, _bNested)
+
+        for xMatch in _tMatch:
+            sFunc = xMatch["sFunc"]
+            lArgs = xMatch["lArgs"]
+            xFrameMatch = ((CParserError_StrMatch, {"sString": _sValue, "dicMatch": xMatch}), _xFrame)
+            xCtx = CParseContextElement(eContext=EParseContext.FUNC, sValue=sFunc, lData=lArgs)
+
+            tPath = self._GetConstVarPath(sFunc, lArgs)
+            if tPath is not None:
+                self._Emit(OP_LOAD_VAR, xFrameMatch, xCtx, tPath, lArgs)
+
+            elif sFunc in self.xParser.lLiteralArgsFuncs:
+                self._EmitCall(xFrameMatch, xCtx, sFunc, lArgs, True)
+
+            else:
+                self._Emit(OP_FUNC, xFrameMatch, xCtx)
+                xFrameArgs = ((CParserError_ProcFuncArgs, {"sFunc": sFunc, "lArgs": lArgs}), xFrameMatch)
+                lFallback = []
+                for iArgIdx, sArg in enumerate(lArgs):
+                    iFallback = self._CompileArg(sArg, iArgIdx, lArgs, xFrameArgs)
+                    if iFallback is not None:
+                        lFallback.append(iFallback)
+                    # endif
+                # endfor
+                self._EmitCall(xFrameMatch, xCtx, sFunc, lArgs, False)
+
+                iResult = len(self.lCode)
+                for iFallback in lFallback:
+                    tOp = self.lCode[iFallback]
+                    self.lCode[iFallback] = tOp[:3] + (iResult,)
+                # endfor
+            # endif
+
+            sFront = _sValue[0 : xMatch["iStart"]].strip()
+            sBack = _sValue[xMatch["iEnd"] :].strip()
+            bIsSingleVar = len(sFront) == 0 and len(sBack) == 0
+            self._Emit(OP_RESULT, _xFrame, xMatch["iStart"], xMatch["iEnd"], bIsSingleVar)
+        # endfor
+
+        iEnd = self._Emit(OP_END, _xFrame)
+        tBegin = self.lCode[iBegin]
+        self.lCode[iBegin] = tBegin[:4] + (iEnd,) + tBegin[5:]
+
+    # enddef
+
+    ################################################################################
+    # Compile an argument like CParser._ProcessArgs() processes it.
+    # Returns the index of a fallback instruction, whose jump target has to be set.
+    def _CompileArg(self, _sArg: str, _iArgIdx: int, _lArgs: tuple, _xFrame):
+        eArgKind, sKey, sValue = expr_lexer.GetArgKind(_sArg)
+
+        if eArgKind == EArgKind.LAMBDA_PAR:
+            self._Emit(OP_PUSH, _xFrame, _sArg, False)
+
+        elif eArgKind == EArgKind.LITERAL:
+            self._Emit(OP_PUSH, _xFrame, _sArg.strip()[1:], True)
+
+        elif eArgKind == EArgKind.EXPR:
+            if data.IsStaticString(_sArg):
+                self._Emit(OP_PUSH, _xFrame, _sArg, True)
+                return None
+            # endif
+
+            xFrameElement = ((CParserError_ProcArgListElement, {"lArgList": _lArgs, "iArgIdx": _iArgIdx}), _xFrame)
+            self._Emit(OP_ARG_ENTER, _xFrame, CParseContextElement(eContext=EParseContext.ARG, sValue=_sArg))
+            try:
+                tMatch = self.xParser._GetVarMatchList(_sArg)
+            except Exception:
+                tMatch = None
+            # endtry
+
+            if tMatch is None:
+                self._Emit(OP_ARG_EVAL, xFrameElement, _sArg)
+            else:
+                xFrameString = ((CParserError_ProcStr, {"sString": _sArg}), xFrameElement)
+                self._CompileString(_sArg, tMatch, xFrameString, True)
+            # endif
+            self._Emit(OP_ARG_EXIT, _xFrame)
+
+        else:
+            return self._Emit(OP_ARG_FALLBACK, _xFrame, _sArg, None)
+        # endif
+
+        return None
+
+    # enddef
+
+    ################################################################################
+    def _EmitCall(self, _xFrame, _xCtx, _sFunc: str, _lArgs: tuple, _bLiteralArgs: bool):
+        funcExec = self.xParser.dicFunc.get(_sFunc)
+        tFuncParts = None
+        if funcExec is None:
+            lParts = _sFunc.split(".")
+            funcExec = self.xParser.dicFunc.get("{}.*".format(lParts[0]))
+            tFuncParts = tuple(lParts)
+        # endif
+
+        self._Emit(OP_CALL, _xFrame, _xCtx, _sFunc, funcExec, tFuncParts, _bLiteralArgs, _lArgs)
+
+    # enddef
+
+    ################################################################################
+    # The path of a variable reference like '${a:b}', if all path elements are constant
+    def _GetConstVarPath(self, _sFunc: str, _lArgs: tuple):
+        if self.bInlineRef is False or _sFunc != "" or len(_lArgs) != 1:
+            return None
+        # endif
+
+        try:
+            lPath = text.SplitVarPath(_lArgs[0])
+        except Exception:
+            return None
+        # endtry
+
+        for sEl in lPath:
+            if (
+                not isinstance(sEl, str)
+                or expr_lexer.GetArgKind(sEl)[0] != EArgKind.EXPR
+                or not data.IsStaticString(sEl)
+                or len(sEl) == 0
+            ):
+                return None
+            # endif
+        # endfor
+
+        if len(lPath) == 0:
+            return None
+        # endif
+
+        return tuple(lPath)
+
+    # enddef
+
+
+# endclass
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \cls_file_cache.py
+# Created Date: Sunday, October 18th 2026, 11:57:41 pm
+# Author: Christian Perwass
+# <LICENSE id="Apache-2.0">
+#
+#   Functional JSON module
+#   Copyright 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# </LICENSE>
+###
+
+
+import os
+import threading
+from pathlib import Path
+from collections import OrderedDict
+
+from ..util import io
+from ..util import data
+
+
+####################################################################################
+# Least recently used cache of the contents of files, used for include files and '$read'.
+# An entry is identified by the resolved file path and is only used, while the modification
+# time and size of the file are unchanged. The cache is bounded by the total size of the
+# cached files in bytes.
+# The cached data must not be modified. Decoded json data is returned together with its static
+# containers, so that a parser only copies the spine of the data with data.CopyDataSpine() and
+# shares all containers without ISON syntax.
+class CFileCache:
+    def __init__(self, *, _iMaxBytes: int = 256 * 1024 * 1024):
+        self.iMaxBytes: int = _iMaxBytes
+        self.iBytes: int = 0
+        self.iHits: int = 0
+        self.iMisses: int = 0
+        self.iEvictions: int = 0
+
+        # Maps the resolved path to the tuple (stamp, data, static containers, bytes)
+        self._dicCache: OrderedDict = OrderedDict()
+        self._xLock = threading.Lock()
+
+    # enddef
+
+    ################################################################################
+    def __len__(self):
+        return len(self._dicCache)
+
+    # enddef
+
+    ################################################################################
+    # Load the json file with the given path, or take it from the cache.
+    # If 'bJson' is False, the file is read as text and no static containers are returned.
+    # Returns the data, a dictionary of its static containers by id
+    # and the path of the file, that has been read.
+    def Load(self, _xFilePath, *, bJson: bool = True) -> tuple[object, dict, Path]:
+        if bJson is True:
+            pathFile = io.ResolveJsonPath(_xFilePath)
+        else:
+            pathFile = Path(_xFilePath)
+        # endif
+        sPath = os.path.realpath(pathFile)
+        xStat = os.stat(sPath)
+        tStamp = (xStat.st_mtime_ns, xStat.st_size)
+
+        with self._xLock:
+            tEntry = self._dicCache.get(sPath)
+            if tEntry is not None and tEntry[0] == tStamp:
+                self._dicCache.move_to_end(sPath)
+                self.iHits += 1
+                return tEntry[1], tEntry[2], pathFile
+            # endif
+            self.iMisses += 1
+        # endwith
+
+        dicStatic = {}
+        if bJson is True:
+            xData = io.LoadJson(pathFile)
+            data.CollectStaticData(xData, dicStatic)
+        else:
+            with open(pathFile, "r") as xFile:
+                xData = xFile.read()
+            # endwith
+        # endif
+
+        with self._xLock:
+            tEntry = self._dicCache.pop(sPath, None)
+            if tEntry is not None:
+                self.iBytes -= tEntry[3]
+            # endif
+            if tStamp[1] <= self.iMaxBytes:
+                self._dicCache[sPath] = (tStamp, xData, dicStatic, tStamp[1])
+                self.iBytes += tStamp[1]
+            # endif
+            self._Evict()
+        # endwith
+
+        return xData, dicStatic, pathFile
+
+    # enddef
+
+    ################################################################################
+    # Remove the least recently used entries, until the cache is within its bounds.
+    # Must be called with the lock held.
+    def _Evict(self):
+        while self.iBytes > self.iMaxBytes and len(self._dicCache) > 0:
+            tEntry = self._dicCache.popitem(last=False)[1]
+            self.iBytes -= tEntry[3]
+            self.iEvictions += 1
+        # endwhile
+
+    # enddef
+
+    ################################################################################
+    def SetMaxBytes(self, _iMaxBytes: int):
+        with self._xLock:
+            self.iMaxBytes = max(0, int(_iMaxBytes))
+            self._Evict()
+        # endwith
+
+    # enddef
+
+    ################################################################################
+    def Clear(self, *, _bResetStats: bool = True):
+        with self._xLock:
+            self._dicCache.clear()
+            self.iBytes = 0
+            if _bResetStats is True:
+                self.iHits = 0
+                self.iMisses = 0
+                self.iEvictions = 0
+            # endif
+        # endwith
+
+    # enddef
+
+    ################################################################################
+    def GetStats(self) -> dict:
+        with self._xLock:
+            iLookups = self.iHits + self.iMisses
+            return {
+                "iHits": self.iHits,
+                "iMisses": self.iMisses,
+                "iEvictions": self.iEvictions,
+                "iSize": len(self._dicCache),
+                "iBytes": self.iBytes,
+                "iMaxBytes": self.iMaxBytes,
+                "fHitRate": (self.iHits / iLookups) if iLookups > 0 else 0.0,
+            }
+        # endwith
+
+    # enddef
+
+
+# endclass
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \cls_lambda_arg_refs.py
+# Created Date: Sunday, October 18th 2026, 11:48:52 pm
+# Author: Christian Perwass
+# <LICENSE id="Apache-2.0">
+#
+#   Functional JSON module
+#   Copyright 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# </LICENSE>
+###
+
+import threading
+
+
+####################################################################################
+# The lambda function arguments of a single call, that are passed by reference.
+# The active calls of a thread form a stack of frames. The body of a call references
+# argument <idx> of the frame at stack depth <depth> with '$*{^@arg.<depth>.<idx>}'.
+# In this way, the bound body text does not depend on the individual call, so that
+# repeated calls give the same text, whose parsing is cached. The references are valid
+# in the thread of the call, while the instance is active, that is, inside its 'with' block.
+# An argument that is already referenced by an active call of the thread, is passed by
+# the same reference, so that recursive calls with the same data give the same text.
+class CLambdaArgRefs:
+    __slots__ = ("iDepth", "lArgs", "_lStack", "_dicShared", "_lSharedIds")
+
+    _xLocal = threading.local()
+
+    def __init__(self):
+        self.iDepth: int = None
+        self.lArgs: list = []
+        # The stack of active instances of the thread and the references of their arguments by object id
+        self._lStack: list = None
+        self._dicShared: dict = None
+        self._lSharedIds: list[int] = []
+
+    # enddef
+
+    ################################################################################
+    def __enter__(self):
+        xLocal = CLambdaArgRefs._GetLocal()
+        self._lStack = xLocal.lStack
+        self._dicShared = xLocal.dicShared
+        self.iDepth = len(self._lStack)
+        self._lStack.append(self)
+        return self
+
+    # enddef
+
+    ################################################################################
+    def __exit__(self, _xExType, _xEx, _xTraceback):
+        lStack = self._lStack
+        # Frames that are left out of order, e.g. by an unfinished generator,
+        # keep their place, so that the depths of the other frames do not change.
+        lStack[self.iDepth] = None
+        while len(lStack) > 0 and lStack[-1] is None:
+            lStack.pop()
+        # endwhile
+
+        for iObjId in self._lSharedIds:
+            del self._dicShared[iObjId]
+        # endfor
+        self._lSharedIds.clear()
+        self.lArgs.clear()
+        return False
+
+    # enddef
+
+    ################################################################################
+    def Ref(self, _iIdx: int) -> str:
+        return "$*{{^@arg.{0}.{1}}}".format(self.iDepth, _iIdx)
+
+    # enddef
+
+    ################################################################################
+    # Add an argument and return its reference
+    def Add(self, _xArg) -> str:
+        # The object cannot be freed while the instance that added it is active,
+        # so that its id is not reused before the entry is removed.
+        sRef = self._dicShared.get(id(_xArg))
+        if sRef is None:
+            sRef = self.Ref(self.AddSlot(_xArg))
+            self._dicShared[id(_xArg)] = sRef
+            self._lSharedIds.append(id(_xArg))
+        # endif
+
+        return sRef
+
+    # enddef
+
+    ################################################################################
+    # Add an argument, whose value may be changed via 'lArgs', and return its index
+    def AddSlot(self, _xArg=None) -> int:
+        self.lArgs.append(_xArg)
+        return len(self.lArgs) - 1
+
+    # enddef
+
+    ################################################################################
+    # Returns the argument of an active instance of the current thread.
+    # Raises a KeyError, if the reference is not valid.
+    @staticmethod
+    def Get(_iDepth: int, _iIdx: int):
+        lStack = CLambdaArgRefs._GetLocal().lStack
+        if _iDepth >= len(lStack) or lStack[_iDepth] is None or _iIdx >= len(lStack[_iDepth].lArgs):
+            raise KeyError(f"@arg.{_iDepth}.{_iIdx}")
+        # endif
+
+        return lStack[_iDepth].lArgs[_iIdx]
+
+    # enddef
+
+    ################################################################################
+    # The number of active instances of the current thread
+    @staticmethod
+    def GetActiveCount() -> int:
+        return sum(1 for x in CLambdaArgRefs._GetLocal().lStack if x is not None)
+
+    # enddef
+
+    ################################################################################
+    @staticmethod
+    def _GetLocal() -> threading.local:
+        xLocal = CLambdaArgRefs._xLocal
+        if not hasattr(xLocal, "lStack"):
+            xLocal.lStack = []
+            xLocal.dicShared = {}
+        # endif
+        return xLocal
+
+    # enddef
+
+
+# endclass
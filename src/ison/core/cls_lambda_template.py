@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \cls_lambda_template.py
+# Created Date: Sunday, October 18th 2026, 9:12:36 pm
+# Author: Christian Perwass
+# <LICENSE id="Apache-2.0">
+#
+#   Functional JSON module
+#   Copyright 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# </LICENSE>
+###
+
+from .defines import reLambdaPar
+
+
+####################################################################################
+# Lambda function body, split into text parts and parameter slots.
+# The body is given with normalized parameter indices and with the scopes
+# of the body, that are not part of nested lambda functions. Parameters
+# of nested lambda functions are part of the text, so they are only bound
+# when the nested lambda function is called.
+# A slot is a tuple (index, name, is null, parameter text). Slots that are
+# not bound by the arguments of a call, keep their parameter text.
+class CLambdaTemplate:
+    __slots__ = ("sBody", "bHasPars", "lParts")
+
+    def __init__(self, _sBody: str, _lScope: list[list[int]], _bHasPars: bool):
+        self.sBody: str = _sBody
+        self.bHasPars: bool = _bHasPars
+        self.lParts: list = []
+
+        if _bHasPars is False:
+            return
+        # endif
+
+        # The scopes are those of the body before the indices were normalized
+        sText = ""
+        iPartEnd = 0
+        for lPart in _lScope:
+            sText += _sBody[iPartEnd : lPart[0]]
+            sBodyPart = _sBody[lPart[0] : lPart[1]]
+            iPartEnd = lPart[1]
+
+            iStart = 0
+            while True:
+                xMatch = reLambdaPar.search(sBodyPart, iStart)
+                if xMatch is None:
+                    break
+                # endif
+
+                iIdx: int = None
+                if xMatch.group("idx") is not None:
+                    iIdx = int(xMatch.group("idx"))
+                elif xMatch.group("name_idx") is not None:
+                    iIdx = int(xMatch.group("name_idx"))
+                # endif
+
+                sText += sBodyPart[iStart : xMatch.start()]
+                self.lParts.append(sText)
+                bIsNull = len(xMatch.group("isnull")) > 0
+                sPar = sBodyPart[xMatch.start() : xMatch.end()]
+                self.lParts.append((iIdx, xMatch.group("name"), bIsNull, sPar))
+                sText = ""
+                iStart = xMatch.end()
+            # endwhile body part
+            sText += sBodyPart[iStart:]
+        # endfor scope
+        sText += _sBody[iPartEnd:]
+        self.lParts.append(sText)
+
+    # enddef
+
+    ################################################################################
+    # Fill the parameter slots with the given arguments. The indices and names of
+    # the used arguments are added to the given sets. Returns the new body and
+    # whether an argument has been inserted.
+    def Bind(self, _lPosArgs: list, _dicNamedArgs: dict, _setUsedArgIdx: set, _setUsedArgName: set):
+        iPosArgCnt = len(_lPosArgs)
+        bChanged = False
+        lText = []
+
+        for xPart in self.lParts:
+            if isinstance(xPart, str):
+                lText.append(xPart)
+                continue
+            # endif
+
+            iIdx, sArgKey, bIsNull, sPar = xPart
+            if iIdx is not None and iIdx < iPosArgCnt:
+                _setUsedArgIdx.add(iIdx)
+                if not bIsNull:
+                    lText.append(_lPosArgs[iIdx])
+                    bChanged = True
+                # endif
+            elif sArgKey is not None and sArgKey in _dicNamedArgs:
+                _setUsedArgName.add(sArgKey)
+                if not bIsNull:
+                    lText.append(_dicNamedArgs[sArgKey])
+                    bChanged = True
+                # endif
+            else:
+                lText.append(sPar)
+            # endif
+        # endfor
+
+        return "".join(lText), bChanged
+
+    # enddef
+
+
+# endclass
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \cls_lazy_seq.py
+# Created Date: Sunday, October 18th 2026, 11:21:09 pm
+# Author: Christian Perwass
+# <LICENSE id="Apache-2.0">
+#
+#   Functional JSON module
+#   Copyright 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# </LICENSE>
+###
+
+from collections.abc import Sequence
+
+# Maximal number of elements shown by repr()
+iReprMaxCnt: int = 10
+
+
+####################################################################################
+# Immutable sequence, whose elements are computed from their index when accessed.
+# Functions like 'range' or 'enumerate' and slices of references return lazy sequences,
+# so that the length, an element or a slice of them is obtained in O(1).
+# Only functions that declare 'bLazyArgs' receive lazy sequences as arguments. For all other
+# functions and when a lazy sequence becomes part of the data, it is converted to a list.
+# Copying or pickling a lazy sequence also returns a list.
+class CLazySeq(Sequence):
+    __slots__ = ("_iLen", "_funcGet", "_rngBase")
+
+    def __init__(self, _iLen: int, _funcGet, *, _rngBase: range = None):
+        self._iLen: int = _iLen
+        self._funcGet = _funcGet
+        # The range of integers, if this is a lazy range
+        self._rngBase: range = _rngBase
+
+    # enddef
+
+    ################################################################################
+    @staticmethod
+    def FromRange(_rngValues: range) -> "CLazySeq":
+        return CLazySeq(len(_rngValues), _rngValues.__getitem__, _rngBase=_rngValues)
+
+    # enddef
+
+    ################################################################################
+    # The elements of the sequence at the given range of indices, which must be valid
+    @staticmethod
+    def FromIndices(_xSeq, _rngIdx: range) -> "CLazySeq":
+        if isinstance(_xSeq, CLazySeq) and _xSeq._rngBase is not None:
+            rngBase = _xSeq._rngBase
+            if len(_rngIdx) == 0:
+                return CLazySeq.FromRange(range(0))
+            # endif
+            iStart = rngBase[_rngIdx[0]]
+            iStep = rngBase.step * _rngIdx.step
+            return CLazySeq.FromRange(range(iStart, iStart + iStep * len(_rngIdx), iStep))
+        # endif
+
+        return CLazySeq(len(_rngIdx), lambda iIdx: _xSeq[_rngIdx[iIdx]])
+
+    # enddef
+
+    ################################################################################
+    # Tuples of the index and the element for all elements of the sequence
+    @staticmethod
+    def Enumerate(_xSeq) -> "CLazySeq":
+        return CLazySeq(len(_xSeq), lambda iIdx: (iIdx, _xSeq[iIdx]))
+
+    # enddef
+
+    ################################################################################
+    # Tuples of the corresponding elements of the sequences, like zip()
+    @staticmethod
+    def Zip(_lSeqs: list) -> "CLazySeq":
+        return CLazySeq(min(len(x) for x in _lSeqs), lambda iIdx: tuple(x[iIdx] for x in _lSeqs))
+
+    # enddef
+
+    ################################################################################
+    def __len__(self):
+        return self._iLen
+
+    # enddef
+
+    ################################################################################
+    def __getitem__(self, _xIdx):
+        if isinstance(_xIdx, slice):
+            return CLazySeq.FromIndices(self, range(self._iLen)[_xIdx])
+        # endif
+
+        iIdx = _xIdx.__index__()
+        if iIdx < 0:
+            iIdx += self._iLen
+        # endif
+        if iIdx < 0 or iIdx >= self._iLen:
+            raise IndexError("sequence index out of range")
+        # endif
+
+        return self._funcGet(iIdx)
+
+    # enddef
+
+    ################################################################################
+    def __iter__(self):
+        if self._rngBase is not None:
+            return iter(self._rngBase)
+        # endif
+        return (self._funcGet(iIdx) for iIdx in range(self._iLen))
+
+    # enddef
+
+    ################################################################################
+    def __eq__(self, _xOther):
+        if not isinstance(_xOther, (list, CLazySeq)):
+            return NotImplemented
+        # endif
+        return len(_xOther) == self._iLen and all(xA == xB for xA, xB in zip(self, _xOther))
+
+    # enddef
+
+    __hash__ = None
+
+    ################################################################################
+    # Only the first elements are shown, so that error messages do not evaluate the sequence
+    def __repr__(self):
+        if self._iLen <= iReprMaxCnt:
+            return repr(self.ToList())
+        # endif
+        sEls = ", ".join(repr(self._funcGet(iIdx)) for iIdx in range(iReprMaxCnt))
+        return "[{}, ...] ({} elements)".format(sEls, self._iLen)
+
+    # enddef
+
+    ################################################################################
+    def __reduce__(self):
+        return (list, (self.ToList(),))
+
+    # enddef
+
+    ################################################################################
+    def ToList(self) -> list:
+        return list(self)
+
+    # enddef
+
+
+# endclass
+
+
+################################################################################
+# Convert a lazy sequence to a list. All other values are returned as they are.
+def ToData(_xValue):
+    if isinstance(_xValue, CLazySeq):
+        return _xValue.ToList()
+    # endif
+    return _xValue
+
+
+# enddef
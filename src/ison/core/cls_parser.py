@@ -53,18 +53,26 @@ from .cls_parser_error import (
     CParserError_StrMatch,
     CParserError_KeyStrMatch,
     CParserError_ProcArgListElement,
+    CParserError_VarCycle,
 )
 from . import lambda_parser
+from . import var_deps
 from . import var_nt
+from . import parallel
+from .cls_expr_cache import CExprCache
+from .cls_file_cache import CFileCache
+from .cls_expr_vm import CExprVM
+from .cls_var_scope import CVarScope
+from .cls_dep_node import CDepNode, CollectChangedPaths
+from .cls_lazy_seq import CLazySeq, ToData
+from . import expr_lexer
+from .expr_lexer import EArgKind
 
 from .defines import (
     reVarStart,
     rePureVar,
     reSlice,
     reLambdaFunc,
-    reLambdaPar,
-    reNamedArg,
-    reLiteralArg,
     reUnrollArg,
     reTupleArg,
 )
@@ -77,6 +85,17 @@ from .cls_parser_trace import CWarning, CWarningList, EWarningType, EParseContex
 
 
 class CParser:
+    # Cache of parsed expressions, shared by all parser instances
+    xExprCache: CExprCache = CExprCache(_reVarStart=reVarStart)
+
+    # Compiled expression programs, shared by all parser instances
+    xExprVM: CExprVM = CExprVM()
+
+    # Decoded include files, shared by all parser instances.
+    # Containers of include files without ISON syntax are returned by reference,
+    # like the static containers of the input data.
+    xIncludeCache: CFileCache = CFileCache()
+
     @property
     def dicFuncStorage(self) -> dict:
         return self.dicVarData["@func-storage"]
@@ -95,15 +114,21 @@ class CParser:
 
     # enddef
 
+    @property
+    def xVarScope(self) -> CVarScope:
+        return self.dicVarData["@scope"]
+
+    # enddef
+
     @property
     def dicVarLoc(self) -> dict:
-        return self.dicVarData["@loc"]
+        return self.xVarScope.GetLocals()
 
     # enddef
 
     @property
     def lVarLocStack(self) -> list[dict]:
-        return self.dicVarData["@loc-s"]
+        return [x.GetLocals() for x in self.xVarScope.GetFrames()[:-1]]
 
     # enddef
 
@@ -121,13 +146,13 @@ class CParser:
 
     @property
     def setVarLocEval(self) -> set:
-        return self.dicVarData["@loc-eval"]
+        return self.xVarScope.GetLocalsEval()
 
     # enddef
 
     @property
     def lVarLocEvalStack(self) -> list[set]:
-        return self.dicVarData["@loc-eval-s"]
+        return [x.GetLocalsEval() for x in self.xVarScope.GetFrames()[:-1]]
 
     # enddef
 
@@ -139,13 +164,13 @@ class CParser:
 
     @property
     def dicVarFuncLoc(self) -> dict:
-        return self.dicVarData["@func-loc"]
+        return self.xVarScope.GetFuncLocals()
 
     # enddef
 
     @property
     def lVarFuncLocStack(self) -> list[dict]:
-        return self.dicVarData["@func-loc-s"]
+        return [x.GetFuncLocals() for x in self.xVarScope.GetFrames()[:-1]]
 
     # enddef
 
@@ -164,6 +189,13 @@ class CParser:
         dicRtVars: dict = None,
         setRtVarsEval: set = None,
         xParser: "CParser" = None,
+        bLazyVars: bool = False,
+        bExprVM: bool = False,
+        iMaxWorkers: Optional[int] = None,
+        bParallelKeys: bool = False,
+        bTrackDeps: bool = False,
+        bCacheReads: bool = True,
+        iReadCacheMaxBytes: int = 64 * 1024 * 1024,
     ):
         if isinstance(_dicConstVars, dict):
             self.dicVarData = copy.deepcopy(_dicConstVars)
@@ -205,6 +237,73 @@ class CParser:
 
         self.pathLog: Path = None
 
+        # If True, variables are only evaluated when they are referenced for the first time.
+        # Otherwise, all variables are evaluated where they are defined.
+        self.bLazyVars: bool = bLazyVars
+
+        # If True, expression strings are compiled and executed by the expression VM
+        self.bExprVM: bool = bExprVM
+
+        # Maximal number of workers of parallel 'for each' calls. If None, the number of CPUs is used.
+        # Parallel calls are processed sequentially, if this is 1, or if this parser is itself a worker.
+        self.iMaxWorkers: Optional[int] = iMaxWorkers
+        self.bIsWorker: bool = False
+
+        # If True, the elements of the top level dictionary that are independent of each other
+        # are processed in parallel worker processes.
+        self.bParallelKeys: bool = bParallelKeys
+
+        # If True, Process() records the dependencies and results of the elements of the top level
+        # dictionary, so that Reprocess() only processes the elements that are affected by changes.
+        self.bTrackDeps: bool = bTrackDeps
+
+        # Files read with '$read' are cached by this parser, unless 'bCacheReads' is False.
+        # The cache should be disabled, if files are changed while the parser is running,
+        # since a change within the resolution of the file modification time is not detected.
+        self.xReadCache: Optional[CFileCache] = None
+        if bCacheReads is True:
+            self.xReadCache = CFileCache(_iMaxBytes=iReadCacheMaxBytes)
+        # endif
+        # The node that records the dependencies of the currently processed element
+        self._xDepNode: Optional[CDepNode] = None
+        # The node of the dependencies of the document outside of the top level elements
+        self._xDocDepNode: Optional[CDepNode] = None
+        # The nodes of the top level elements by key, that can be reused by the next Process() call
+        self._dicDepNodes: dict[str, CDepNode] = {}
+        self._dicDepNodesReuse: dict[str, CDepNode] = {}
+        # The data and import path of the last document processed with dependency tracking,
+        # and the constant variables it was processed with
+        self._tDepInput: Optional[tuple] = None
+        self._dicDepConstVars: dict = {}
+        # The stamps of the files the document depends on, taken when they were first read
+        self._dicFileStamps: dict = {}
+
+        # Ids of the containers in the currently processed data that contain no ISON syntax
+        self._dicStatic: dict = {}
+        # Ids of the static containers, that are shared with the data of cached files.
+        # They are copied, when they become part of a result.
+        self._dicShared: dict = {}
+
+        # Names of the global variables defined in, and the variables referenced by
+        # the containers of the currently processed data
+        self._dicGlobalDefs: dict = {}
+        self._dicVarRefs: dict = {}
+
+        # Variables that are currently evaluated, to detect cyclic references
+        self._dicVarEvalStack: dict = {}
+
+        # Variable matches of expressions that have been parsed beforehand, e.g. by a prepared document.
+        # These are used before the shared expression cache is consulted.
+        self.dicExprMatch: dict = {}
+
+        # Raw data of include files by absolute posix path, which is used instead of loading the files.
+        # The data is shared and never changed by the parser.
+        self.dicIncludeData: dict = {}
+        if isinstance(xParser, CParser):
+            self.dicExprMatch = xParser.dicExprMatch
+            self.dicIncludeData = xParser.dicIncludeData
+        # endif
+
         # RegEx for start of variable expression
         self.reVarStart = reVarStart
 
@@ -220,6 +319,13 @@ class CParser:
         # Initialize Function Pointers
         self.dicFunc = {}
         self.lLiteralArgsFuncs = []
+        self.setPureFuncs = set()
+        # Impure functions that record the files they depend on with AddFileDependency()
+        self.setDepFuncs = set()
+        # Functions that support lazy sequences as arguments (see CLazySeq)
+        self.setLazyArgsFuncs = set()
+        # Id of the function table, for which expressions are compiled
+        self._iFuncTableId: Optional[int] = None
 
         self.lValidVarTags = [
             "__runtime_vars__",
@@ -257,6 +363,75 @@ class CParser:
 
     # enddef
 
+    ################################################################################
+    # Returns the state a worker needs to process data in the current context of this
+    # parser, e.g. the elements of a parallel 'for each' call. The state can be pickled,
+    # if the variable data and the registered functions can be pickled.
+    def GetWorkerState(self, *, bTopData: bool = True) -> dict:
+        # Only the string form of function arguments is used in the context string
+        lParseContext = []
+        for xPC in self.lParseContext:
+            lData = None
+            if xPC.eContext == EParseContext.FUNC:
+                lData = [str(xArg)[:9] for xArg in xPC.lData]
+            # endif
+            lParseContext.append(CParseContextElement(eContext=xPC.eContext, sValue=xPC.sValue, lData=lData))
+        # endfor
+
+        # The top level data is only needed for references to '@top'
+        dicVarData = self.dicVarData
+        if bTopData is False and "@top" in dicVarData:
+            dicVarData = {sKey: xValue for sKey, xValue in dicVarData.items() if sKey != "@top"}
+        # endif
+
+        return {
+            "dicVarData": dicVarData,
+            "sImportPath": self.sImportPath,
+            "bLazyVars": self.bLazyVars,
+            "bExprVM": self.bExprVM,
+            "dicFunc": self.dicFunc,
+            "lLiteralArgsFuncs": self.lLiteralArgsFuncs,
+            "setPureFuncs": self.setPureFuncs,
+            "setDepFuncs": self.setDepFuncs,
+            "setLazyArgsFuncs": self.setLazyArgsFuncs,
+            "dicIncludeData": self.dicIncludeData,
+            "pathLog": self.pathLog,
+            "lParseContext": lParseContext,
+            "iReadCacheMaxBytes": self.xReadCache.iMaxBytes if self.xReadCache is not None else None,
+        }
+
+    # enddef
+
+    ################################################################################
+    # Create a worker parser from a state returned by GetWorkerState().
+    # The worker owns the state, so it must be a copy if the original parser is still used.
+    @classmethod
+    def FromWorkerState(cls, _dicState: dict) -> "CParser":
+        iReadCacheMaxBytes = _dicState["iReadCacheMaxBytes"]
+        xParser = cls(
+            {},
+            bLazyVars=_dicState["bLazyVars"],
+            bExprVM=_dicState["bExprVM"],
+            bCacheReads=iReadCacheMaxBytes is not None,
+            iReadCacheMaxBytes=iReadCacheMaxBytes or 0,
+        )
+        xParser.bIsWorker = True
+        xParser.sImportPath = _dicState["sImportPath"]
+        xParser.dicVarData = _dicState["dicVarData"]
+        xParser.dicFunc = _dicState["dicFunc"]
+        xParser.lLiteralArgsFuncs = _dicState["lLiteralArgsFuncs"]
+        xParser.setPureFuncs = _dicState["setPureFuncs"]
+        xParser.setDepFuncs = _dicState["setDepFuncs"]
+        xParser.setLazyArgsFuncs = _dicState["setLazyArgsFuncs"]
+        xParser.dicIncludeData = _dicState["dicIncludeData"]
+        xParser.pathLog = _dicState["pathLog"]
+        xParser.lParseContext = _dicState["lParseContext"]
+        xParser._bIsFullyProcessed = True
+
+        return xParser
+
+    # enddef
+
     ################################################################################
     def UpdateConstVars(self, _dicConstVars: dict, *, _bAllowOverwrite: bool = False, _bPrintWarnings: bool = False):
         if isinstance(_dicConstVars, dict):
@@ -281,11 +456,29 @@ class CParser:
             raise Exception("Element '__ison_functions__' of given module is not a dictionary")
         # endif
 
+        # Compiled expressions depend on the function table
+        self._iFuncTableId = None
+
         for sFunc, xExec in _xModule.__ison_functions__.items():
             if isinstance(xExec, dict) is True:
                 if xExec.get("bLiteralArgs", False) is True:
                     self.lLiteralArgsFuncs.append(sFunc)
                 # endif
+                if xExec.get("bPure", False) is True:
+                    self.setPureFuncs.add(sFunc)
+                else:
+                    self.setPureFuncs.discard(sFunc)
+                # endif
+                if xExec.get("bRecordsDeps", False) is True:
+                    self.setDepFuncs.add(sFunc)
+                else:
+                    self.setDepFuncs.discard(sFunc)
+                # endif
+                if xExec.get("bLazyArgs", False) is True:
+                    self.setLazyArgsFuncs.add(sFunc)
+                else:
+                    self.setLazyArgsFuncs.discard(sFunc)
+                # endif
                 funcExec = xExec.get("funcExec")
                 if funcExec is None:
                     raise RuntimeError(f"No implementation defined for function '{sFunc}'")
@@ -293,11 +486,60 @@ class CParser:
                 self.dicFunc[sFunc] = funcExec
             else:
                 self.dicFunc[sFunc] = xExec
+                self.setPureFuncs.discard(sFunc)
+                self.setDepFuncs.discard(sFunc)
+                self.setLazyArgsFuncs.discard(sFunc)
             # endif
         # endfor
 
     # enddef
 
+    ################################################################################
+    # A function is pure, if its result only depends on its arguments.
+    # Functions that are not declared as pure are never evaluated in advance.
+    def IsPureFunc(self, _sFunc: str) -> bool:
+        if _sFunc in self.dicFunc:
+            return _sFunc in self.setPureFuncs
+        # endif
+
+        return "{}.*".format(_sFunc.split(".")[0]) in self.setPureFuncs
+
+    # enddef
+
+    ################################################################################
+    # Record that the currently processed element depends on the given file or directory,
+    # if dependencies are tracked.
+    def AddFileDependency(self, _xPath):
+        if self._xDepNode is not None:
+            sFile = self._xDepNode.AddFile(_xPath)
+            if sFile not in self._dicFileStamps:
+                self._dicFileStamps[sFile] = io.GetFileStamp(sFile)
+            # endif
+        # endif
+
+    # enddef
+
+    ################################################################################
+    # Record a reference to the variable data with the given path. Variables are recorded
+    # by name, constant variables by their path and other top level elements by their key.
+    def _AddVarDependency(self, _sKey: str, _bFound: bool, _lPath: list):
+        xNode: CDepNode = self._xDepNode
+        if _bFound is True:
+            xNode.setVars.add(_sKey)
+
+        elif _sKey == "@top":
+            if len(_lPath) > 1 and isinstance(_lPath[1], str):
+                xNode.setTopKeys.add(_lPath[1])
+            else:
+                xNode.bVolatile = True
+            # endif
+
+        elif not _sKey.startswith("@"):
+            xNode.setConstPaths.add(tuple(str(x) for x in _lPath))
+        # endif
+
+    # enddef
+
     ################################################################################
     def Clear(self):
         self.ClearVariables()
@@ -305,6 +547,26 @@ class CParser:
 
     # enddef
 
+    ################################################################################
+    # Reset the variables to the given constant variables, so that another document
+    # is processed as by a new parser. The registered functions and the cache of
+    # read files are kept.
+    def ResetVariables(self, _dicConstVars: dict):
+        if isinstance(_dicConstVars, dict):
+            self.dicVarData = copy.deepcopy(_dicConstVars)
+        else:
+            self.dicVarData = {}
+        # endif
+
+        self.Clear()
+        self.ClearVarRuntime()
+        self.dicVarData["@func-storage"] = {}
+        self.xWarnings.Clear()
+        self.lParseContext = []
+        self.ProvideVariables()
+
+    # enddef
+
     ################################################################################
     def ClearVariables(self):
         self.ClearVarLocals()
@@ -376,18 +638,14 @@ class CParser:
             self.ClearVarGlobals()
         # endif
 
-        if "@loc" not in self.dicVarData:
-            self.ClearVarLocals()
+        if "@scope" not in self.dicVarData:
+            self.dicVarData["@scope"] = CVarScope()
         # endif
 
         if "@func-glo" not in self.dicVarData:
             self.ClearFuncGlobals()
         # endif
 
-        if "@func-loc" not in self.dicVarData:
-            self.ClearFuncLocals()
-        # endif
-
     # enddef
 
     ################################################################################
@@ -441,10 +699,13 @@ class CParser:
 
     ################################################################################
     def ClearVarLocals(self):
-        self.dicVarData["@loc"] = {}
-        self.dicVarData["@loc-eval"] = set()
-        self.dicVarData["@loc-s"] = []
-        self.dicVarData["@loc-eval-s"] = []
+        # Start a new scope chain, which keeps the current function locals
+        xScope = CVarScope()
+        xPrevScope: CVarScope = self.dicVarData.get("@scope")
+        if xPrevScope is not None:
+            xScope.dicFuncLoc = xPrevScope.dicFuncLoc
+        # endif
+        self.dicVarData["@scope"] = xScope
 
     # enddef
 
@@ -452,6 +713,7 @@ class CParser:
     def ClearVarGlobals(self):
         self.dicVarData["@glo"] = {}
         self.dicVarData["@glo-eval"] = set()
+        self.dicVarData["@glo-scope"] = {}
 
     # enddef
 
@@ -459,13 +721,20 @@ class CParser:
     def ClearVarRuntime(self):
         self.dicVarData["@rtv"] = {}
         self.dicVarData["@rtv-eval"] = set()
+        self.dicVarData["@rtv-scope"] = {}
 
     # enddef
 
     ################################################################################
     def ClearFuncLocals(self):
-        self.dicVarData["@func-loc"] = {}
-        self.dicVarData["@func-loc-s"] = []
+        # Start a new scope chain, which keeps the current locals
+        xScope = CVarScope()
+        xPrevScope: CVarScope = self.dicVarData.get("@scope")
+        if xPrevScope is not None:
+            xScope.dicLoc = xPrevScope.dicLoc
+            xScope.setLocEval = xPrevScope.setLocEval
+        # endif
+        self.dicVarData["@scope"] = xScope
 
     # enddef
 
@@ -634,6 +903,97 @@ class CParser:
 
     # enddef
 
+    ################################################################################
+    # Get the (cached) list of variable matches of the given string.
+    # The returned matches are shared and must not be modified.
+    def _GetVarMatchList(self, _sValue: str):
+        if self.reVarStart is not reVarStart:
+            # A parser with a different variable syntax cannot use the shared cache
+            return text.GetVarMatchList(_sValue, self.reVarStart)
+        # endif
+
+        tMatch = self.dicExprMatch.get(_sValue)
+        if tMatch is not None:
+            return tMatch
+        # endif
+
+        return CParser.xExprCache.GetVarMatchList(_sValue)
+
+    # enddef
+
+    ################################################################################
+    @staticmethod
+    def GetExprCacheStats() -> dict:
+        return CParser.xExprCache.GetStats()
+
+    # enddef
+
+    ################################################################################
+    @staticmethod
+    def ClearExprCache():
+        CParser.xExprCache.Clear()
+
+    # enddef
+
+    ################################################################################
+    # Statistics of the cache of files read with '$read', or None if it is disabled
+    def GetReadCacheStats(self) -> Optional[dict]:
+        if self.xReadCache is None:
+            return None
+        # endif
+        return self.xReadCache.GetStats()
+
+    # enddef
+
+    ################################################################################
+    def ClearReadCache(self):
+        if self.xReadCache is not None:
+            self.xReadCache.Clear()
+        # endif
+
+    # enddef
+
+    ################################################################################
+    # Read a file for a function like '$read'. Json files are decoded.
+    # Cached json data is shared, so only its spine is copied.
+    # Its static containers are copied, when they become part of the result of Process().
+    def ReadFile(self, _pathFile: Path, *, bJson: bool):
+        if self.xReadCache is None:
+            if bJson is True:
+                return io.LoadJson(_pathFile)
+            # endif
+            with open(_pathFile, "r") as xFile:
+                return xFile.read()
+            # endwith
+        # endif
+
+        xData, dicStatic, pathFile = self.xReadCache.Load(_pathFile, bJson=bJson)
+        if bJson is False:
+            return xData
+        # endif
+
+        self._dicShared.update(dicStatic)
+        if self.reVarStart is reVarStart:
+            self._dicStatic.update(dicStatic)
+        # endif
+        return data.CopyDataSpine(xData, self._dicStatic)
+
+    # enddef
+
+    ################################################################################
+    @staticmethod
+    def GetIncludeCacheStats() -> dict:
+        return CParser.xIncludeCache.GetStats()
+
+    # enddef
+
+    ################################################################################
+    @staticmethod
+    def ClearIncludeCache():
+        CParser.xIncludeCache.Clear()
+
+    # enddef
+
     ################################################################################
     def ReplacePureVars(self, _xData):
         """Replace pure variables only. No processing of function or nested variables.
@@ -673,6 +1033,7 @@ class CParser:
         _xData,
         sImportPath=None,
         lProcessPaths=None,
+        lSelectPaths=None,
         bPreProcessOnly=False,
         bIgnoreImport=False,
         dicGlobals=None,
@@ -683,6 +1044,7 @@ class CParser:
         dicFuncLocals=None,
         dicConstVars=None,
         bInPlace: bool = False,
+        dicStaticData: dict = None,
     ):
         sSelfIgnoreImport = self.bIgnoreImport
         self.bIgnoreImport = bIgnoreImport
@@ -698,13 +1060,28 @@ class CParser:
         self.xWarnings.Clear()
         self.lParseContext = []
 
+        # Only the selected paths and the elements they depend on are processed.
+        # The processing of common path prefixes is shared.
         lProcPathLists = None
-        lProcPathResults = []
+        lSelPathLists = None
         if lProcessPaths is not None:
             if not isinstance(lProcessPaths, list):
                 raise CParserError_Message(sMsg="Parameter 'lProcessPaths' has to be a list of strings")
             # endif
             lProcPathLists = [x.split("/") for x in lProcessPaths]
+            lSelPathLists = list(lProcPathLists)
+        # endif
+        if lSelectPaths is not None:
+            if not isinstance(lSelectPaths, list):
+                raise CParserError_Message(sMsg="Parameter 'lSelectPaths' has to be a list of paths")
+            # endif
+            lSelPathLists = (lSelPathLists or []) + [
+                x.split("/") if isinstance(x, str) else list(x) for x in lSelectPaths
+            ]
+        # endif
+        dicSelect = None
+        if lSelPathLists is not None:
+            dicSelect = var_deps.MakeSelectTree(lSelPathLists)
         # endif
 
         self._bIsFullyProcessed: bool = True
@@ -713,15 +1090,57 @@ class CParser:
         self.ClearFuncLocals()
 
         if isinstance(dicConstVars, dict):
-            data.UpdateDict(self.dicVarData, dicConstVars, "set constant variables", bAllowOverwrite=True)
+            data.UpdateDict(
+                self.dicVarData, dicConstVars, "set constant variables", bAllowOverwrite=True, bCopyOnWrite=True
+            )
+        # endif
+
+        # Dependencies are only recorded, if a complete document is processed.
+        # The top level element nodes offered by Reprocess() are reused.
+        self._xDocDepNode = None
+        self._dicDepNodes = {}
+        if self.bTrackDeps is True:
+            self._tDepInput = None
+            self._dicFileStamps = {}
+            if isinstance(_xData, dict) and lSelPathLists is None and not bPreProcessOnly and not bInPlace:
+                self._xDocDepNode = CDepNode()
+                self._tDepInput = (_xData, sImportPath)
+                self._dicDepConstVars = {
+                    sKey: copy.deepcopy(xValue) for sKey, xValue in self.dicVarData.items() if not sKey.startswith("@")
+                }
+            # endif
+        # endif
+        self._xDepNode = self._xDocDepNode
+
+        # Containers without any ISON syntax are shared with the input data,
+        # and they are returned by reference when processed.
+        # The static containers may also be given, if they have been collected beforehand
+        # with data.CollectStaticData().
+        dicSelfStatic = self._dicStatic
+        dicSelfShared = self._dicShared
+        dicStatic = self._dicStatic = {}
+        dicShared = self._dicShared = {}
+        if isinstance(dicStaticData, dict):
+            self._dicStatic.update(dicStaticData)
+        elif self.reVarStart is reVarStart:
+            data.CollectStaticData(_xData, self._dicStatic)
         # endif
 
         if bInPlace is False:
-            xData = copy.deepcopy(_xData)
+            # Only copy the data that is changed during processing
+            xData = data.CopyDataSpine(_xData, self._dicStatic)
         else:
             xData = _xData
         # endif
 
+        # Where global variables are defined, used to process dictionary elements in dependency order
+        dicSelfGlobalDefs = self._dicGlobalDefs
+        dicSelfVarRefs = self._dicVarRefs
+        self._dicGlobalDefs = {}
+        self._dicVarRefs = {}
+        var_deps.CollectGlobalDefs(xData, self._dicStatic, self._dicGlobalDefs)
+        self._dicVarEvalStack = {}
+
         data.AddVarsToData(
             xData,
             dicLocals=dicLocals,
@@ -730,35 +1149,40 @@ class CParser:
             dicEvalGlobals=dicEvalGlobals,
             dicFuncGlobals=dicFuncGlobals,
             dicFuncLocals=dicFuncLocals,
+            bCopyOnWrite=True,
         )
 
         try:
             if isinstance(xData, dict):
                 # add the xData to top level variable @this
                 self.dicVarData["@top"] = xData
-
-                if lProcPathLists is None:
-                    self._PreProcess(xData)
-                # endif
+                self._PreProcess(xData)
             # endif
 
             if bPreProcessOnly:
                 xResult = xData
             else:
-                if lProcPathLists is not None:
-                    for lPath in lProcPathLists:
-                        xResult, bIsProcessed = self.InnerProcess(xData, lPath=lPath)
-                        lProcPathResults.append(xResult)
-                    # endfor
-
-                else:
-                    xResult, bIsProcessed = self.InnerProcess(xData)
-
-                # endif
+                xResult, bIsProcessed = self.InnerProcess(xData, dicSelect=dicSelect)
             # endif
+
+            # The recorded dependencies are complete
+            self._xDepNode = None
         except CParserError as xEx:
             xEx.xWarnings = copy.deepcopy(self.xWarnings)
             raise xEx
+        finally:
+            self._dicStatic = dicSelfStatic
+            self._dicShared = dicSelfShared
+            self._dicGlobalDefs = dicSelfGlobalDefs
+            self._dicVarRefs = dicSelfVarRefs
+
+            # The dependencies of a failed run are incomplete, so its nodes cannot be reused
+            if self._xDepNode is not None:
+                self._xDepNode = None
+                self._xDocDepNode = None
+                self._dicDepNodes = {}
+            # endif
+            self._dicDepNodesReuse = {}
         # endtry
 
         if self.dicVarData.get("@top") is not None:
@@ -771,7 +1195,15 @@ class CParser:
         self.sImportPath = sSelfImportPath
         self.bIgnoreImport = sSelfIgnoreImport
 
-        if lProcPathLists is None:
+        # The result must not share containers with the cached files
+        if lProcPathLists is not None:
+            return [
+                data.CopySharedData(data.GetSelectedPath(xResult, lPath), dicShared, dicStatic)
+                for lPath in lProcPathLists
+            ]
+        # endif
+
+        if lSelPathLists is None:
             # add collected global variables to result if
             # result is a dictionary.
             if isinstance(xResult, dict):
@@ -782,14 +1214,164 @@ class CParser:
                     bAllowOverwrite=True,
                     bThrowOnDisallow=False,
                     bPrintWarnings=False,
+                    bCopyOnWrite=True,
                 )
             # endif
+        # endif
 
-            return xResult
-        else:
-            return lProcPathResults
+        if len(dicShared) > 0:
+            xResult = data.CopySharedData(xResult, dicShared, dicStatic)
         # endif
 
+        return xResult
+
+    # enddef
+
+    ################################################################################
+    # Process the elements of the iterable one after the other and yield their results,
+    # so that only one element is held in memory at a time.
+    # If the first element is a dictionary, whose keys all start with '__', like '__globals__'
+    # or '__includes__', it is the header of the elements. The header is processed once and the
+    # variables it defines are available in all elements. It has no result, and its global
+    # variables are not repeated in the '__globals__' and '__func_globals__' of the results.
+    # Variables defined by an element are not visible in the following elements.
+    def ProcessEach(self, _iterData, *, sImportPath=None):
+        lStateKeys = ["@glo", "@glo-eval", "@glo-scope", "@func-glo", "@rtv", "@rtv-eval", "@rtv-scope"]
+        self.ProvideVariables()
+
+        dicState = None
+        dicHeaderVars = None
+        for iIdx, xData in enumerate(_iterData):
+            if dicState is None:
+                if iIdx == 0 and isinstance(xData, dict) and len(xData) > 0:
+                    if all(isinstance(sKey, str) and sKey.startswith("__") for sKey in xData):
+                        self.Process(xData, sImportPath=sImportPath)
+                        dicState = {sKey: copy.copy(self.dicVarData[sKey]) for sKey in lStateKeys}
+                        dicHeaderVars = {"__globals__": dicState["@glo"], "__func_globals__": dicState["@func-glo"]}
+                        continue
+                    # endif
+                # endif
+                dicState = {sKey: copy.copy(self.dicVarData[sKey]) for sKey in lStateKeys}
+            else:
+                for sKey in lStateKeys:
+                    self.dicVarData[sKey] = copy.copy(dicState[sKey])
+                # endfor
+            # endif
+
+            xResult = self.Process(xData, sImportPath=sImportPath)
+
+            # Only the variables the element defines or changes are kept
+            if dicHeaderVars is not None and isinstance(xResult, dict):
+                for sVarKey, dicHeader in dicHeaderVars.items():
+                    dicVars = xResult.get(sVarKey)
+                    if isinstance(dicVars, dict) and len(dicHeader) > 0:
+                        xResult[sVarKey] = {
+                            sKey: xValue
+                            for sKey, xValue in dicVars.items()
+                            if sKey not in dicHeader or dicHeader[sKey] != xValue
+                        }
+                    # endif
+                # endfor
+            # endif
+
+            yield xResult
+        # endfor
+
+    # enddef
+
+    ################################################################################
+    # Process the document of the last call of Process() again, after the given constant
+    # variables have been updated and the given files have changed. Only the top level
+    # elements that depend on a change, or on a global variable or an '@top' element of
+    # such an element, are processed again. The results of all other elements are reused.
+    # All elements are processed, if the document outside of its top level elements depends
+    # on a change, if an element defines runtime variables, or if variables are lazy, as their
+    # evaluation is not recorded where they are defined. Requires a parser with 'bTrackDeps=True'.
+    # The reused results are shared with the returned data, so it must not be modified.
+    def Reprocess(self, *, dicConstVars: Optional[dict] = None, lChangedFiles: Optional[list] = None):
+        if self.bTrackDeps is False or self._tDepInput is None:
+            raise CParserError_Message(
+                sMsg="Reprocess() requires a document that has been processed with dependency tracking"
+            )
+        # endif
+
+        self.UpdateConstVars(dicConstVars, _bAllowOverwrite=True)
+
+        setChangedPaths = set()
+        for sKey in set(self._dicDepConstVars.keys()).union(self.dicVarData.keys()):
+            if not sKey.startswith("@"):
+                CollectChangedPaths(
+                    self._dicDepConstVars.get(sKey), self.dicVarData.get(sKey), (sKey,), setChangedPaths
+                )
+            # endif
+        # endfor
+
+        setChangedFiles = set()
+        if lChangedFiles is not None:
+            setChangedFiles.update(CDepNode.ToFileKey(x) for x in lChangedFiles)
+        # endif
+
+        dicNodes = self._dicDepNodes
+        xDocNode = self._xDocDepNode
+        if (
+            self.bLazyVars is True
+            or xDocNode is None
+            or xDocNode.IsAffected(setChangedPaths, setChangedFiles)
+            or any(xNode.bDefinesRtVars for xNode in dicNodes.values())
+        ):
+            dicNodes = {}
+        # endif
+
+        # Elements that read a global variable defined by an invalid element, or an invalid
+        # element via '@top', are invalid themselves.
+        setInvalid = set(x for x, xNode in dicNodes.items() if xNode.IsAffected(setChangedPaths, setChangedFiles))
+        setInvalidDefs = set()
+        bChanged = True
+        while bChanged is True:
+            bChanged = False
+            for sKey in setInvalid:
+                setInvalidDefs.update(dicNodes[sKey].fsDefs)
+            # endfor
+            for sKey, xNode in dicNodes.items():
+                if sKey not in setInvalid and (
+                    not xNode.setVars.isdisjoint(setInvalidDefs) or not xNode.setTopKeys.isdisjoint(setInvalid)
+                ):
+                    setInvalid.add(sKey)
+                    bChanged = True
+                # endif
+            # endfor
+        # endwhile
+
+        self._dicDepNodesReuse = {x: xNode for x, xNode in dicNodes.items() if x not in setInvalid}
+
+        xData, sImportPath = self._tDepInput
+        return self.Process(xData, sImportPath=sImportPath)
+
+    # enddef
+
+    ################################################################################
+    # Returns the absolute paths of the files, directories and '$dir' patterns, the last
+    # document processed with dependency tracking depends on, e.g. to watch them for changes.
+    def GetFileDependencies(self) -> list[str]:
+        setFiles = set()
+        if self._xDocDepNode is not None:
+            setFiles.update(self._xDocDepNode.setFiles)
+        # endif
+        for xNode in self._dicDepNodes.values():
+            setFiles.update(xNode.setFiles)
+        # endfor
+
+        return sorted(setFiles)
+
+    # enddef
+
+    ################################################################################
+    # Returns the stamps of the file dependencies (see GetFileDependencies() and io.GetFileStamp()),
+    # taken when they were first read by the last processed document. Files that were only read
+    # by elements, whose results have been reused by Reprocess(), have no stamp.
+    def GetFileStamps(self) -> dict:
+        return dict(self._dicFileStamps)
+
     # enddef
 
     ################################################################################
@@ -858,7 +1440,25 @@ class CParser:
                     raise CParserError_Message(sMsg="Include file recursively included: {}".format(pathInc.as_posix()))
                 # endif
 
-                dicIncRaw = io.LoadJson(pathInc)
+                # Preloaded include data is shared, so only its spine is copied.
+                # Its static containers are expected to be given to Process().
+                # Cached include data is shared in the same way, together with its static containers.
+                bCollectStatic = False
+                dicIncPre = self.dicIncludeData.get(pathInc.as_posix())
+                if dicIncPre is not None:
+                    dicIncRaw = data.CopyDataSpine(dicIncPre, self._dicStatic)
+                elif self.reVarStart is reVarStart:
+                    xIncData, dicIncStatic, pathIncFile = CParser.xIncludeCache.Load(pathInc)
+                    self._dicStatic.update(dicIncStatic)
+                    self._dicShared.update(dicIncStatic)
+                    dicIncRaw = data.CopyDataSpine(xIncData, self._dicStatic)
+                    self.AddFileDependency(pathIncFile)
+                else:
+                    dicIncRaw = io.LoadJson(pathInc)
+                    bCollectStatic = True
+                    self.AddFileDependency(io.ResolveJsonPath(pathInc))
+                # endif
+
                 if not isinstance(dicIncRaw, dict):
                     raise CParserError_Message(sMsg="Included file is not a dictionary: {}".format(pathInc.as_posix()))
                 # endif
@@ -866,6 +1466,10 @@ class CParser:
 
                 sStoreImportPath = self.sImportPath
                 self.sImportPath = pathInc.parent.as_posix()
+                if bCollectStatic is True and self.reVarStart is reVarStart:
+                    data.CollectStaticData(dicIncRaw, self._dicStatic)
+                # endif
+                var_deps.CollectGlobalDefs(dicIncRaw, self._dicStatic, self._dicGlobalDefs)
                 dicInc, bIsProcessed = self.InnerProcess(dicIncRaw)
                 self.sImportPath = sStoreImportPath
 
@@ -875,6 +1479,7 @@ class CParser:
                     "includes",
                     bAllowOverwrite=False,
                     bThrowOnDisallow=False,
+                    bCopyOnWrite=True,
                 )
 
                 self._ExitParseContext()
@@ -1010,6 +1615,9 @@ class CParser:
         # endif
         if len(dicRtVars) > 0:
             dicRtVars = data.GetPlatformDict(dicRtVars)
+            if self._xDepNode is not None:
+                self._xDepNode.bDefinesRtVars = True
+            # endif
         # endif
 
         self._AssertValidTagsInVarDef(dicRtVars, "definition of '__runtime_vars__'")
@@ -1095,7 +1703,8 @@ class CParser:
         self._AssertValidTagsInVarDef(dicFuncGlo, "definition of '__func_globals__'")
 
         ######################################################################################
-        # add func globals to var dict
+        # add func globals to var dict.
+        # Function variables are copied, as their definitions are processed anew for each call.
         if len(dicFuncGlo) > 0:
             data.UpdateDict(
                 self.dicVarFuncGlo,
@@ -1132,6 +1741,7 @@ class CParser:
                 bAllowOverwrite=True,
                 bPrintWarnings=False,
                 bIgnoreSpecialVars=True,
+                bCopyOnWrite=True,
             )
             lKeys["globals"].extend(dicGlobals.keys())
             # Newly added globals are removed from evaluated set
@@ -1152,6 +1762,7 @@ class CParser:
                 bAllowOverwrite=True,
                 bPrintWarnings=False,
                 bIgnoreSpecialVars=True,
+                bCopyOnWrite=True,
             )
             lKeys["locals"].extend(dicLocals.keys())
             # Newly added locals are removed from evaluated set
@@ -1172,6 +1783,7 @@ class CParser:
                 bAllowOverwrite=True,
                 bPrintWarnings=False,
                 bIgnoreSpecialVars=True,
+                bCopyOnWrite=True,
             )
             lKeys["rtv"].extend(dicRtVars.keys())
             # Newly added locals are removed from evaluated set
@@ -1182,6 +1794,11 @@ class CParser:
             # endfor
         # endif
 
+        if self.bLazyVars is True:
+            self._DeferDataVariables(_xData, dicLocals, dicGlobals, dicRtVars)
+            return lKeys
+        # endif
+
         ######################################################################################
         # Evaluate locals
         if len(dicLocals) > 0:
@@ -1191,12 +1808,15 @@ class CParser:
                     if sVarKey.startswith("__"):
                         continue
                     # endif
+                    dicVarLoc = self.dicVarLoc
                     try:
                         self._EnterParseContext(EParseContext.VAR, sVarKey)
-                        xEval, bIsProc = self.InnerProcess(self.dicVarLoc[sVarKey])
+                        self._EnterVarEval(dicVarLoc, sVarKey)
+                        xEval, bIsProc = self.InnerProcess(dicVarLoc[sVarKey])
                     except Exception as xEx:
                         raise CParserError_Message(sMsg=f"Error parsing variable '{sVarKey}'", xChildEx=xEx)
                     finally:
+                        self._ExitVarEval(dicVarLoc, sVarKey)
                         self._ExitParseContext()
                     # endtry
 
@@ -1226,10 +1846,12 @@ class CParser:
                     # endif
                     try:
                         self._EnterParseContext(EParseContext.VAR, sVarKey)
+                        self._EnterVarEval(self.dicVarGlo, sVarKey)
                         xEval, bIsProc = self.InnerProcess(self.dicVarGlo[sVarKey])
                     except Exception as xEx:
                         raise CParserError_Message(sMsg=f"Error parsing variable '{sVarKey}'", xChildEx=xEx)
                     finally:
+                        self._ExitVarEval(self.dicVarGlo, sVarKey)
                         self._ExitParseContext()
                     # endtry
                     if bIsProc is True:
@@ -1262,10 +1884,12 @@ class CParser:
 
                     try:
                         self._EnterParseContext(EParseContext.VAR, sVarKey)
+                        self._EnterVarEval(self.dicVarRtv, sVarKey)
                         xEval, bIsProc = self.InnerProcess(dicRtVars[sVarKey])
                     except Exception as xEx:
                         raise CParserError_Message(sMsg=f"Error parsing variable '{sVarKey}'", xChildEx=xEx)
                     finally:
+                        self._ExitVarEval(self.dicVarRtv, sVarKey)
                         self._ExitParseContext()
                     # endtry
 
@@ -1289,36 +1913,79 @@ class CParser:
     # enddef
 
     ################################################################################
-    def InnerProcess(self, _xData, bRemoveGlobals=False, lPath=None):
+    # Variables are not evaluated where they are defined, but when they are referenced first.
+    # The scope of the definition is stored for globals and runtime variables,
+    # so that they are evaluated in the same scope as in eager mode.
+    # Locals are evaluated in the scope that defines them.
+    def _DeferDataVariables(self, _xData, _dicLocals: dict, _dicGlobals: dict, _dicRtVars: dict):
+        xScope: CVarScope = self.xVarScope
+
+        if len(_dicLocals) > 0:
+            _xData["__locals__"] = _dicLocals
+        # endif
+
+        if len(_dicGlobals) > 0:
+            dicGloScope: dict = self.dicVarData.setdefault("@glo-scope", {})
+            for sVarKey in _dicGlobals:
+                if not sVarKey.startswith("__"):
+                    dicGloScope[sVarKey] = xScope
+                # endif
+            # endfor
+            _xData["__globals__"] = _dicGlobals
+        # endif
+
+        if len(_dicRtVars) > 0:
+            dicRtvScope: dict = self.dicVarData.setdefault("@rtv-scope", {})
+            for sVarKey in _dicRtVars:
+                if sVarKey.startswith("__"):
+                    continue
+                # endif
+                if sVarKey.startswith("@"):
+                    raise CParserError_Message(
+                        sMsg="Error parsing '__runtime_vars__'",
+                        xChildEx=CParserError_Message(
+                            sMsg=f"Runtime variable name must not start with '@': '{sVarKey}'"
+                        ),
+                    )
+                # endif
+                dicRtvScope[sVarKey] = xScope
+            # endfor
+            del _xData["__runtime_vars__"]
+        # endif
+
+    # enddef
+
+    ################################################################################
+    # If 'bLazy' is True, a lazy sequence, that results from a string, is returned as it is.
+    # This is used for function arguments. Otherwise, lazy sequences are converted to lists.
+    # If 'dicSelect' is given, only the selected elements of the data are processed (see Process()).
+    def InnerProcess(self, _xData, bRemoveGlobals=False, dicSelect=None, bLazy=False):
+        # Static data is returned as is
+        if dicSelect is None and id(_xData) in self._dicStatic:
+            return _xData, True
+        # endif
+
         # Provide variable dictionaries if they are not defined
         self.ProvideVariables()
 
+        # Lazy sequences are converted to lists, when they become part of the data
+        if isinstance(_xData, CLazySeq):
+            _xData = _xData.ToList()
+        # endif
+
         bIsProcessed = True
 
         if isinstance(_xData, dict):
             # Load includes if any
             self.ApplyIncludes(_xData, _sImportPath=self.sImportPath)
 
-            # Store current locals to recover them after processing
-            # dicParentLocals = copy.deepcopy(self.dicVarLoc)
-            # setParentLocalsEval = copy.deepcopy(self.setVarLocEval)
-            # dicParentFuncLocals = copy.deepcopy(self.dicVarFuncLoc)
-            self.lVarLocStack.append(self.dicVarLoc)
-            self.dicVarData["@loc"] = {}
-
-            self.lVarLocEvalStack.append(self.setVarLocEval)
-            self.dicVarData["@loc-eval"] = set()
-
-            self.lVarFuncLocStack.append(self.dicVarFuncLoc)
-            self.dicVarData["@func-loc"] = {}
+            # Enter a new scope for the locals of this dictionary
+            xParentScope: CVarScope = self.dicVarData["@scope"]
+            self.dicVarData["@scope"] = CVarScope(xParentScope)
 
             lVarKeys = self.ApplyDataVariables(_xData)
 
-            if lPath is not None and len(lPath) == 0:
-                xResult = _xData
-            else:
-                xResult, bIsProcessed = self._ProcessDict(_xData, lPath=lPath)
-            # endif
+            xResult, bIsProcessed = self._ProcessDict(_xData, dicSelect=dicSelect)
 
             if bRemoveGlobals:
                 for sKey in lVarKeys["globals"]:
@@ -1330,19 +1997,23 @@ class CParser:
                 # endfor
             # endif
 
-            self.dicVarData["@loc"] = self.lVarLocStack.pop()
-            self.dicVarData["@loc-eval"] = self.lVarLocEvalStack.pop()
-            self.dicVarData["@func-loc"] = self.lVarFuncLocStack.pop()
+            self.dicVarData["@scope"] = xParentScope
 
         elif isinstance(_xData, list):
-            if lPath is not None and len(lPath) > 0:
+            if dicSelect is not None:
                 raise CParserError_Message(
-                    sMsg="Given process path cannot be fully traversed. Remaining path: {0}".format("/".join(lPath))
+                    sMsg="Given process path cannot be fully traversed. Selected elements: {0}".format(
+                        ", ".join(dicSelect.keys())
+                    )
                 )
             # endif
             xResult, bIsProcessed = self._ProcessList(_xData)
 
         elif isinstance(_xData, str):
+            if dicSelect is None and self.reVarStart is reVarStart and data.IsStaticString(_xData):
+                return _xData, True
+            # endif
+
             # Process string should process the string until
             # there are no processable variables left, or the
             # result is something else but a string.
@@ -1350,20 +2021,20 @@ class CParser:
                 xResult, iMatchCnt, iProcCnt, iLiteralCnt = self._ProcessString(_xData)
                 bIsProcessed = iProcCnt == iMatchCnt
 
-                if (
-                    lPath is not None
-                    and len(lPath) > 0
-                    and not (isinstance(xResult, dict) or isinstance(xResult, list))
-                ):
+                if dicSelect is not None and not (isinstance(xResult, dict) or isinstance(xResult, (list, CLazySeq))):
                     raise CParserError_Message(
-                        sMsg="Given process path cannot be fully traversed. Remaining path: {0}".format("/".join(lPath))
+                        sMsg="Given process path cannot be fully traversed. Selected elements: {0}".format(
+                            ", ".join(dicSelect.keys())
+                        )
                     )
                 # endif
 
                 # if the result is not string, or it is a fully processed string
                 # then process the result again
-                if (not isinstance(xResult, str) or iMatchCnt > iLiteralCnt) and bIsProcessed:
-                    xResult, bIsProc = self.InnerProcess(xResult, lPath=lPath)
+                if bLazy is True and isinstance(xResult, CLazySeq):
+                    pass
+                elif (not isinstance(xResult, str) or iMatchCnt > iLiteralCnt) and bIsProcessed:
+                    xResult, bIsProc = self.InnerProcess(xResult, dicSelect=dicSelect)
                     bIsProcessed = bIsProcessed and bIsProc
                 # endif
             except Exception as xEx:
@@ -1379,7 +2050,7 @@ class CParser:
 
     ################################################################################
     # Process a dictionary
-    def _ProcessDict(self, _dicData, *, lPath=None):
+    def _ProcessDict(self, _dicData, *, dicSelect=None):
         # The output processed dictionary
         dicResult = {}
         bIsProcessed = True
@@ -1397,36 +2068,87 @@ class CParser:
             dicResult = "$L{{$*{{^{0}}}}}".format(sLambda)
             bIsProcessed = True
 
-        elif lPath is None or lPath[0] == "*":
-            # Loop over all elements of the input dictionary
-            for sObjId, xData in dicActData.items():
-                try:
-                    bIsProc = self._ProcessDictItem(dicResult, sObjId, xData)
-                    bIsProcessed = bIsProcessed and bIsProc
-                except Exception as xEx:
-                    raise CParserError_DictSel(dicData=dicActData, xId=sObjId, xChildEx=xEx)
-                # endtry
-            # endfor
+        elif dicSelect is None:
+            lOrder = self._GetDictItemOrder(dicActData)
+
+            # The dependencies of the top level elements are recorded per element
+            funcProcessItem = self._ProcessDictItem
+            bIsTop = _dicData is self.dicVarData.get("@top")
+            if bIsTop is True and self._xDepNode is not None and self._xDepNode is self._xDocDepNode:
+                funcProcessItem = self._ProcessDepNodeItem
+            # endif
+
+            tParallelResult = None
+            if self.bParallelKeys is True and self.bIsWorker is False and bIsTop is True and self._xDepNode is None:
+                tParallelResult = parallel.ProcessDictItemsParallel(self, dicActData, lOrder)
+            # endif
+
+            if tParallelResult is not None:
+                dicResult, bIsProcessed = tParallelResult
 
-        elif len(lPath) > 0:
-            sObjId = lPath[0]
-            lSubPath = lPath[1:]
-            if sObjId not in dicActData:
-                # raise Exception("Path component '{0}' not found in data".format(sObjId))
-                dicResult = None
+            elif lOrder is None:
+                # Loop over all elements of the input dictionary
+                for sObjId, xData in dicActData.items():
+                    try:
+                        bIsProc = funcProcessItem(dicResult, sObjId, xData)
+                        bIsProcessed = bIsProcessed and bIsProc
+                    except Exception as xEx:
+                        raise CParserError_DictSel(dicData=dicActData, xId=sObjId, xChildEx=xEx)
+                    # endtry
+                # endfor
             else:
+                # Process the elements in dependency order, but keep the element order in the result
+                lItems = list(dicActData.items())
+                lItemResults = [None] * len(lItems)
+                for iIdx in lOrder:
+                    sObjId, xData = lItems[iIdx]
+                    lItemResults[iIdx] = {}
+                    try:
+                        bIsProc = funcProcessItem(lItemResults[iIdx], sObjId, xData)
+                        bIsProcessed = bIsProcessed and bIsProc
+                    except Exception as xEx:
+                        raise CParserError_DictSel(dicData=dicActData, xId=sObjId, xChildEx=xEx)
+                    # endtry
+                # endfor
+                for dicItemResult in lItemResults:
+                    dicResult.update(dicItemResult)
+                # endfor
+            # endif
+
+        else:
+            # Only the selected elements and the elements they depend on are processed,
+            # but only the selected elements are part of the result.
+            lItems = list(dicActData.items())
+            lProcess = var_deps.GetSelectedItems(
+                lItems, dicSelect, self._GetVarMatchList, self._dicStatic, self._dicGlobalDefs
+            )[0]
+            lOrder = self._GetDictItemOrder(dicActData)
+            if lOrder is None:
+                lOrder = range(len(lItems))
+            # endif
+
+            lItemResults = [None] * len(lItems)
+            for iIdx in lOrder:
+                sObjId, xData = lItems[iIdx]
+                if lProcess[iIdx] is False or sObjId.startswith("__"):
+                    continue
+                # endif
+                lItemResults[iIdx] = {}
                 try:
-                    xData = dicActData[sObjId]
-                    bIsProc = self._ProcessDictItem(dicResult, sObjId, xData, lPath=lSubPath)
+                    bIsProc = self._ProcessDictItem(
+                        lItemResults[iIdx], sObjId, xData, dicSelect=dicSelect.get(sObjId)
+                    )
                     bIsProcessed = bIsProcessed and bIsProc
                 except Exception as xEx:
                     raise CParserError_DictSel(dicData=dicActData, xId=sObjId, xChildEx=xEx)
                 # endtry
-            # endif
-
-        else:
-            dicResult = dicActData
+            # endfor
 
+            for dicItemResult in lItemResults:
+                if dicItemResult is not None:
+                    dicResult.update((sKey, xValue) for sKey, xValue in dicItemResult.items() if sKey in dicSelect)
+                # endif
+            # endfor
         # endif
 
         self._ExitParseContext()
@@ -1436,7 +2158,127 @@ class CParser:
     # enddef
 
     ################################################################################
-    def _ProcessDictItem(self, _dicResult, _sObjId, _xData, lPath=None):
+    # Process an element of the top level dictionary and record its dependencies in a node.
+    # If the element has a node from the previous run, that is offered for reuse, the result
+    # and the global variables defined by the element are taken from the node.
+    def _ProcessDepNodeItem(self, _dicResult, _sObjId, _xData):
+        if _sObjId.startswith("__"):
+            return self._ProcessDictItem(_dicResult, _sObjId, _xData)
+        # endif
+
+        xNode: CDepNode = self._dicDepNodesReuse.get(_sObjId)
+        if xNode is None:
+            xNode = CDepNode()
+            setGlobals = set(self.dicVarGlo.keys())
+            setFuncGlobals = set(self.dicVarFuncGlo.keys())
+            bIsFullyProcessed = self._bIsFullyProcessed
+            xWarnings = self.xWarnings
+
+            self._xDepNode = xNode
+            self._bIsFullyProcessed = True
+            self.xWarnings = xNode.xWarnings = CWarningList()
+            try:
+                xNode.dicResult = {}
+                xNode.bIsProcessed = self._ProcessDictItem(xNode.dicResult, _sObjId, _xData)
+            finally:
+                self._xDepNode = self._xDocDepNode
+                xNode.bIsFullyProcessed = self._bIsFullyProcessed
+                self._bIsFullyProcessed = bIsFullyProcessed
+                self.xWarnings = xWarnings
+                self.xWarnings.AddList(xNode.xWarnings)
+            # endtry
+
+            # The globals defined by the element, also those of its include files
+            setDefs = set(self._dicGlobalDefs.get(id(_xData), frozenset()))
+            setDefs.update(x for x in self.dicVarGlo if x not in setGlobals)
+            setDefs.update(x for x in self.dicVarFuncGlo if x not in setFuncGlobals)
+            xNode.fsDefs = frozenset(setDefs)
+            xNode.dicGlobals = {x: self.dicVarGlo[x] for x in setDefs if x in self.dicVarGlo}
+            xNode.setGlobalsEval = set(x for x in xNode.dicGlobals if x in self.setVarGloEval)
+            xNode.dicFuncGlobals = {x: self.dicVarFuncGlo[x] for x in setDefs if x in self.dicVarFuncGlo}
+
+        else:
+            self.dicVarGlo.update(xNode.dicGlobals)
+            self.setVarGloEval.update(xNode.setGlobalsEval)
+            self.dicVarFuncGlo.update(xNode.dicFuncGlobals)
+            self.xWarnings.AddList(xNode.xWarnings)
+            self._bIsFullyProcessed = self._bIsFullyProcessed and xNode.bIsFullyProcessed
+        # endif
+
+        self._dicDepNodes[_sObjId] = xNode
+        _dicResult.update(xNode.dicResult)
+        return xNode.bIsProcessed
+
+    # enddef
+
+    ################################################################################
+    # Get the order in which the dictionary elements have to be processed, so that
+    # elements that reference global variables, which are not yet defined, are processed
+    # after the elements that define them. Returns None, if the given order can be used.
+    def _GetDictItemOrder(self, _dicData: dict) -> Optional[list[int]]:
+        if len(self._dicGlobalDefs) == 0 or len(_dicData) < 2:
+            return None
+        # endif
+
+        lDefs = []
+        bHasDefs = False
+        for sObjId, xData in _dicData.items():
+            if isinstance(sObjId, str) and sObjId.startswith("__"):
+                lDefs.append(frozenset())
+                continue
+            # endif
+            fsDefs = self._dicGlobalDefs.get(id(xData), frozenset())
+            if len(fsDefs) > 0:
+                # Variables that are already defined do not create a dependency
+                fsDefs = frozenset(x for x in fsDefs if not self._IsVarDefined(x))
+                bHasDefs = bHasDefs or len(fsDefs) > 0
+            # endif
+            lDefs.append(fsDefs)
+        # endfor
+
+        if bHasDefs is False:
+            return None
+        # endif
+
+        lRefs = []
+        for sObjId, xData in _dicData.items():
+            if isinstance(sObjId, str) and sObjId.startswith("__"):
+                lRefs.append(frozenset())
+            else:
+                fsRefs = var_deps.CollectVarRefs(xData, self._GetVarMatchList, self._dicStatic, self._dicVarRefs)
+                if isinstance(sObjId, str) and "$" in sObjId:
+                    fsRefs = fsRefs.union(var_deps.CollectVarRefs(sObjId, self._GetVarMatchList, {}, {}))
+                # endif
+                lRefs.append(fsRefs)
+            # endif
+        # endfor
+
+        lOrder = var_deps.GetProcessOrder(lDefs, lRefs)
+        if all(iIdx == iPos for iPos, iIdx in enumerate(lOrder)):
+            return None
+        # endif
+        return lOrder
+
+    # enddef
+
+    ################################################################################
+    # Test whether a variable of the given name is currently defined
+    def _IsVarDefined(self, _sName: str) -> bool:
+        if (
+            _sName in self.dicVarGlo
+            or _sName in self.dicVarFuncGlo
+            or _sName in self.dicVarRtv
+            or (_sName in self.dicVarData and not _sName.startswith("@"))
+        ):
+            return True
+        # endif
+        xScope: CVarScope = self.xVarScope
+        return xScope.FindLocal(_sName) is not None or xScope.FindFuncLocal(_sName) is not None
+
+    # enddef
+
+    ################################################################################
+    def _ProcessDictItem(self, _dicResult, _sObjId, _xData, dicSelect=None):
         # if the object id is a special key word, ignore the content
         # for example, locals, globals and pre elements are not processed here
         if _sObjId.startswith("__"):
@@ -1450,7 +2292,7 @@ class CParser:
 
         # Check whether the current dictionary key contains a variable
         try:
-            lMatch = text.GetVarMatchList(_sObjId, self.reVarStart)
+            lMatch = self._GetVarMatchList(_sObjId)
         except Exception as xEx:
             raise CParserError_ProcKey(sType="proc-key", sKey=_sObjId, xChildEx=xEx)
         # endtry
@@ -1460,7 +2302,7 @@ class CParser:
         if iVarCnt == 0:
             # The key does not contain a variable.
             # In this case, process the key's content and store the result in the output dict.
-            _dicResult[_sObjId], bIsProc = self.InnerProcess(_xData, lPath=lPath)
+            _dicResult[_sObjId], bIsProc = self.InnerProcess(_xData, dicSelect=dicSelect)
             bIsProcessed = bIsProcessed and bIsProc
 
         elif iVarCnt > 1:
@@ -1472,6 +2314,7 @@ class CParser:
             for dicMatch in lMatch:
                 try:
                     xVarData, bIsLiteral = self._ProcessVarMatch(dicMatch)
+                    xVarData = ToData(xVarData)
                 except Exception as xEx:
                     raise CParserError_KeyStrMatch(sString=_sObjId, dicMatch=dicMatch, xChildEx=xEx)
                 # endtry
@@ -1498,7 +2341,7 @@ class CParser:
 
             if bIsProcessed is True and iLiteralCnt == 0:
                 try:
-                    bIsProc = self._ProcessDictItem(_dicResult, sNewObjId, _xData, lPath=lPath)
+                    bIsProc = self._ProcessDictItem(_dicResult, sNewObjId, _xData, dicSelect=dicSelect)
                     bIsProcessed = bIsProcessed and bIsProc
                 except Exception as xEx:
                     raise CParserError_DictSel(dicData=_xData, xId=sNewObjId, xChildEx=xEx)
@@ -1510,6 +2353,7 @@ class CParser:
             dicMatch = lMatch[0]
             try:
                 xVarData, bIsLiteral = self._ProcessVarMatch(dicMatch)
+                xVarData = ToData(xVarData)
             except Exception as xEx:
                 raise CParserError_KeyStrMatch(sString=_sObjId, dicMatch=dicMatch, xChildEx=xEx)
             # endtry
@@ -1520,7 +2364,7 @@ class CParser:
             # If the variable is not in the replacement dictionary...
             if xVarData is None or bIsLiteral is True:
                 # ... then process the key's content and leave the key unchanged, as it may be processed later.
-                _dicResult[_sObjId], bIsProc = self.InnerProcess(_xData, lPath=lPath)
+                _dicResult[_sObjId], bIsProc = self.InnerProcess(_xData, dicSelect=dicSelect)
                 bIsProcessed = bIsProcessed and bIsProc
 
             else:
@@ -1529,7 +2373,7 @@ class CParser:
                     # if it is a string, use this string a new key and process the content
                     sNewObjId = _sObjId[0 : dicMatch.get("iStart")] + xVarData + _sObjId[dicMatch.get("iEnd") :]
                     try:
-                        bIsProc = self._ProcessDictItem(_dicResult, sNewObjId, _xData, lPath=lPath)
+                        bIsProc = self._ProcessDictItem(_dicResult, sNewObjId, _xData, dicSelect=dicSelect)
                         bIsProcessed = bIsProcessed and bIsProc
                     except Exception as xEx:
                         raise CParserError_DictItem(xData=_xData, xId=sNewObjId, xChildEx=xEx)
@@ -1573,7 +2417,7 @@ class CParser:
                         self.dicVarData[sCtxValId] = xVar
 
                         try:
-                            bIsProc = self._ProcessDictItem(_dicResult, sNewObjId, _xData, lPath=lPath)
+                            bIsProc = self._ProcessDictItem(_dicResult, sNewObjId, _xData, dicSelect=dicSelect)
                             bIsProcessed = bIsProcessed and bIsProc
                         except Exception as xEx:
                             raise CParserError_DictItem(xData=_xData, xId=sNewObjId, xChildEx=xEx)
@@ -1616,7 +2460,7 @@ class CParser:
                         self.dicVarData[sCtxValId] = xEl
 
                         try:
-                            bIsProc = self._ProcessDictItem(_dicResult, sNewObjId, _xData, lPath=lPath)
+                            bIsProc = self._ProcessDictItem(_dicResult, sNewObjId, _xData, dicSelect=dicSelect)
                             bIsProcessed = bIsProcessed and bIsProc
 
                         except Exception as xEx:
@@ -1688,9 +2532,19 @@ class CParser:
 
     ################################################################################
     def _ProcessString(self, _sData):
+        if self.bExprVM is True and self.reVarStart is reVarStart:
+            if self._iFuncTableId is None:
+                self._iFuncTableId = CParser.xExprVM.GetFuncTableId(self)
+            # endif
+            tCode = CParser.xExprVM.GetProgram(self, _sData)
+            if tCode is not None:
+                return CExprVM.Execute(self, tCode)
+            # endif
+        # endif
+
         # Find all variable matches
         try:
-            lMatch = text.GetVarMatchList(_sData, self.reVarStart)
+            lMatch = self._GetVarMatchList(_sData)
         except Exception as xEx:
             raise CParserError_ProcStr(sString=_sData, sContext="Find variables", xChildEx=xEx)
         # endtry
@@ -1779,7 +2633,7 @@ class CParser:
             # endif
 
             if not isinstance(xValue, str):
-                xValue = text.ToString(xValue)
+                xValue = text.ToString(ToData(xValue))
                 # raise Exception("Result of variable '{0}' is not a string".format(_sData))
             # endif
 
@@ -1804,17 +2658,18 @@ class CParser:
 
         for iArgIdx, sArg in enumerate(_lArgs):
             self._EnterParseContext(EParseContext.ARG, sArg)
+            # The kind of an argument is determined by the expression lexer
+            eArgKind, sKey, sValue = expr_lexer.GetArgKind(sArg)
+
             # dummy loop to enable break to jump to end of while
             while True:
-                xMatch = reLambdaPar.match(sArg)
-                if xMatch is not None:
+                if eArgKind == EArgKind.LAMBDA_PAR:
                     lVarData.append(sArg)
                     lVarIsProc.append(False)
                     break
                 # endif
 
-                xMatch = reLiteralArg.match(sArg)
-                if xMatch is not None:
+                if eArgKind == EArgKind.LITERAL:
                     sArg = sArg.strip()
 
                     lVarData.append(sArg[1:])
@@ -1827,8 +2682,7 @@ class CParser:
                 # "${value}" is processed and the result is unwrapped
                 # as a list of arguments, that is inserted at the position
                 # of the original argument.
-                xMatch = reUnrollArg.match(sArg)
-                if xMatch is not None:
+                if eArgKind == EArgKind.UNROLL:
                     sArg = sArg.strip()
                     try:
                         lSubVarData, lSubVarIsProc = self._ProcessArgs([sArg[1:]])
@@ -1844,7 +2698,7 @@ class CParser:
                         return None, None
                     else:
                         xSubVarData = lSubVarData[0]
-                        if isinstance(xSubVarData, list):
+                        if isinstance(xSubVarData, (list, CLazySeq)):
                             lVarData.extend(xSubVarData)
                         elif isinstance(xSubVarData, dict):
                             lVarData.extend(list(xSubVarData.items()))
@@ -1857,11 +2711,7 @@ class CParser:
                     break
                 # endif unroll arg
 
-                xMatch = reNamedArg.match(sArg)
-                if xMatch is not None:
-                    sKey = xMatch.group("name")
-                    sValue = xMatch.group("value")
-
+                if eArgKind == EArgKind.NAMED:
                     xMatchUnrollArg = reUnrollArg.match(sValue)
                     xMatchTupleArg = reTupleArg.match(sValue)
 
@@ -1880,8 +2730,7 @@ class CParser:
                     break
                 # endif
 
-                xMatch = reTupleArg.match(sArg)
-                if xMatch is not None:
+                if eArgKind == EArgKind.TUPLE:
                     sArg = sArg.strip()
                     # if the argument starts with '(' then process the element
                     # inside the bracket and put the result into a tuple and
@@ -1911,7 +2760,7 @@ class CParser:
                 bIsProcessed = False
 
                 try:
-                    xVarData, bIsProcessed = self.InnerProcess(sArg)
+                    xVarData, bIsProcessed = self.InnerProcess(sArg, bLazy=True)
                 except Exception as xEx:
                     raise CParserError_ProcArgListElement(lArgList=_lArgs, iArgIdx=iArgIdx, xChildEx=xEx)
                 # endtry
@@ -1941,7 +2790,7 @@ class CParser:
         lVarIsProc = []
 
         if sFunc in self.lLiteralArgsFuncs:
-            lVarData = lArgs
+            lVarData = list(lArgs)
             lVarIsProc = [False for x in lArgs]
         else:
             try:
@@ -1977,6 +2826,9 @@ class CParser:
 
     ################################################################################
     def _ProcessFunc(self, _sFunc, _lArgs, _lArgIsProc):
+        self.MaterializeArgs(_sFunc, _lArgs)
+        self.RecordFuncCall(_sFunc)
+
         funcExec = self.dicFunc.get(_sFunc)
         if funcExec is None:
             lParts = _sFunc.split(".")
@@ -1997,11 +2849,83 @@ class CParser:
     # enddef
 
     ################################################################################
-    def _ProcVar(self, _dicVarRead: dict, _setVarEvalRead: set, _sKey: str, _dicVarWrite: dict, _setVarEvalWrite: set):
+    # Record the call of the function for the dependency tracking of the current element.
+    # The results of impure functions, that do not record their dependencies, may change with every call.
+    def RecordFuncCall(self, _sFunc):
+        if (
+            self._xDepNode is not None
+            and _sFunc not in var_deps.fsCodeFuncs
+            and _sFunc not in self.setDepFuncs
+            and not self.IsPureFunc(_sFunc)
+        ):
+            self._xDepNode.bVolatile = True
+        # endif
+
+    # enddef
+
+    ################################################################################
+    # Convert lazy sequences in the arguments to lists, unless the function supports them
+    def MaterializeArgs(self, _sFunc, _lArgs: list):
+        if _sFunc not in self.setLazyArgsFuncs:
+            for iIdx, xArg in enumerate(_lArgs):
+                if isinstance(xArg, CLazySeq):
+                    _lArgs[iIdx] = xArg.ToList()
+                # endif
+            # endfor
+        # endif
+
+    # enddef
+
+    ################################################################################
+    # Register the start of the evaluation of a variable. If the variable is
+    # already being evaluated, its definition references itself through the
+    # variables on the evaluation stack, which is reported as cycle.
+    def _EnterVarEval(self, _dicVars: dict, _sKey: str):
+        tVarId = (id(_dicVars), _sKey)
+        if tVarId in self._dicVarEvalStack:
+            lVarIds = list(self._dicVarEvalStack.keys())
+            lCycle = [self._dicVarEvalStack[x] for x in lVarIds[lVarIds.index(tVarId) :]]
+            lCycle.append(_sKey)
+            raise CParserError_VarCycle(lCycle=lCycle)
+        # endif
+        self._dicVarEvalStack[tVarId] = _sKey
+
+    # enddef
+
+    ################################################################################
+    def _ExitVarEval(self, _dicVars: dict, _sKey: str):
+        self._dicVarEvalStack.pop((id(_dicVars), _sKey), None)
+
+    # enddef
+
+    ################################################################################
+    def _ProcVar(
+        self,
+        _dicVarRead: dict,
+        _setVarEvalRead: set,
+        _sKey: str,
+        _dicVarWrite: dict,
+        _setVarEvalWrite: set,
+        _xEvalScope: Optional[CVarScope] = None,
+    ):
         bFound = False
         bIsProc = False
         xNewVal = None
 
+        # A deferred variable is evaluated in the scope where it is defined
+        # and the result is stored where it is defined.
+        if _xEvalScope is not None and _sKey not in _setVarEvalRead:
+            _dicVarWrite = _dicVarRead
+            _setVarEvalWrite = _setVarEvalRead
+            xCurScope: CVarScope = self.dicVarData["@scope"]
+            self.dicVarData["@scope"] = _xEvalScope
+            try:
+                return self._ProcVar(_dicVarRead, _setVarEvalRead, _sKey, _dicVarWrite, _setVarEvalWrite)
+            finally:
+                self.dicVarData["@scope"] = xCurScope
+            # endtry
+        # endif
+
         if _sKey in _setVarEvalRead:
             bFound = True
             bIsProc = True
@@ -2011,7 +2935,12 @@ class CParser:
             self._EnterParseContext(EParseContext.VAR, _sKey)
             bFound = True
             xVar = _dicVarRead[_sKey]
-            xNewVal, bIsProc = self.InnerProcess(xVar)
+            self._EnterVarEval(_dicVarRead, _sKey)
+            try:
+                xNewVal, bIsProc = self.InnerProcess(xVar)
+            finally:
+                self._ExitVarEval(_dicVarRead, _sKey)
+            # endtry
             # if the variable is not fully processed, then do not flag it as processed,
             # but store the possibly partially processed result back in the variable dict.
             if bIsProc is True:
@@ -2032,57 +2961,54 @@ class CParser:
         bHasVars = False
         xNewVal = None
 
-        if "@loc" in _xData:
+        xScope: CVarScope = _xData.get("@scope")
+        if xScope is not None:
             bHasVars = True
-            dicLocAct: dict = _xData["@loc"]
-            setLocEvalAct: set = _xData["@loc-eval"]
-            xNewVal, bFound, bIsProc = self._ProcVar(dicLocAct, setLocEvalAct, _sKey, dicLocAct, setLocEvalAct)
-
-            if bFound is False:
-                lLocVarStack: list[dict] = _xData.get("@loc-s")
-                lLocVarEvalStack: list[set] = _xData.get("@loc-eval-s")
-                if lLocVarStack is not None and lLocVarEvalStack is not None:
-                    for dicLoc, setEval in zip(reversed(lLocVarStack), reversed(lLocVarEvalStack)):
-                        xNewVal, bFound, bIsProc = self._ProcVar(dicLoc, setEval, _sKey, dicLocAct, setLocEvalAct)
-                        if bFound is True:
-                            break
-                        # endif
-                    # endwhile
-                # endif
+            # Locals are read from the frame that defines them, but the result of
+            # their evaluation is stored in the current frame.
+            xDefScope: CVarScope = xScope.FindLocal(_sKey)
+            if xDefScope is not None:
+                xNewVal, bFound, bIsProc = self._ProcVar(
+                    xDefScope.dicLoc,
+                    xDefScope.GetLocalsEval(),
+                    _sKey,
+                    xScope.GetLocals(),
+                    xScope.GetLocalsEval(),
+                    _xEvalScope=xDefScope if self.bLazyVars is True else None,
+                )
             # endif
         # endif
 
         if bFound is False and "@glo" in _xData:
             bHasVars = True
             xNewVal, bFound, bIsProc = self._ProcVar(
-                _xData["@glo"], _xData["@glo-eval"], _sKey, _xData["@glo"], _xData["@glo-eval"]
+                _xData["@glo"],
+                _xData["@glo-eval"],
+                _sKey,
+                _xData["@glo"],
+                _xData["@glo-eval"],
+                _xEvalScope=_xData.get("@glo-scope", {}).get(_sKey),
             )
         # endif
 
         if bFound is False and "@rtv" in _xData:
             bHasVars = True
             xNewVal, bFound, bIsProc = self._ProcVar(
-                _xData["@rtv"], _xData["@rtv-eval"], _sKey, _xData["@rtv"], _xData["@rtv-eval"]
+                _xData["@rtv"],
+                _xData["@rtv-eval"],
+                _sKey,
+                _xData["@rtv"],
+                _xData["@rtv-eval"],
+                _xEvalScope=_xData.get("@rtv-scope", {}).get(_sKey),
             )
         # endif
 
-        if bFound is False and "@func-loc" in _xData:
-            bHasVars = True
-            if _sKey in _xData["@func-loc"]:
+        if bFound is False and xScope is not None:
+            xDefScope: CVarScope = xScope.FindFuncLocal(_sKey)
+            if xDefScope is not None:
                 bFound = True
                 bIsProc = True
-                xNewVal = _xData["@func-loc"][_sKey]
-            # endif
-            if bFound is False:
-                lFuncLocVarStack: list[dict] = _xData["@func-loc-s"]
-                for dicFuncLoc in reversed(lFuncLocVarStack):
-                    if _sKey in dicFuncLoc:
-                        bFound = True
-                        bIsProc = True
-                        xNewVal = dicFuncLoc[_sKey]
-                        break
-                    # endif
-                # endfor
+                xNewVal = xDefScope.dicFuncLoc[_sKey]
             # endif
         # endif
 
@@ -2157,7 +3083,7 @@ class CParser:
                 # endtry
             # endif xResult is string
 
-        elif isinstance(_xValue, list):
+        elif isinstance(_xValue, (list, CLazySeq)):
             xKey = _lMatch[_iMatchIdx]
             xResult, bLiteral = self._ProcessRefPathListKey(_xValue, xKey, _lMatch, _iMatchIdx)
 
@@ -2185,6 +3111,9 @@ class CParser:
 
             # Try to obtain variable from global, locals, func vars
             xNewVal, bFound, bIsProc = self._GetVar(_xValue, sKey)
+            if self._xDepNode is not None and _xValue is self.dicVarData:
+                self._AddVarDependency(sKey, bFound, _lMatch[_iMatchIdx:])
+            # endif
             if bFound is True and (xNewVal is None or bIsProc is False):
                 # Variable was found but could not be fully evaluated.
                 self._bIsFullyProcessed = False
@@ -2322,6 +3251,13 @@ class CParser:
                 elif iFirst > iLast and iStep >= 0:
                     raise CParserError_Message(sMsg="Step size must be smaller than zero in slice.")
                 # endif
+
+                # A slice at the end of the path is a view of the list, if all its indices are valid
+                rngIdx = range(iFirst, iLast + iStep, iStep)
+                if _iMatchIdx + 1 == len(_lMatch) and rngIdx[0] < iDataLen and rngIdx[-1] < iDataLen:
+                    return CLazySeq.FromIndices(_lData, rngIdx), False
+                # endif
+
                 xResult = []
                 for iIdx in range(iFirst, iLast + iStep, iStep):
                     try:
@@ -482,3 +482,23 @@ class CParserError_ProcLambdaPart(CParserError):
 
 
 # endclass
+
+
+###########################################################################################
+class CParserError_VarCycle(CParserError):
+    def __init__(self, *, lCycle, xChildEx=None):
+
+        sMsg = "Cyclic variable reference: {}".format(" -> ".join(lCycle))
+
+        super().__init__(
+            sMsg=sMsg,
+            sType="var-cycle",
+            xData=lCycle,
+            xSelect=None,
+            xChildEx=xChildEx,
+        )
+
+    # enddef
+
+
+# endclass
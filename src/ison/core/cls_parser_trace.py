@@ -132,6 +132,15 @@ class CWarningList:
 
     # enddef
 
+    def AddList(self, _xWarnings: "CWarningList"):
+        for dicWarn in _xWarnings.dicWarnType.values():
+            for xWarn in dicWarn.values():
+                self.Add(xWarn)
+            # endfor
+        # endfor
+
+    # enddef
+
     def FilterList(self, _dicExclude: dict[EWarningType, list[str]]) -> "CWarningList":
         xNewList = CWarningList()
         for eType, dicWarn in self.dicWarnType.items():
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \cls_prepared_doc.py
+# Created Date: Sunday, October 18th 2026, 10:14:52 am
+# Author: Christian Perwass
+# <LICENSE id="Apache-2.0">
+#
+#   Functional JSON module
+#   Copyright 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# </LICENSE>
+###
+
+import os
+import sys
+from typing import Optional
+from pathlib import Path
+
+from ..util import data
+from ..util import io
+from ..util import path
+from .cls_parser import CParser
+from .cls_const_folder import CConstFolder
+from .cls_parser_error import CParserError_Message
+
+
+####################################################################################
+# ISON document that is prepared once and can then be processed many times
+# with different constant variables.
+# Preparing the document loads all include files with a constant path, folds constant
+# expressions and parses all other expressions of the document and its include files.
+# Only the work that depends on the constant variables is done in Execute().
+# The object can be pickled, to execute it in another process. The static containers
+# of the data are identified by their id, so they are collected again after unpickling.
+class CPreparedDocument:
+    def __init__(
+        self,
+        _xData,
+        *,
+        sImportPath: Optional[str] = None,
+        bLazyVars: bool = False,
+        bExprVM: bool = False,
+        bFoldConstants: bool = True,
+    ):
+        if isinstance(_xData, str):
+            self._xData = io.decode_json(_xData)
+        else:
+            self._xData = _xData
+        # endif
+
+        self.sImportPath: Optional[str] = None
+        if sImportPath is not None and os.path.exists(sImportPath):
+            self.sImportPath = Path(sImportPath).as_posix()
+        # endif
+
+        self.bLazyVars: bool = bLazyVars
+        self.bExprVM: bool = bExprVM
+
+        # Raw data of the include files by absolute posix path
+        self._dicIncludeData: dict = {}
+        bIncludesComplete = _LoadIncludes(self._xData, self.sImportPath, self._dicIncludeData)
+
+        # Expressions that evaluate to the same value in every execution are replaced by their value
+        self.iFoldCount: int = 0
+        if bFoldConstants is True:
+            xFolder = CConstFolder()
+            self._xData, self._dicIncludeData = xFolder.Fold(
+                self._xData, self._dicIncludeData, bIncludesComplete=bIncludesComplete
+            )
+            self.iFoldCount = xFolder.iFoldCnt
+        # endif
+
+        # Variable matches of all expressions of the document and its include files
+        self._dicExprMatch: dict = {}
+        _ParseExpressions(self._xData, self._dicExprMatch)
+        for xIncData in self._dicIncludeData.values():
+            _ParseExpressions(xIncData, self._dicExprMatch)
+        # endfor
+
+        # Containers without ISON syntax, collected on first execution
+        self._dicStatic: Optional[dict] = None
+
+    # enddef
+
+    ################################################################################
+    def __getstate__(self):
+        dicState = self.__dict__.copy()
+        dicState["_dicStatic"] = None
+        return dicState
+
+    # enddef
+
+    ################################################################################
+    @property
+    def iIncludeCount(self) -> int:
+        return len(self._dicIncludeData)
+
+    # enddef
+
+    ################################################################################
+    # The absolute posix paths of the include files loaded when preparing the document
+    @property
+    def lIncludeFiles(self) -> list[str]:
+        return list(self._dicIncludeData.keys())
+
+    # enddef
+
+    ################################################################################
+    @property
+    def iExprCount(self) -> int:
+        return len(self._dicExprMatch)
+
+    # enddef
+
+    ################################################################################
+    def _GetStaticData(self) -> dict:
+        dicStatic = self._dicStatic
+        if dicStatic is None:
+            dicStatic = {}
+            data.CollectStaticData(self._xData, dicStatic)
+            for xIncData in self._dicIncludeData.values():
+                data.CollectStaticData(xIncData, dicStatic)
+            # endfor
+            self._dicStatic = dicStatic
+        # endif
+
+        return dicStatic
+
+    # enddef
+
+    ################################################################################
+    # Process the document with the given constant variables.
+    # The prepared data is not changed, so this can be called any number of times.
+    def Execute(
+        self,
+        dicConstVars: Optional[dict] = None,
+        *,
+        sResultKey: Optional[str] = None,
+        bStripVars: bool = True,
+        lProcessPaths: Optional[list] = None,
+        lSelectPaths: Optional[list] = None,
+        bPrintWarnings: bool = False,
+    ):
+        # Only the selected elements are processed. The paths are relative to the result key.
+        if lProcessPaths is None:
+            lSelectPaths = data.MakeSelectPaths(sResultKey, lSelectPaths)
+        # endif
+
+        xParser = CParser(dicConstVars, bLazyVars=self.bLazyVars, bExprVM=self.bExprVM)
+        xParser.dicExprMatch = self._dicExprMatch
+        xParser.dicIncludeData = self._dicIncludeData
+
+        xResult = xParser.Process(
+            self._xData,
+            sImportPath=self.sImportPath,
+            lProcessPaths=lProcessPaths,
+            lSelectPaths=lSelectPaths,
+            dicStaticData=self._GetStaticData(),
+        )
+
+        xWarnings = xParser.GetWarnings()
+        if bPrintWarnings is True and xWarnings.bHasWarnings is True:
+            sys.stderr.write("WARNINGS:\n")
+            sys.stderr.write(str(xWarnings))
+            sys.stderr.flush()
+        # endif
+
+        if sResultKey is not None:
+            if not isinstance(xResult, dict) or sResultKey not in xResult:
+                raise CParserError_Message(sMsg="Result key '{}' not found in result".format(sResultKey))
+            # endif
+            xResult = xResult[sResultKey]
+        # endif
+
+        # The result shares unchanged containers with the prepared data,
+        # unless the variables are stripped, which copies the result.
+        if bStripVars is True and isinstance(xResult, dict):
+            xResult = data.StripVarsFromData(xResult)
+        # endif
+
+        return xResult
+
+    # enddef
+
+
+# endclass
+
+
+################################################################################
+# Load the include files with a constant path of the data and, recursively, of the
+# include files themselves. Include files that cannot be loaded are left to the parser.
+# Returns True, if all include files have been loaded.
+def _LoadIncludes(_xData, _sImportPath: Optional[str], _dicIncludeData: dict) -> bool:
+    bComplete = True
+
+    if isinstance(_xData, dict):
+        lIncs = _xData.get("__includes__")
+        if isinstance(lIncs, list):
+            for sInc in lIncs:
+                if not isinstance(sInc, str) or not data.IsStaticString(sInc):
+                    bComplete = False
+                    continue
+                # endif
+
+                pathInc: Path = path.MakeNormPath(sInc)
+                if not pathInc.is_absolute():
+                    if _sImportPath is None:
+                        bComplete = False
+                        continue
+                    # endif
+                    pathInc = path.MakeNormPath([_sImportPath, sInc])
+                # endif
+
+                sPathInc = pathInc.as_posix()
+                if sPathInc in _dicIncludeData:
+                    continue
+                # endif
+
+                try:
+                    dicInc = io.LoadJson(pathInc)
+                except Exception:
+                    dicInc = None
+                # endtry
+
+                if isinstance(dicInc, dict):
+                    _dicIncludeData[sPathInc] = dicInc
+                    bComplete = _LoadIncludes(dicInc, pathInc.parent.as_posix(), _dicIncludeData) and bComplete
+                else:
+                    bComplete = False
+                # endif
+            # endfor
+
+        elif lIncs is not None:
+            bComplete = False
+        # endif
+
+        for xValue in _xData.values():
+            bComplete = _LoadIncludes(xValue, _sImportPath, _dicIncludeData) and bComplete
+        # endfor
+
+    elif isinstance(_xData, list):
+        for xEl in _xData:
+            bComplete = _LoadIncludes(xEl, _sImportPath, _dicIncludeData) and bComplete
+        # endfor
+    # endif
+
+    return bComplete
+
+
+# enddef
+
+
+################################################################################
+# Parse all expression strings of the data. Strings that cannot be parsed are skipped,
+# so that the parser raises the error with its full context, when the string is processed.
+def _ParseExpressions(_xData, _dicExprMatch: dict):
+    if isinstance(_xData, str):
+        if "$" in _xData and _xData not in _dicExprMatch:
+            try:
+                _dicExprMatch.update(CParser.xExprCache.ParseExpr(_xData))
+            except Exception:
+                pass
+            # endtry
+        # endif
+
+    elif isinstance(_xData, dict):
+        for sKey, xValue in _xData.items():
+            _ParseExpressions(sKey, _dicExprMatch)
+            _ParseExpressions(xValue, _dicExprMatch)
+        # endfor
+
+    elif isinstance(_xData, list):
+        for xEl in _xData:
+            _ParseExpressions(xEl, _dicExprMatch)
+        # endfor
+    # endif
+
+
+# enddef
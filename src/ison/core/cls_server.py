@@ -0,0 +1,563 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \cls_server.py
+# Created Date: Monday, October 19th 2026, 1:23:45 pm
+# Author: Christian Perwass
+# <LICENSE id="Apache-2.0">
+#
+#   Functional JSON module
+#   Copyright 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# </LICENSE>
+###
+
+import os
+import json
+import stat
+import socket
+import signal
+import threading
+from typing import Optional
+from pathlib import Path
+from collections import OrderedDict
+
+from ..util import io
+from .cls_parser import CParser
+from .cls_prepared_doc import CPreparedDocument
+from .cls_parser_error import CParserError, CParserError_Message
+
+# The elements of a request to process a document. They have the names of the arguments of ison.run.Run().
+# Either 'xData', the document or its JSON text, or 'sFile', the path of the document file, has to be given.
+lRequestKeys = [
+    "sCmd",
+    "xId",
+    "xData",
+    "sFile",
+    "sImportPath",
+    "dicConstVars",
+    "sResultKey",
+    "lSelectPaths",
+    "bStripVars",
+]
+
+
+####################################################################################
+# Server, that processes ISON documents on requests of local clients (see CClient).
+# The server listens on a unix socket. A client sends one request per line as JSON object, and the
+# server responds with one JSON object per line. A response has the elements 'bOk', 'xResult' and,
+# if given in the request, 'xId'. For an error, 'bOk' is False and 'dicError' contains the type of
+# the error, its full message 'sMessage' and the messages of its error chain in 'lMessages'.
+# The command of a request 'sCmd' is 'run', which is the default, 'ping', 'stats' or 'shutdown'.
+# The documents are prepared once and kept, so that they are processed again without parsing them.
+# A document file is prepared again, when it or one of its include files changes. The function tables
+# and the caches of include files and parsed expressions are also kept between requests.
+# With 'iWorkers' > 0, this number of worker processes is forked after the server is prepared, so that
+# they share its memory copy-on-write. Otherwise, the requests are processed in the server process.
+# The requests of a process are processed one at a time. The socket can only be used by the current user.
+class CServer:
+    def __init__(
+        self,
+        _sSocketPath: str,
+        *,
+        iWorkers: int = 0,
+        bLazyVars: bool = False,
+        bExprVM: bool = False,
+        iMaxDocs: int = 256,
+        xLogStream=None,
+    ):
+        self.sSocketPath: str = io.ToAbsPath(_sSocketPath)
+        self.iWorkers: int = iWorkers
+        self.bLazyVars: bool = bLazyVars
+        self.bExprVM: bool = bExprVM
+        self.iMaxDocs: int = iMaxDocs
+        self.xLogStream = xLogStream
+
+        self.iRequestCnt: int = 0
+        self.iErrorCnt: int = 0
+
+        # Prepared documents with the stamps of their files by the key of their source
+        self._dicDocs: OrderedDict = OrderedDict()
+        self._xLock = threading.Lock()
+        self._xSocket: Optional[socket.socket] = None
+        self._bStop: bool = False
+        self._setWorkerPids: set = set()
+        # The open connections of the current process with the threads handling them
+        self._lConns: list = []
+        self._iServerPid: int = os.getpid()
+
+    # enddef
+
+    ################################################################################
+    # Prepare the given document files, before the server is started
+    def Preload(self, _lFiles: list):
+        for sFile in _lFiles:
+            self._GetDocument({"sFile": sFile})
+        # endfor
+
+    # enddef
+
+    ################################################################################
+    # Create the socket and start listening. A socket file of a server that is not running anymore is removed.
+    def Start(self):
+        if os.path.exists(self.sSocketPath):
+            if not stat.S_ISSOCK(os.stat(self.sSocketPath).st_mode):
+                raise RuntimeError("Socket path '{}' exists and is not a socket".format(self.sSocketPath))
+            # endif
+
+            xProbe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                xProbe.connect(self.sSocketPath)
+            except OSError:
+                os.unlink(self.sSocketPath)
+            else:
+                raise RuntimeError("A server is already running on socket '{}'".format(self.sSocketPath))
+            finally:
+                xProbe.close()
+            # endtry
+        # endif
+
+        # A parser is created once, so that all modules are loaded before workers are forked
+        CParser({})
+
+        self._xSocket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        iUmask = os.umask(0o177)
+        try:
+            self._xSocket.bind(self.sSocketPath)
+        finally:
+            os.umask(iUmask)
+        # endtry
+        self._xSocket.listen(128)
+        # Waiting for connections is interrupted regularly to test whether the server is stopped
+        self._xSocket.settimeout(0.2)
+        self._bStop = False
+        self._iServerPid = os.getpid()
+
+        self._Log("Serving on '{}' with {} worker process(es)".format(self.sSocketPath, self.iWorkers))
+
+    # enddef
+
+    ################################################################################
+    # Process requests until the server is shut down with a request or interrupted.
+    def ServeForever(self):
+        if self._xSocket is None:
+            self.Start()
+        # endif
+
+        try:
+            if self.iWorkers <= 0:
+                self._AcceptLoop()
+            else:
+                self._RunWorkers()
+            # endif
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.Close()
+        # endtry
+
+    # enddef
+
+    ################################################################################
+    # Stop the server. The server stops accepting connections, after the current request.
+    def Shutdown(self):
+        self._bStop = True
+        if os.getpid() != self._iServerPid:
+            os.kill(self._iServerPid, signal.SIGTERM)
+        # endif
+
+    # enddef
+
+    ################################################################################
+    def Close(self):
+        if len(self._setWorkerPids) > 0:
+            self._StopWorkers()
+        # endif
+
+        if self._xSocket is not None:
+            self._xSocket.close()
+            self._xSocket = None
+            if os.getpid() == self._iServerPid and os.path.exists(self.sSocketPath):
+                os.unlink(self.sSocketPath)
+            # endif
+            self._Log("Server on '{}' stopped".format(self.sSocketPath))
+        # endif
+
+    # enddef
+
+    ################################################################################
+    def GetStats(self) -> dict:
+        return {
+            "iPid": os.getpid(),
+            "iRequests": self.iRequestCnt,
+            "iErrors": self.iErrorCnt,
+            "iDocuments": len(self._dicDocs),
+            "dicIncludeCache": CParser.GetIncludeCacheStats(),
+            "dicExprCache": CParser.GetExprCacheStats(),
+        }
+
+    # enddef
+
+    ################################################################################
+    # Process a request and return the response. Errors are returned in the response.
+    def HandleRequest(self, _dicRequest) -> dict:
+        self.iRequestCnt += 1
+        dicResponse = {}
+        if isinstance(_dicRequest, dict) and "xId" in _dicRequest:
+            dicResponse["xId"] = _dicRequest["xId"]
+        # endif
+
+        try:
+            if not isinstance(_dicRequest, dict):
+                raise CParserError_Message(sMsg="A request has to be a JSON object")
+            # endif
+
+            lInvalidKeys = [x for x in _dicRequest if x not in lRequestKeys]
+            if len(lInvalidKeys) > 0:
+                raise CParserError_Message(sMsg="Invalid request elements: {}".format(", ".join(lInvalidKeys)))
+            # endif
+
+            sCmd = _dicRequest.get("sCmd", "run")
+            if sCmd == "run":
+                xResult = self._Run(_dicRequest)
+            elif sCmd == "ping":
+                xResult = "pong"
+            elif sCmd == "stats":
+                xResult = self.GetStats()
+            elif sCmd == "shutdown":
+                # The server is shut down after the response is sent
+                self._bStop = True
+                xResult = None
+            else:
+                raise CParserError_Message(sMsg="Unknown command '{}'".format(sCmd))
+            # endif
+
+            dicResponse["bOk"] = True
+            dicResponse["xResult"] = xResult
+
+        except Exception as xEx:
+            self.iErrorCnt += 1
+            dicResponse["bOk"] = False
+            dicResponse["dicError"] = _ToErrorDict(xEx)
+        # endtry
+
+        return dicResponse
+
+    # enddef
+
+    ################################################################################
+    def _Run(self, _dicRequest: dict):
+        xPrep = self._GetDocument(_dicRequest)
+
+        dicConstVars = _dicRequest.get("dicConstVars")
+        if dicConstVars is not None and not isinstance(dicConstVars, dict):
+            raise CParserError_Message(sMsg="Element 'dicConstVars' of request has to be an object")
+        # endif
+
+        return xPrep.Execute(
+            dicConstVars or {},
+            sResultKey=_dicRequest.get("sResultKey"),
+            lSelectPaths=_dicRequest.get("lSelectPaths"),
+            bStripVars=_dicRequest.get("bStripVars", True),
+        )
+
+    # enddef
+
+    ################################################################################
+    # Get the prepared document of the request. A document file is prepared again, if it changed.
+    def _GetDocument(self, _dicRequest: dict) -> CPreparedDocument:
+        sImportPath = _dicRequest.get("sImportPath")
+        sFile = _dicRequest.get("sFile")
+
+        if sFile is not None:
+            if "xData" in _dicRequest:
+                raise CParserError_Message(sMsg="Only one of the request elements 'xData' and 'sFile' can be given")
+            # endif
+            sFile = io.ToAbsPath(sFile)
+            tKey = ("file", sFile, sImportPath)
+        elif "xData" in _dicRequest:
+            xData = _dicRequest["xData"]
+            tKey = ("data", xData if isinstance(xData, str) else json.dumps(xData), sImportPath)
+        else:
+            raise CParserError_Message(sMsg="Request has no document in 'xData' or 'sFile'")
+        # endif
+
+        tEntry = self._dicDocs.get(tKey)
+        if tEntry is not None:
+            tStamps, xPrep = tEntry
+            if sFile is None or _GetFileStamps([sFile] + xPrep.lIncludeFiles) == tStamps:
+                self._dicDocs.move_to_end(tKey)
+                return xPrep
+            # endif
+        # endif
+
+        if sFile is not None:
+            # The stamp of the document file is taken before it is read, so that changes while reading are detected
+            tStamps = _GetFileStamps([sFile])
+            try:
+                with open(sFile, "r") as xFile:
+                    xData = io.decode_json(xFile.read())
+                # endwith
+            except Exception as xEx:
+                raise CParserError_Message(sMsg="Error loading file '{}' as json/json5".format(sFile), xChildEx=xEx)
+            # endtry
+            xPrep = CPreparedDocument(
+                xData,
+                sImportPath=sImportPath or Path(sFile).parent.as_posix(),
+                bLazyVars=self.bLazyVars,
+                bExprVM=self.bExprVM,
+            )
+            tStamps = tStamps + _GetFileStamps(xPrep.lIncludeFiles)
+        else:
+            tStamps = None
+            xPrep = CPreparedDocument(
+                _dicRequest["xData"], sImportPath=sImportPath, bLazyVars=self.bLazyVars, bExprVM=self.bExprVM
+            )
+        # endif
+
+        self._dicDocs[tKey] = (tStamps, xPrep)
+        self._dicDocs.move_to_end(tKey)
+        while len(self._dicDocs) > self.iMaxDocs:
+            self._dicDocs.popitem(last=False)
+        # endwhile
+
+        return xPrep
+
+    # enddef
+
+    ################################################################################
+    def _AcceptLoop(self):
+        while self._bStop is False:
+            try:
+                xConn, xAddr = self._xSocket.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            # endtry
+
+            xConn.setblocking(True)
+            xThread = threading.Thread(target=self._HandleConnection, args=(xConn,), daemon=True)
+            xThread.start()
+            self._lConns = [x for x in self._lConns if x[1].is_alive()]
+            self._lConns.append((xConn, xThread))
+        # endwhile
+
+        # Wake up the connections waiting for a request and wait for the current requests
+        for xConn, xThread in self._lConns:
+            try:
+                xConn.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            # endtry
+            xThread.join()
+        # endfor
+        self._lConns = []
+
+    # enddef
+
+    ################################################################################
+    def _HandleConnection(self, _xConn: socket.socket):
+        try:
+            with _xConn, _xConn.makefile("rb") as xIn, _xConn.makefile("wb") as xOut:
+                for bytLine in xIn:
+                    if len(bytLine.strip()) == 0:
+                        continue
+                    # endif
+
+                    try:
+                        dicRequest = json.loads(bytLine)
+                    except Exception as xEx:
+                        self.iErrorCnt += 1
+                        dicResponse = {
+                            "bOk": False,
+                            "dicError": _ToErrorDict(CParserError_Message(sMsg="Invalid JSON request", xChildEx=xEx)),
+                        }
+                    else:
+                        with self._xLock:
+                            dicResponse = self.HandleRequest(dicRequest)
+                        # endwith
+                    # endtry
+
+                    xOut.write(_EncodeResponse(dicResponse))
+                    xOut.flush()
+                    if self._bStop is True:
+                        self.Shutdown()
+                        break
+                    # endif
+                # endfor
+            # endwith
+        except OSError:
+            # The client closed the connection
+            pass
+        # endtry
+
+    # enddef
+
+    ################################################################################
+    # Fork the workers and fork them again, if they end, until the server is stopped
+    def _RunWorkers(self):
+        if not hasattr(os, "fork"):
+            raise RuntimeError("Worker processes are not supported on this platform")
+        # endif
+
+        def OnTerminate(_iSignal, _xFrame):
+            self._bStop = True
+            self._StopWorkers(bWait=False)
+
+        # enddef
+
+        signal.signal(signal.SIGTERM, OnTerminate)
+        for iIdx in range(self.iWorkers):
+            self._ForkWorker()
+        # endfor
+
+        while len(self._setWorkerPids) > 0:
+            try:
+                iPid, iStatus = os.wait()
+            except ChildProcessError:
+                break
+            # endtry
+            self._setWorkerPids.discard(iPid)
+            if self._bStop is False:
+                self._Log("Worker process {} ended, starting a new one".format(iPid))
+                self._ForkWorker()
+            # endif
+        # endwhile
+
+    # enddef
+
+    ################################################################################
+    def _ForkWorker(self):
+        iPid = os.fork()
+        if iPid != 0:
+            self._setWorkerPids.add(iPid)
+            return
+        # endif
+
+        # Worker process
+        iExitCode = 0
+        try:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            self._setWorkerPids = set()
+            self._AcceptLoop()
+        except KeyboardInterrupt:
+            pass
+        except Exception:
+            iExitCode = 1
+        finally:
+            os._exit(iExitCode)
+        # endtry
+
+    # enddef
+
+    ################################################################################
+    def _StopWorkers(self, *, bWait: bool = True):
+        for iPid in list(self._setWorkerPids):
+            try:
+                os.kill(iPid, signal.SIGTERM)
+            except ProcessLookupError:
+                self._setWorkerPids.discard(iPid)
+            # endtry
+        # endfor
+
+        if bWait is True:
+            for iPid in list(self._setWorkerPids):
+                try:
+                    os.waitpid(iPid, 0)
+                except ChildProcessError:
+                    pass
+                # endtry
+                self._setWorkerPids.discard(iPid)
+            # endfor
+        # endif
+
+    # enddef
+
+    ################################################################################
+    def _Log(self, _sMsg: str):
+        if self.xLogStream is not None:
+            self.xLogStream.write(_sMsg + "\n")
+            self.xLogStream.flush()
+        # endif
+
+    # enddef
+
+
+# endclass
+
+
+################################################################################
+# Returns the stamps of the files, which change when the files change
+def _GetFileStamps(_lFiles: list) -> tuple:
+    lStamps = []
+    for sFile in _lFiles:
+        try:
+            xStat = os.stat(sFile)
+            lStamps.append((xStat.st_mtime_ns, xStat.st_size))
+        except OSError:
+            lStamps.append(None)
+        # endtry
+    # endfor
+
+    return tuple(lStamps)
+
+
+# enddef
+
+
+################################################################################
+# Returns the error as dictionary, that can be encoded as JSON
+def _ToErrorDict(_xEx: Exception) -> dict:
+    lMessages = []
+    xEx = _xEx
+    while isinstance(xEx, CParserError):
+        lMessages.append(xEx.message)
+        xEx = xEx.xChildEx
+    # endwhile
+    if xEx is not None:
+        lMessages.append(str(xEx))
+    # endif
+
+    return {
+        "sType": type(_xEx).__name__,
+        "sMessage": _xEx.ToString() if isinstance(_xEx, CParserError) else str(_xEx),
+        "lMessages": lMessages,
+    }
+
+
+# enddef
+
+
+################################################################################
+# Encode the response as one line of JSON
+def _EncodeResponse(_dicResponse: dict) -> bytes:
+    try:
+        sText = json.dumps(_dicResponse, ensure_ascii=False)
+    except Exception as xEx:
+        dicError = {
+            "bOk": False,
+            "dicError": _ToErrorDict(CParserError_Message(sMsg="Result cannot be encoded as JSON", xChildEx=xEx)),
+        }
+        if "xId" in _dicResponse:
+            dicError["xId"] = _dicResponse["xId"]
+        # endif
+        sText = json.dumps(dicError, ensure_ascii=False)
+    # endtry
+
+    return (sText + "\n").encode("utf-8")
+
+
+# enddef
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \cls_var_match.py
+# Created Date: Monday, October 12th 2026, 9:14:21 am
+# Author: Christian Perwass
+# <LICENSE id="Apache-2.0">
+#
+#   Functional JSON module
+#   Copyright 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# </LICENSE>
+###
+
+from typing import NamedTuple
+
+
+####################################################################################
+# Immutable form of a variable match as returned by text.GetVarMatchList().
+# Instances are shared between all users of the expression cache,
+# so they must never be changed. The element access by string key
+# is kept, so that a match can be used wherever a match dictionary is expected.
+class CVarMatch(NamedTuple):
+    sFunc: str
+    lArgs: tuple
+    iStart: int
+    iEnd: int
+    sMatch: str
+
+    ################################################################################
+    @classmethod
+    def FromDict(cls, _dicMatch: dict) -> "CVarMatch":
+        return cls(
+            sFunc=_dicMatch["sFunc"],
+            lArgs=tuple(_dicMatch["lArgs"]),
+            iStart=_dicMatch["iStart"],
+            iEnd=_dicMatch["iEnd"],
+            sMatch=_dicMatch["sMatch"],
+        )
+
+    # enddef
+
+    ################################################################################
+    def get(self, _sKey: str, _xDefault=None):
+        return getattr(self, _sKey, _xDefault)
+
+    # enddef
+
+    ################################################################################
+    def __getitem__(self, _xKey):
+        if isinstance(_xKey, str):
+            try:
+                return getattr(self, _xKey)
+            except AttributeError:
+                raise KeyError(_xKey)
+            # endtry
+        # endif
+        return tuple.__getitem__(self, _xKey)
+
+    # enddef
+
+
+# endclass
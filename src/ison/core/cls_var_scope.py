@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \cls_var_scope.py
+# Created Date: Friday, October 16th 2026, 8:55:31 am
+# Author: Christian Perwass
+# <LICENSE id="Apache-2.0">
+#
+#   Functional JSON module
+#   Copyright 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# </LICENSE>
+###
+
+
+from typing import Optional
+
+
+####################################################################################
+# A frame of the linked scope chain of local variables.
+# A new frame is created for each processed dictionary. It only references its parent,
+# so that entering and leaving a dictionary scope does not copy or allocate any
+# variable containers. These are only created when a variable is stored in the frame.
+#
+# Each frame keeps the local variables and the function local variables defined in it,
+# together with the set of locals that have been evaluated. In addition, the frame
+# caches for each variable name that is not defined in it, the frame that defines it
+# (or None, if no frame does). As variables are only added to the innermost frame,
+# the frames above it never change while it exists, and the cache stays valid.
+class CVarScope:
+    __slots__ = ("xParent", "dicLoc", "setLocEval", "dicFuncLoc", "dicResLoc", "dicResFuncLoc")
+
+    def __init__(self, _xParent: Optional["CVarScope"] = None):
+        self.xParent: Optional[CVarScope] = _xParent
+        self.dicLoc: Optional[dict] = None
+        self.setLocEval: Optional[set] = None
+        self.dicFuncLoc: Optional[dict] = None
+        self.dicResLoc: Optional[dict] = None
+        self.dicResFuncLoc: Optional[dict] = None
+
+    # enddef
+
+    ################################################################################
+    def GetLocals(self) -> dict:
+        if self.dicLoc is None:
+            self.dicLoc = {}
+        # endif
+        return self.dicLoc
+
+    # enddef
+
+    ################################################################################
+    def GetLocalsEval(self) -> set:
+        if self.setLocEval is None:
+            self.setLocEval = set()
+        # endif
+        return self.setLocEval
+
+    # enddef
+
+    ################################################################################
+    def GetFuncLocals(self) -> dict:
+        if self.dicFuncLoc is None:
+            self.dicFuncLoc = {}
+        # endif
+        return self.dicFuncLoc
+
+    # enddef
+
+    ################################################################################
+    # Returns the frames from the outermost to the innermost one.
+    def GetFrames(self) -> list["CVarScope"]:
+        lFrames = []
+        xScope = self
+        while xScope is not None:
+            lFrames.append(xScope)
+            xScope = xScope.xParent
+        # endwhile
+        lFrames.reverse()
+        return lFrames
+
+    # enddef
+
+    ################################################################################
+    # Returns the frame that defines the local variable, or None.
+    def FindLocal(self, _sKey: str) -> Optional["CVarScope"]:
+        if self.dicLoc is not None and _sKey in self.dicLoc:
+            return self
+        # endif
+
+        if self.dicResLoc is None:
+            self.dicResLoc = {}
+        elif _sKey in self.dicResLoc:
+            return self.dicResLoc[_sKey]
+        # endif
+
+        xFound = None
+        xScope = self.xParent
+        while xScope is not None:
+            if xScope.dicLoc is not None and _sKey in xScope.dicLoc:
+                xFound = xScope
+                break
+            # endif
+            if xScope.dicResLoc is not None and _sKey in xScope.dicResLoc:
+                xFound = xScope.dicResLoc[_sKey]
+                break
+            # endif
+            xScope = xScope.xParent
+        # endwhile
+
+        self.dicResLoc[_sKey] = xFound
+        return xFound
+
+    # enddef
+
+    ################################################################################
+    # Returns the frame that defines the function local variable, or None.
+    def FindFuncLocal(self, _sKey: str) -> Optional["CVarScope"]:
+        if self.dicFuncLoc is not None and _sKey in self.dicFuncLoc:
+            return self
+        # endif
+
+        if self.dicResFuncLoc is None:
+            self.dicResFuncLoc = {}
+        elif _sKey in self.dicResFuncLoc:
+            return self.dicResFuncLoc[_sKey]
+        # endif
+
+        xFound = None
+        xScope = self.xParent
+        while xScope is not None:
+            if xScope.dicFuncLoc is not None and _sKey in xScope.dicFuncLoc:
+                xFound = xScope
+                break
+            # endif
+            if xScope.dicResFuncLoc is not None and _sKey in xScope.dicResFuncLoc:
+                xFound = xScope.dicResFuncLoc[_sKey]
+                break
+            # endif
+            xScope = xScope.xParent
+        # endwhile
+
+        self.dicResFuncLoc[_sKey] = xFound
+        return xFound
+
+    # enddef
+
+
+# endclass
@@ -36,6 +36,11 @@ reNamedArg = re.compile(r"^\s*(?P<name>[a-zA-Z_][a-zA-Z0-9_\-.]*)\s*(=)\s*(?P<va
 reLambdaCall = re.compile(r"\$>\{")
 reLambdaFunc = re.compile(r"\$L\{")
 
+# RegEx for Lambda argument passed by reference
+reLambdaArgRef = re.compile(r"\$\*\{\^@arg\.(?P<depth>\d+)\.(?P<idx>\d+)\}")
+# Characters, for which the lambda string of a string is not the string itself
+reLambdaQuote = re.compile(r"[\"`\\\x00-\x1f]|\$S")
+
 reString = re.compile(r"\"([^\"]*)\"")
 reEscString = re.compile(r"\\\"([^\\\"]*)\\\"")
 reLiteralString = re.compile(r"(?<!\\)`(([^`]|\\`)*)(?<!\\)`")
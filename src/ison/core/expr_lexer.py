@@ -0,0 +1,506 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \expr_lexer.py
+# Created Date: Tuesday, October 13th 2026, 8:41:09 am
+# Author: Christian Perwass
+# <LICENSE id="Apache-2.0">
+#
+#   Functional JSON module
+#   Copyright 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# </LICENSE>
+###
+
+# Single pass lexer for ISON expressions.
+#
+# A string is scanned once to build a table of matching braces. Based on this
+# table, the variable matches "$var", "${...}" and "$func{...}" of a string and
+# the argument lists of all nested matches are obtained without scanning any
+# part of the string more than once. Nested brace regions, whose arguments
+# can be split without error, are skipped as a whole when the arguments of the
+# enclosing function are split. Only the special characters of a string are
+# visited by regular expression searches, all other characters are skipped
+# in C code.
+#
+# The results are identical to those of the character by character algorithms
+# that were used before, including the error messages.
+
+import re
+import enum
+import functools
+
+from .cls_parser_error import CParserError_Message, CParserError_ProcArgStr
+from .defines import reLambdaPar, reLiteralArg, reUnrollArg, reNamedArg, reTupleArg
+
+g_sOpen = "([{"
+g_sClose = ")]}"
+g_sStringChars = "'`\""
+
+g_reBrace = re.compile(r"[{}]")
+g_dicReSplit = {}
+
+
+####################################################################################
+class EArgKind(enum.Enum):
+    EXPR = enum.auto()
+    LAMBDA_PAR = enum.auto()
+    LITERAL = enum.auto()
+    UNROLL = enum.auto()
+    NAMED = enum.auto()
+    TUPLE = enum.auto()
+
+
+# endclass
+
+
+################################################################################
+def _GetSplitRegEx(_sSplitChar):
+    reSplit = g_dicReSplit.get(_sSplitChar)
+    if reSplit is None:
+        reSplit = re.compile("[{}]".format(re.escape(g_sOpen + g_sClose + g_sStringChars + _sSplitChar)))
+        g_dicReSplit[_sSplitChar] = reSplit
+    # endif
+    return reSplit
+
+
+# enddef
+
+
+####################################################################################
+# Lexer for a single string. All positions are absolute positions in the string.
+# The methods operate on regions of the string, so that the argument strings of
+# nested functions can be analyzed without creating and scanning substrings.
+class CLexer:
+    def __init__(self, _sText: str, _reVarStart):
+        self.sText: str = _sText
+        self.reVarStart = _reVarStart
+        self._dicBrace: dict = None
+        self._dicSplit: dict = {}
+
+    # enddef
+
+    ################################################################################
+    # Map of the position of each '{' to the position of its closing '}'
+    def _GetBraceMap(self) -> dict:
+        if self._dicBrace is None:
+            dicBrace = {}
+            lStack = []
+            for xMatch in g_reBrace.finditer(self.sText):
+                if xMatch.group() == "{":
+                    lStack.append(xMatch.start())
+                elif len(lStack) > 0:
+                    dicBrace[lStack.pop()] = xMatch.start()
+                # endif
+            # endfor
+            self._dicBrace = dicBrace
+        # endif
+        return self._dicBrace
+
+    # enddef
+
+    ################################################################################
+    # Split the region [_iStart, _iEnd) at _sSplitChar, accounting for brackets and strings.
+    # Returns the list of stripped arguments and the list of end indices relative
+    # to _iStart, as text.SplitArgs() does. Errors are raised as CParserError_Message.
+    def SplitArgs(self, _iStart: int, _iEnd: int, _sSplitChar: str = ","):
+        tKey = (_iStart, _iEnd, _sSplitChar)
+        xResult = self._dicSplit.get(tKey)
+        if xResult is None:
+            try:
+                xResult = self._DoSplitArgs(_iStart, _iEnd, _sSplitChar)
+            except CParserError_Message as xEx:
+                xResult = xEx
+            # endtry
+            self._dicSplit[tKey] = xResult
+        # endif
+
+        if isinstance(xResult, Exception):
+            raise xResult
+        # endif
+        return xResult[0].copy(), xResult[1].copy()
+
+    # enddef
+
+    ################################################################################
+    # Test whether the region can be split without error.
+    def _CanSplit(self, _iStart: int, _iEnd: int) -> bool:
+        tKey = (_iStart, _iEnd, ",")
+        xResult = self._dicSplit.get(tKey)
+        if xResult is None:
+            try:
+                xResult = self._DoSplitArgs(_iStart, _iEnd, ",")
+            except CParserError_Message as xEx:
+                xResult = xEx
+            # endtry
+            self._dicSplit[tKey] = xResult
+        # endif
+        return not isinstance(xResult, Exception)
+
+    # enddef
+
+    ################################################################################
+    def _DoSplitArgs(self, _iStart: int, _iEnd: int, _sSplitChar: str):
+        sText = self.sText
+        reSplit = _GetSplitRegEx(_sSplitChar)
+        dicBrace = self._GetBraceMap()
+
+        lArgs = []
+        lEndIdx = []
+        lBrkCnt = [0, 0, 0]
+        iBrkOpen = 0
+        sActStrChar = None
+        iArgStart = _iStart
+        iPos = _iStart
+
+        while iPos < _iEnd:
+            if sActStrChar is not None:
+                # Inside a string only the closing string character is relevant
+                iIdx = sText.find(sActStrChar, iPos, _iEnd)
+                if iIdx < 0:
+                    break
+                # endif
+                if sText[iIdx - 1] != "\\":
+                    sActStrChar = None
+                # endif
+                iPos = iIdx + 1
+                continue
+            # endif
+
+            xMatch = reSplit.search(sText, iPos, _iEnd)
+            if xMatch is None:
+                break
+            # endif
+            iIdx = xMatch.start()
+            sChar = sText[iIdx]
+            iPos = iIdx + 1
+
+            if sChar in g_sStringChars:
+                if iIdx == _iStart or sText[iIdx - 1] != "\\":
+                    sActStrChar = sChar
+                    continue
+                # endif
+            # endif
+
+            if sChar == _sSplitChar and iBrkOpen == 0:
+                lArgs.append(sText[iArgStart:iIdx].strip())
+                lEndIdx.append(iIdx + 1 - _iStart)
+                iArgStart = iIdx + 1
+                continue
+            # endif
+
+            iOpenIdx = g_sOpen.find(sChar)
+            if iOpenIdx >= 0:
+                if iOpenIdx == 2:
+                    # Skip a nested brace region as a whole, if its content is balanced.
+                    # In this case, the region does not change the state of the split.
+                    iClose = dicBrace.get(iIdx)
+                    if iClose is not None and iClose < _iEnd and self._CanSplit(iIdx + 1, iClose):
+                        iPos = iClose + 1
+                        continue
+                    # endif
+                # endif
+                lBrkCnt[iOpenIdx] += 1
+                iBrkOpen += 1
+                continue
+            # endif
+
+            iCloseIdx = g_sClose.find(sChar)
+            if iCloseIdx >= 0:
+                if lBrkCnt[iCloseIdx] == 0:
+                    sValue = sText[_iStart:_iEnd]
+                    iRelIdx = iIdx - _iStart
+                    raise CParserError_Message(
+                        sMsg="Unexpected close bracket '{0}' at index {1} in: {2}>>{3}<<{4}".format(
+                            g_sClose[iCloseIdx],
+                            iRelIdx,
+                            sValue[0:iRelIdx],
+                            sValue[iRelIdx],
+                            sValue[iRelIdx + 1 :],
+                        )
+                    )
+                # endif
+                lBrkCnt[iCloseIdx] -= 1
+                iBrkOpen -= 1
+            # endif
+        # endwhile
+
+        if sActStrChar is not None:
+            raise CParserError_Message(
+                sMsg="Missing closed string symbol >{0}< in: {1}".format(sActStrChar, sText[_iStart:_iEnd])
+            )
+        # endif
+
+        for iOpenIdx in range(3):
+            if lBrkCnt[iOpenIdx] > 0:
+                raise CParserError_Message(
+                    sMsg="Missing closed bracket '{0}' in: {1}".format(g_sClose[iOpenIdx], sText[_iStart:_iEnd])
+                )
+            # endif
+        # endfor
+
+        lArgs.append(sText[iArgStart:_iEnd].strip())
+        lEndIdx.append(_iEnd - _iStart)
+
+        return lArgs, lEndIdx
+
+    # enddef
+
+    ################################################################################
+    # Get the variable matches in region [_iStart, _iEnd).
+    # Positions in the returned match dictionaries are relative to _iStart.
+    def GetVarMatchList(self, _iStart: int, _iEnd: int, *, lSingleArgsFuncs=[]):
+        sText = self.sText
+        dicBrace = self._GetBraceMap()
+
+        lMatch = []
+        iSearchIdx = _iStart
+        while True:
+            xMatch = self.reVarStart.search(sText, iSearchIdx, _iEnd)
+            if xMatch is None:
+                break
+            # endif
+
+            sFunc = xMatch.group("func")
+            if sFunc is not None:
+                iBrace = xMatch.end() - 1
+                iEnd = dicBrace.get(iBrace)
+                if iEnd is None or iEnd >= _iEnd:
+                    sValue = sText[_iStart:_iEnd]
+                    iRelIdx = iBrace - _iStart
+                    raise CParserError_Message(
+                        sMsg="Closing '}}' missing: {}".format(
+                            sValue[0:iRelIdx] + ">>" + sValue[iRelIdx : iRelIdx + 1] + "<<" + sValue[iRelIdx + 1 :]
+                        )
+                    )
+                # endif
+
+                sMatch = sText[xMatch.start() : iEnd + 1]
+
+                if sFunc in lSingleArgsFuncs:
+                    lArgs = [sText[iBrace + 1 : iEnd]]
+                else:
+                    try:
+                        lArgs, lEndIdx = self.SplitArgs(iBrace + 1, iEnd)
+                    except Exception as xEx:
+                        raise CParserError_ProcArgStr(sString=sText[iBrace + 1 : iEnd], xChildEx=xEx)
+                    # endtry
+                # endif
+
+            else:
+                # pure variable reference, e.g. "$var"
+                # use reference function
+                sFunc = ""
+                lArgs = [xMatch.group("var")]
+                iEnd = xMatch.end() - 1
+                sMatch = sText[xMatch.start() : xMatch.end()]
+            # endif
+
+            lMatch.append(
+                {
+                    "sFunc": sFunc,
+                    "lArgs": lArgs,
+                    "iStart": xMatch.start() - _iStart,
+                    "iEnd": iEnd + 1 - _iStart,
+                    "sMatch": sMatch,
+                }
+            )
+
+            iSearchIdx = iEnd + 1
+        # endwhile
+
+        return lMatch
+
+    # enddef
+
+    ################################################################################
+    # Get the regions of the stripped arguments of a function match in region
+    # starting at _iStart. Returns a list of tuples (start, end) of absolute positions.
+    def GetArgRegions(self, _iStart: int, _dicMatch: dict) -> list:
+        sFunc = _dicMatch["sFunc"]
+        sMatch = _dicMatch["sMatch"]
+        if not sMatch.startswith("{", len(sFunc) + 1):
+            # pure variable reference without arguments
+            return []
+        # endif
+
+        iArgsStart = _iStart + _dicMatch["iStart"] + len(sFunc) + 2
+        iArgsEnd = _iStart + _dicMatch["iEnd"] - 1
+
+        lArgs, lEndIdx = self.SplitArgs(iArgsStart, iArgsEnd)
+        iLastIdx = len(lArgs) - 1
+
+        lRegions = []
+        iArgStart = iArgsStart
+        for iIdx, (sArg, iEndIdx) in enumerate(zip(lArgs, lEndIdx)):
+            if iIdx < iLastIdx:
+                # end index points behind the split character
+                iRawEnd = iArgsStart + iEndIdx - 1
+            else:
+                iRawEnd = iArgsEnd
+            # endif
+            sRaw = self.sText[iArgStart:iRawEnd]
+            iLead = len(sRaw) - len(sRaw.lstrip())
+            lRegions.append((iArgStart + iLead, iArgStart + iLead + len(sArg)))
+            iArgStart = iArgsStart + iEndIdx
+        # endfor
+
+        return lRegions
+
+    # enddef
+
+
+# endclass
+
+
+################################################################################
+# Get the variable matches of a string.
+def GetVarMatchList(_sValue: str, _reVarStart, *, lSingleArgsFuncs=[]):
+    xLexer = CLexer(_sValue, _reVarStart)
+    return xLexer.GetVarMatchList(0, len(_sValue), lSingleArgsFuncs=lSingleArgsFuncs)
+
+
+# enddef
+
+
+################################################################################
+# Get the variable matches of a string and of all argument strings of nested functions.
+# Returns the matches of the string and a dictionary that maps the argument strings
+# to their matches. Argument strings that cannot be parsed are not contained in
+# the dictionary, as their errors are raised when they are processed.
+def GetVarMatchTree(_sValue: str, _reVarStart):
+    xLexer = CLexer(_sValue, _reVarStart)
+    lMatch = xLexer.GetVarMatchList(0, len(_sValue))
+
+    dicArgMatch = {}
+    lStack = [(0, lMatch)]
+    while len(lStack) > 0:
+        iStart, lActMatch = lStack.pop()
+        for dicMatch in lActMatch:
+            try:
+                lRegions = xLexer.GetArgRegions(iStart, dicMatch)
+            except CParserError_Message:
+                continue
+            # endtry
+
+            for iArgStart, iArgEnd in lRegions:
+                sArg = _sValue[iArgStart:iArgEnd]
+                if "$" not in sArg or sArg in dicArgMatch:
+                    continue
+                # endif
+
+                # An unroll argument is processed without the leading '*'
+                if sArg.startswith("*$"):
+                    iArgStart += 1
+                    sArg = sArg[1:]
+                    if sArg in dicArgMatch:
+                        continue
+                    # endif
+                # endif
+
+                try:
+                    lArgMatch = xLexer.GetVarMatchList(iArgStart, iArgEnd)
+                except Exception:
+                    continue
+                # endtry
+                dicArgMatch[sArg] = lArgMatch
+                lStack.append((iArgStart, lArgMatch))
+            # endfor
+        # endfor
+    # endwhile
+
+    return lMatch, dicArgMatch
+
+
+# enddef
+
+
+################################################################################
+# Split a string at the given character, accounting for brackets and strings.
+def SplitArgs(_sValue: str, sSplitChar: str = ","):
+    xLexer = CLexer(_sValue, None)
+    return xLexer.SplitArgs(0, len(_sValue), sSplitChar)
+
+
+# enddef
+
+
+g_reVarPathSpecial = re.compile(r"[:'`\"()\[\]{}]")
+
+
+################################################################################
+@functools.lru_cache(maxsize=8192)
+def _SplitVarPath(_sPath: str) -> tuple:
+    if g_reVarPathSpecial.search(_sPath) is None:
+        return (_sPath.strip(),)
+    # endif
+    lArgs, lEndIdx = SplitArgs(_sPath, sSplitChar=":")
+    return tuple(lArgs)
+
+
+# enddef
+
+
+################################################################################
+# Split a variable path at ':', honoring embedded functions.
+def SplitVarPath(_sPath: str) -> list:
+    return list(_SplitVarPath(_sPath))
+
+
+# enddef
+
+
+################################################################################
+# Find the index of the closing string character of a string
+# that starts with this character.
+def FindStringEnd(_sValue: str, _sChar: str) -> int:
+    return _sValue.find(_sChar, 1)
+
+
+# enddef
+
+
+################################################################################
+# Get the kind of a function argument. This is the classification that
+# CParser._ProcessArgs() applies to each argument before it is processed.
+# Returns a tuple (kind, name, value), where name and value are only set
+# for named arguments.
+@functools.lru_cache(maxsize=16384)
+def GetArgKind(_sArg: str) -> tuple:
+    if reLambdaPar.match(_sArg) is not None:
+        return (EArgKind.LAMBDA_PAR, None, None)
+    # endif
+
+    if reLiteralArg.match(_sArg) is not None:
+        return (EArgKind.LITERAL, None, None)
+    # endif
+
+    if reUnrollArg.match(_sArg) is not None:
+        return (EArgKind.UNROLL, None, None)
+    # endif
+
+    xMatch = reNamedArg.match(_sArg)
+    if xMatch is not None:
+        return (EArgKind.NAMED, xMatch.group("name"), xMatch.group("value"))
+    # endif
+
+    if reTupleArg.match(_sArg) is not None:
+        return (EArgKind.TUPLE, None, None)
+    # endif
+
+    return (EArgKind.EXPR, None, None)
+
+
+# enddef
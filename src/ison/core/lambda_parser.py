@@ -24,6 +24,7 @@
 # </LICENSE>
 ###
 
+import functools
 import json
 import re
 from typing import Union
@@ -36,12 +37,18 @@ from .defines import (
     reString,
     reLiteralString,
     reLambdaPar,
+    reLambdaArgRef,
+    reLambdaQuote,
     reNamedArg,
     reVarStart,
 )
 
 
+from .cls_lambda_arg_refs import CLambdaArgRefs
+from .cls_lazy_seq import CLazySeq, ToData
+from .cls_lambda_template import CLambdaTemplate
 from .cls_parser_error import (
+    CParserError,
     CParserError_Message,
     CParserError_ProcLambdaArgs,
     CParserError_ProcStr,
@@ -232,9 +239,55 @@ def ConvertLambdaToJsonStrings(_sText, *, _bInStringContext=False, _bInStringBac
 # enddef
 
 
+################################################################################
+# The conversions of strings are cached, as recursive lambda functions
+# convert the same bodies and arguments over and over again.
+@functools.lru_cache(maxsize=16384)
+def _StringToLambdaString(_sLambda: str) -> str:
+    return ConvertJsonToLambdaStrings(json.dumps(_sLambda))
+
+
+# enddef
+
+
+################################################################################
+@functools.lru_cache(maxsize=16384)
+def _JsonToLambdaText(_sText: str) -> str:
+    return ConvertJsonToLambdaStrings(_sText)
+
+
+# enddef
+
+
+################################################################################
+@functools.lru_cache(maxsize=16384)
+def _LambdaToJsonText(_sLambda: str) -> str:
+    return ConvertLambdaToJsonStrings(_sLambda)
+
+
+# enddef
+
+
+################################################################################
+# Lambda function body parsed into text parts and parameter slots.
+# The template only depends on the body string, so it is created once per body.
+@functools.lru_cache(maxsize=16384)
+def GetLambdaTemplate(_sBody: str) -> CLambdaTemplate:
+    lScope = FindLambdaScope(_sBody)
+    sBody, bHasPars = NormLambdaIndices(_sBody, lScope)
+    return CLambdaTemplate(sBody, lScope, bHasPars)
+
+
+# enddef
+
+
 ################################################################################
 def ToLambdaString(_xLambda):
-    sLambda = json.dumps(_xLambda)
+    if isinstance(_xLambda, str):
+        return _StringToLambdaString(_xLambda)
+    # endif
+
+    sLambda = json.dumps(_xLambda, default=_ToJsonData)
     sLambda = ConvertJsonToLambdaStrings(sLambda)
 
     return sLambda
@@ -243,9 +296,21 @@ def ToLambdaString(_xLambda):
 # enddef
 
 
+################################################################################
+# Lazy sequences, e.g. in tuples of lambda arguments, are converted to lists
+def _ToJsonData(_xValue):
+    if isinstance(_xValue, CLazySeq):
+        return _xValue.ToList()
+    # endif
+    raise TypeError(f"Object of type {type(_xValue).__name__} is not JSON serializable")
+
+
+# enddef
+
+
 ################################################################################
 def ToLambdaObject(_sLambda):
-    sLambda = ConvertLambdaToJsonStrings(_sLambda)
+    sLambda = _LambdaToJsonText(_sLambda)
     xLambda = json.loads(sLambda)
 
     return xLambda
@@ -254,6 +319,139 @@ def ToLambdaObject(_sLambda):
 # enddef
 
 
+################################################################################
+# Lambda function arguments that are lists or dictionaries are passed by reference.
+# The body references such an argument with '$*{^@arg.<depth>.<idx>}', which returns the
+# argument object itself, so that large data is never converted to text.
+# The references of a call are owned by a CLambdaArgRefs instance, that is active
+# while the call is processed. In this way, the bodies of inner calls can resolve
+# the arguments of outer calls of the same thread.
+sArgRefPrefix = "@arg."
+
+
+################################################################################
+def IsArgRef(_sArg: str) -> bool:
+    return _sArg.startswith(sArgRefPrefix)
+
+
+# enddef
+
+
+################################################################################
+# Returns the argument object for a reference of the form '@arg.<depth>.<idx>'
+def GetArgRef(_sArg: str):
+    lId = _sArg[len(sArgRefPrefix) :].split(".")
+    if len(lId) == 2 and lId[0].isdigit() and lId[1].isdigit():
+        try:
+            return CLambdaArgRefs.Get(int(lId[0]), int(lId[1]))
+        except KeyError:
+            pass
+        # endtry
+    # endif
+
+    raise CParserError_Message(sMsg=f"Lambda argument reference '{_sArg}' is not valid")
+
+
+# enddef
+
+
+################################################################################
+# Replace the argument references in a lambda string by the argument data.
+# This is used for lambda strings that leave the call, like partially applied
+# lambda functions, which may be called after the references have been released.
+def ResolveArgRefs(_sText: str) -> str:
+    if sArgRefPrefix not in _sText:
+        return _sText
+    # endif
+
+    def Replace(_xMatch):
+        try:
+            xArg = CLambdaArgRefs.Get(int(_xMatch.group("depth")), int(_xMatch.group("idx")))
+        except KeyError:
+            return _xMatch.group(0)
+        # endtry
+        return "$*{{^{0}}}".format(ToLambdaString(xArg))
+
+    # enddef
+
+    return reLambdaArgRef.sub(Replace, _sText)
+
+
+# enddef
+
+
+################################################################################
+# Replace the argument references in the strings of the data by the argument data.
+# This is used for data that is passed to other threads, which cannot resolve the
+# references of the current thread. Containers are only copied, if they change.
+def ResolveDataArgRefs(_xData):
+    if CLambdaArgRefs.GetActiveCount() == 0:
+        return _xData
+    # endif
+
+    return _ResolveDataArgRefs(_xData)
+
+
+# enddef
+
+
+################################################################################
+def _ResolveDataArgRefs(_xData):
+    if isinstance(_xData, str):
+        if sArgRefPrefix not in _xData:
+            return _xData
+        # endif
+        return ToLambdaObject(ResolveArgRefs(ToLambdaString(_xData)))
+
+    elif isinstance(_xData, (list, tuple)):
+        lData = [_ResolveDataArgRefs(x) for x in _xData]
+        if all(xNew is xOld for xNew, xOld in zip(lData, _xData)):
+            return _xData
+        # endif
+        return lData if isinstance(_xData, list) else tuple(lData)
+
+    elif isinstance(_xData, dict):
+        dicData = {sKey: _ResolveDataArgRefs(xValue) for sKey, xValue in _xData.items()}
+        if all(dicData[sKey] is xValue for sKey, xValue in _xData.items()):
+            return _xData
+        # endif
+        return dicData
+    # endif
+
+    return _xData
+
+
+# enddef
+
+
+################################################################################
+# Replace the argument references in the messages of an error and its child errors
+def _ResolveErrorArgRefs(_xEx: Exception):
+    xEx = _xEx
+    while isinstance(xEx, CParserError):
+        xEx.message = ResolveArgRefs(xEx.message)
+        xEx = xEx.xChildEx
+    # endwhile
+
+
+# enddef
+
+
+################################################################################
+# Test whether a string is the same as its lambda string without the enclosing $S{} block.
+# Lambda functions in such a call body are bound on the string itself,
+# if all arguments are plain text as well.
+# Bodies and arguments with quoted or back quoted strings are bound on their lambda string.
+# The conversion of such a lambda string back to data depends on the nesting of its string
+# blocks, e.g. an argument in a nested string block keeps its $S{} blocks, so the result
+# cannot be derived from the string and the arguments without the conversion.
+def _IsPlainText(_sText) -> bool:
+    return isinstance(_sText, str) and _sText.isascii() and reLambdaQuote.search(_sText) is None
+
+
+# enddef
+
+
 ################################################################################
 # those lambda function arguments that are no strings,
 # are converted into a string, wrapped in the unwrap function $*{}.
@@ -262,19 +460,25 @@ def ToLambdaObject(_sLambda):
 # for further replacements.
 # Due to the replacement in Lambda functions, there may be mulitply nested strings.
 # To handle this, the lambda parser packs strings in arguments into function blocks $S{}.
-def ToLambdaArgs(_lArgs):
+# If references are given with '_xArgRefs', lists and dictionaries are passed
+# by reference instead.
+def ToLambdaArgs(_lArgs, _xArgRefs: CLambdaArgRefs = None):
     lArgs = []
     for xArg in _lArgs:
+        # Lazy sequences are passed as lists
+        xArg = ToData(xArg)
         if isinstance(xArg, str):
-            sNewArg = ConvertJsonToLambdaStrings(xArg)
+            sNewArg = _JsonToLambdaText(xArg)
             lArgs.append(sNewArg)
         elif var_nt.IsValid(xArg):
             xNewArg = var_nt.Empty()
             dicData = var_nt.GetData(xArg)
             for sKey in dicData:
-                xNewArg = var_nt.Add(xNewArg, sKey, ToLambdaArgs([dicData[sKey]])[0])
+                xNewArg = var_nt.Add(xNewArg, sKey, ToLambdaArgs([dicData[sKey]], _xArgRefs)[0])
             # endfor
             lArgs.append(xNewArg)
+        elif _xArgRefs is not None and (isinstance(xArg, list) or isinstance(xArg, dict)):
+            lArgs.append(_xArgRefs.Add(xArg))
         else:
             sNewArg = ToLambdaString(xArg)
             lArgs.append("$*{{^{0}}}".format(sNewArg))
@@ -308,23 +512,156 @@ def Parse(_xBody, _lArgs, funcProcess=None):
         xResult = _xBody
     # endif
 
-    # sCallBody = json.dumps({"xBody": xResult})
-    sCallBody = ToLambdaString(xResult)
+    with CLambdaArgRefs() as xArgRefs:
+        # those lambda function arguments that are no strings,
+        # are converted into a string, wrapped in the unwrap function $*{}.
+        # The string is passed as literal element to the function via '^',
+        # so that the string is first converted to a struct and then parsed
+        # for further replacements.
+        # Due to the replacement in Lambda functions, there may be mulitply nested strings.
+        # To handle this, the lambda parser packs strings in arguments into function blocks $S{}.
+        lArgs: list[str] = ToLambdaArgs(lInArgs, xArgRefs)
+        xBody = _BindArgs(xResult, lArgs, funcProcess)
+    # endwith
+
+    return xBody
+
+
+# enddef
+
+
+################################################################################
+# Call the lambda function with each of the given argument lists and return the list
+# of results. This gives the same results as calling Parse() for each argument list.
+def ParseEach(_xBody, _lArgLists: list[list], funcProcess=None) -> list:
+    return list(IterParseEach(_xBody, _lArgLists, funcProcess=funcProcess))
+
+
+# enddef
+
+
+################################################################################
+# Generator of the results of ParseEach(). If the function is a single lambda function,
+# the call body is prepared only once. Arguments that are not strings are then bound
+# through a reference slot per argument, whose value is set for each call. In this way,
+# the bound body text is the same for all calls with the same string arguments,
+# and its conversion and parsing is cached.
+def IterParseEach(_xBody, _lArgLists: list[list], funcProcess=None):
+    if not _IsSingleLambda(_xBody):
+        for lArgs in _lArgLists:
+            yield Parse(_xBody, lArgs, funcProcess=funcProcess)
+        # endfor
+        return
+    # endif
+
+    xCallBody = None
+    bHasCallBody: bool = False
+    dicSlots: dict = {}
+    with CLambdaArgRefs() as xArgRefs:
+        for lInArgs in _lArgLists:
+            if len(lInArgs) == 0:
+                yield _xBody
+                continue
+            # endif
+
+            if bHasCallBody is False:
+                if funcProcess is not None:
+                    xCallBody = funcProcess(_xBody)
+                else:
+                    xCallBody = _xBody
+                # endif
+                bHasCallBody = True
+            # endif
+
+            # The slot values are only valid for this call
+            lArgs: list[str] = _ToSlotArgs(lInArgs, dicSlots, xArgRefs)
+            yield _BindArgs(xCallBody, lArgs, funcProcess)
+        # endfor
+    # endwith
+
+
+# enddef
+
+
+################################################################################
+# Test whether the data is a string that consists of a single lambda function.
+# Processing such a string returns the string itself.
+def _IsSingleLambda(_xBody) -> bool:
+    if not isinstance(_xBody, str) or reLambdaFunc.match(_xBody) is None:
+        return False
+    # endif
+
+    try:
+        iBodyEnd = text.FindBalancedChar(_xBody, 2, "}")
+    except Exception:
+        return False
+    # endtry
+
+    return iBodyEnd == len(_xBody) - 1
+
+
+# enddef
+
+
+################################################################################
+# Convert the arguments to lambda strings like ToLambdaArgs(), but bind all arguments
+# that are not strings through the reference slot of their position and name.
+def _ToSlotArgs(_lArgs: list, _dicSlots: dict, _xArgRefs: CLambdaArgRefs) -> list:
+    lArgs = []
+    for iIdx, xArg in enumerate(_lArgs):
+        if var_nt.IsValid(xArg):
+            xNewArg = var_nt.Empty()
+            dicData = var_nt.GetData(xArg)
+            for sKey in dicData:
+                xNewArg = var_nt.Add(xNewArg, sKey, _ToSlotArg(dicData[sKey], (iIdx, sKey), _dicSlots, _xArgRefs))
+            # endfor
+            lArgs.append(xNewArg)
+        else:
+            lArgs.append(_ToSlotArg(xArg, iIdx, _dicSlots, _xArgRefs))
+        # endif
+    # endfor
+
+    return lArgs
+
+
+# enddef
+
+
+################################################################################
+def _ToSlotArg(_xArg, _xSlotKey, _dicSlots: dict, _xArgRefs: CLambdaArgRefs) -> str:
+    # Strings are part of the lambda text and tuples are converted to lists by ToLambdaArgs()
+    if isinstance(_xArg, str) or isinstance(_xArg, tuple):
+        return ToLambdaArgs([_xArg])[0]
+    # endif
+    _xArg = ToData(_xArg)
+
+    tSlot = _dicSlots.get(_xSlotKey)
+    if tSlot is None:
+        iIdx = _xArgRefs.AddSlot()
+        tSlot = (iIdx, _xArgRefs.Ref(iIdx))
+        _dicSlots[_xSlotKey] = tSlot
+    # endif
+
+    _xArgRefs.lArgs[tSlot[0]] = _xArg
+    return tSlot[1]
+
+
+# enddef
+
+
+################################################################################
+# Bind the arguments, given as lambda strings, to the lambda functions in the processed
+# call body, until all arguments have been consumed. Returns the processed call body,
+# in which the argument references have been resolved.
+def _BindArgs(_xCallBody, _lArgs: list, _funcProcess):
+    xCallBody = _xCallBody
     setUsedArgIdx: set = set()
     setUsedArgName: set = set()
 
-    # those lambda function arguments that are no strings,
-    # are converted into a string, wrapped in the unwrap function $*{}.
-    # The string is passed as literal element to the function via '^',
-    # so that the string is first converted to a struct and then parsed
-    # for further replacements.
-    # Due to the replacement in Lambda functions, there may be mulitply nested strings.
-    # To handle this, the lambda parser packs strings in arguments into function blocks $S{}.
-    lArgs: list[str] = ToLambdaArgs(lInArgs)
     lPosArgs: str = []
     dicNamedArgs: dict[str, str] = {}
 
-    for xArg in lArgs:
+    for xArg in _lArgs:
         dicNtArg = var_nt.GetData(xArg)
         if dicNtArg is not None:
             for sKey in dicNtArg:
@@ -340,11 +677,22 @@ def Parse(_xBody, _lArgs, funcProcess=None):
         # endif
     # endfor
 
+    # Plain text arguments are bound to a plain text call body without converting
+    # the body to its lambda string and back. All other bodies are converted (see _IsPlainText()).
+    bPlainArgs = all(_IsPlainText(x) for x in lPosArgs) and all(_IsPlainText(x) for x in dicNamedArgs.values())
+
     # Iterate until all parameters have been processed,
     # or no more lambda functions are in the body.
     bBodyChanged = True
 
     while True:
+        bPlain = bPlainArgs and _IsPlainText(xCallBody)
+        if bPlain:
+            sCallBody = xCallBody
+        else:
+            sCallBody = ToLambdaString(xCallBody)
+        # endif
+
         sCB = ""
         iCBStart = 0
 
@@ -382,67 +730,16 @@ def Parse(_xBody, _lArgs, funcProcess=None):
             iCBStart = iBodyEnd + 1
             sBody = sCallBody[iBodyStart:iBodyEnd]
 
-            lScope = FindLambdaScope(sBody)
-            sBody, bHasPars = NormLambdaIndices(sBody, lScope)
-
+            # Bind the arguments to the parameter slots of the body. The bound body
+            # may again contain parameters, e.g. from lambda functions passed as argument.
+            xTemplate = GetLambdaTemplate(sBody)
+            sB, bHasPars = xTemplate.sBody, xTemplate.bHasPars
             if bHasPars:
-                sB = ""
-                iPartEnd = 0
-                for lPart in lScope:
-                    sB += sBody[iPartEnd : lPart[0]]
-                    sBodyPart = sBody[lPart[0] : lPart[1]]
-                    iPartEnd = lPart[1]
-
-                    iStart = 0
-                    while True:
-                        xMatch = reLambdaPar.search(sBodyPart, iStart)  # max(iStart-1, 0))
-                        if xMatch is None:
-                            break
-                        # endif
-                        # iIdx = int(xMatch.group("idx"))
-                        iIdx: int = None
-                        sArgKey: str = None
-                        if xMatch.group("idx") is not None:
-                            iIdx = int(xMatch.group("idx"))
-                        elif xMatch.group("name_idx") is not None:
-                            iIdx = int(xMatch.group("name_idx"))
-                        # endif
-
-                        # sArgKey is only not None, if the var has a name
-                        sArgKey = xMatch.group("name")
-
-                        bIsNull = len(xMatch.group("isnull")) > 0
-                        if iIdx is not None and iIdx < iPosArgCnt:
-                            setUsedArgIdx.add(iIdx)
-                            sB += sBodyPart[iStart : xMatch.start()]
-                            if not bIsNull:
-                                sB += lPosArgs[iIdx]
-                                bBodyChanged = True
-                            # endif
-                        elif sArgKey is not None and sArgKey in dicNamedArgs:
-                            setUsedArgName.add(sArgKey)
-                            sB += sBodyPart[iStart : xMatch.start()]
-                            if not bIsNull:
-                                sB += dicNamedArgs[sArgKey]
-                                bBodyChanged = True
-                            # endif
-                        # elif sArgKey is not None and len(dicNamedArgs) == 0:
-                        #     raise CParserError_Message(sMsg=f"Named argument '{sArgKey}' not found in lambda function")
-
-                        else:
-                            sB += sBodyPart[iStart : xMatch.end()]
-                        # endif
-                        iStart = xMatch.end()
-                    # endwhile body part
-                    sB += sBodyPart[iStart:]
-                # endfor scope
-                sB += sBody[iPartEnd:]
-
-                lScope = FindLambdaScope(sB)
-                sB, bHasPars = NormLambdaIndices(sB, lScope)
+                sB, bChanged = xTemplate.Bind(lPosArgs, dicNamedArgs, setUsedArgIdx, setUsedArgName)
+                bBodyChanged = bBodyChanged or bChanged
 
-            else:
-                sB = sBody
+                xTemplate = GetLambdaTemplate(sB)
+                sB, bHasPars = xTemplate.sBody, xTemplate.bHasPars
             # endif bHasPars
 
             # If the lambda function has no more free parameters,
@@ -455,24 +752,34 @@ def Parse(_xBody, _lArgs, funcProcess=None):
         # endwhile lambda function bodies
         sCB += sCallBody[iCBStart:]
 
-        xBody = ToLambdaObject(sCB)
+        if bPlain:
+            xBody = sCB
+        else:
+            xBody = ToLambdaObject(sCB)
+        # endif
 
-        if funcProcess is not None:
+        if _funcProcess is not None:
             try:
-                xResult = funcProcess(xBody)
+                xCallBody = _funcProcess(xBody)
             except Exception as xEx:
-                raise CParserError_ProcLambdaPart(sPart=sCB, xChildEx=xEx)
+                _ResolveErrorArgRefs(xEx)
+                sPart = ToLambdaString(sCB) if bPlain else sCB
+                raise CParserError_ProcLambdaPart(sPart=ResolveArgRefs(sPart), xChildEx=xEx)
             # endtry
         else:
-            xResult = xBody
+            xCallBody = xBody
         # endif
-
-        # sCallBody = json.dumps({"xBody": xResult})
-        sCallBody = ToLambdaString(xResult)
     # endwhile all parameters have been consumed
 
-    xBody = ToLambdaObject(sCallBody)
-    return xBody
+    # References must not leave the call
+    if bPlain:
+        if sArgRefPrefix not in sCallBody:
+            return xCallBody
+        # endif
+        sCallBody = ToLambdaString(xCallBody)
+    # endif
+
+    return ToLambdaObject(ResolveArgRefs(sCallBody))
 
 
 # enddef
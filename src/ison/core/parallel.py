@@ -0,0 +1,475 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \parallel.py
+# Created Date: Sunday, October 18th 2026, 10:47:05 pm
+# Author: Christian Perwass
+# <LICENSE id="Apache-2.0">
+#
+#   Functional JSON module
+#   Copyright 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# </LICENSE>
+###
+
+
+import os
+import math
+import pickle
+import threading
+from typing import Optional
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+from . import lambda_parser as lp
+from . import var_deps
+from .cls_parser_trace import CWarningList
+from .cls_dep_node import CDepNode
+from .cls_parser_error import CParserError, CParserError_Message, CParserError_ListSel, CParserError_DictSel
+
+
+# The parser of a worker process or thread
+_xWorker = threading.local()
+
+
+################################################################################
+# Initialize a worker with its own parser, created from the pickled state of the calling parser
+def _InitWorker(_clsParser, _bytState: bytes):
+    _xWorker.xParser = _clsParser.FromWorkerState(pickle.loads(_bytState))
+
+
+# enddef
+
+
+################################################################################
+# Process a chunk of argument lists in a worker. Returns the results up to the first error,
+# the error, if any, and the warnings, processing state and, if tracked, dependencies of the chunk.
+# Errors of process workers are returned as error state, as parser errors cannot be pickled.
+def _ParseChunk(_xFunc, _lArgLists: list[list], _bErrorAsState: bool, _bTrackDeps: bool):
+    xParser = _xWorker.xParser
+    xParser.xWarnings = CWarningList()
+    xParser._bIsFullyProcessed = True
+    xParser._xDepNode = CDepNode() if _bTrackDeps is True else None
+
+    def SubProcess(_xBody):
+        xResult, bIsProc = xParser.InnerProcess(_xBody)
+        return xResult
+
+    # enddef
+
+    lResults = []
+    xError = None
+    try:
+        for xResult in lp.IterParseEach(_xFunc, _lArgLists, funcProcess=SubProcess):
+            lResults.append(xResult)
+        # endfor
+    except Exception as xEx:
+        xError = xEx
+        if _bErrorAsState is True:
+            xError = _ToErrorState(xEx)
+        # endif
+    # endtry
+
+    return lResults, xError, xParser.xWarnings, xParser.bIsFullyProcessed, xParser._xDepNode
+
+
+# enddef
+
+
+################################################################################
+# Call the lambda function with each of the given argument lists on a pool of workers.
+# This gives the same results as lambda_parser.ParseEach(), in the same order.
+# The argument lists are split into chunks, which are processed by workers with their own
+# copy of the parser state. With a process pool, the state, the function and the arguments
+# have to be picklable, and the function should be pure, as side effects, like changes of
+# the function storage, are not returned. A thread pool is meant for functions that wait
+# for I/O, like reading or writing files.
+def ParseEachParallel(_xParser, _xFunc, _lArgLists: list[list], *, bThreads: bool = False) -> list:
+    iArgCnt = len(_lArgLists)
+    iMaxWorkers = _xParser.iMaxWorkers
+    if iMaxWorkers is None:
+        iMaxWorkers = os.cpu_count() or 1
+    # endif
+    iWorkerCnt = min(iMaxWorkers, iArgCnt)
+
+    if iWorkerCnt <= 1 or _xParser.bIsWorker is True:
+
+        def SubProcess(_xBody):
+            xResult, bIsProc = _xParser.InnerProcess(_xBody)
+            return xResult
+
+        # enddef
+
+        return lp.ParseEach(_xFunc, _lArgLists, funcProcess=SubProcess)
+    # endif
+
+    try:
+        bytState = pickle.dumps(_xParser.GetWorkerState())
+    except Exception as xEx:
+        raise CParserError_Message(sMsg="Parser state cannot be passed to parallel workers", xChildEx=xEx)
+    # endtry
+
+    # Lambda argument references are only valid in the calling thread
+    xFunc = lp.ResolveDataArgRefs(_xFunc)
+    lArgLists = lp.ResolveDataArgRefs(_lArgLists)
+
+    # Several chunks per worker balance the load
+    iChunkSize = max(1, math.ceil(iArgCnt / (4 * iWorkerCnt)))
+    lChunkStart = list(range(0, iArgCnt, iChunkSize))
+
+    xExecutor: Executor = None
+    if bThreads is True:
+        xExecutor = ThreadPoolExecutor(iWorkerCnt, initializer=_InitWorker, initargs=(type(_xParser), bytState))
+    else:
+        xExecutor = ProcessPoolExecutor(iWorkerCnt, initializer=_InitWorker, initargs=(type(_xParser), bytState))
+    # endif
+
+    bTrackDeps = _xParser._xDepNode is not None
+    with xExecutor:
+        lFutures = [
+            xExecutor.submit(
+                _ParseChunk, xFunc, lArgLists[iStart : iStart + iChunkSize], not bThreads, bTrackDeps
+            )
+            for iStart in lChunkStart
+        ]
+        lChunkResults = [xFuture.result() for xFuture in lFutures]
+    # endwith
+
+    lResults = []
+    for iStart, tChunkResult in zip(lChunkStart, lChunkResults):
+        lChunk, xError, xWarnings, bIsFullyProcessed, xDepNode = tChunkResult
+        _xParser.xWarnings.AddList(xWarnings)
+        if xDepNode is not None:
+            _xParser._xDepNode.AddDeps(xDepNode)
+        # endif
+        if bIsFullyProcessed is False:
+            _xParser._bIsFullyProcessed = False
+        # endif
+
+        if xError is not None:
+            if isinstance(xError, tuple):
+                xError = _FromErrorState(xError)
+            # endif
+            raise CParserError_ListSel(
+                lData=lArgLists, iIdx=iStart + len(lChunk), sContext="Parallel call with arguments", xChildEx=xError
+            )
+        # endif
+        lResults.extend(lChunk)
+    # endfor
+
+    return lResults
+
+
+# enddef
+
+
+################################################################################
+# Convert an error of a worker process to a picklable state, as parser errors cannot
+# be pickled directly. The state is a tuple of the list of type, message and data of
+# each parser error of the chain, and the exception at the end of the chain, if any.
+# Data that cannot be pickled is dropped.
+def _ToErrorState(_xEx: Exception) -> tuple[list[tuple], Optional[Exception]]:
+    lChain = []
+    while isinstance(_xEx, CParserError):
+        lChain.append((type(_xEx), _xEx.message, _xEx.sType, _ToPicklable(_xEx.xData), _ToPicklable(_xEx.xSelect)))
+        _xEx = _xEx.xChildEx
+    # endwhile
+
+    xCause = None
+    if _xEx is not None:
+        xCause = _ToPicklable(_xEx)
+        if xCause is None:
+            xCause = RuntimeError(str(_xEx))
+        # endif
+    # endif
+
+    return lChain, xCause
+
+
+# enddef
+
+
+################################################################################
+# Returns the data, if it can be pickled and unpickled, and None otherwise
+def _ToPicklable(_xData):
+    try:
+        pickle.loads(pickle.dumps(_xData))
+    except Exception:
+        return None
+    # endtry
+
+    return _xData
+
+
+# enddef
+
+
+################################################################################
+# Rebuild the error chain from the state returned by _ToErrorState(),
+# with the same error types and messages as in the worker.
+def _FromErrorState(_tState: tuple[list[tuple], Optional[Exception]]) -> Exception:
+    lChain, xChildEx = _tState
+    for clsError, sMsg, sType, xData, xSelect in reversed(lChain):
+        xError = clsError.__new__(clsError)
+        CParserError.__init__(xError, sMsg=sMsg, sType=sType, xData=xData, xSelect=xSelect, xChildEx=xChildEx)
+        xChildEx = xError
+    # endfor
+
+    return xChildEx
+
+
+# enddef
+
+
+################################################################################
+# Process a dictionary element in a worker. Returns the result dictionary of the element,
+# its processing state, the error state, if any, and the warnings.
+def _ProcessItem(_sObjId: str, _xData):
+    xParser = _xWorker.xParser
+    xParser.xWarnings = CWarningList()
+    xParser._bIsFullyProcessed = True
+
+    # An error leaves the context and scope of the failed element, which are reset for the next one
+    lParseContext = list(xParser.lParseContext)
+    xScope = xParser.xVarScope
+
+    dicResult = {}
+    bIsProcessed = True
+    tError = None
+    try:
+        bIsProcessed = xParser._ProcessDictItem(dicResult, _sObjId, _xData)
+    except Exception as xEx:
+        tError = _ToErrorState(xEx)
+    finally:
+        xParser.lParseContext = lParseContext
+        xParser.dicVarData["@scope"] = xScope
+    # endtry
+
+    return dicResult, bIsProcessed, tError, xParser.xWarnings, xParser.bIsFullyProcessed
+
+
+# enddef
+
+
+################################################################################
+# Returns the data of all definitions of the variable, that may be used for a reference
+def _GetVarDefs(_xParser, _sName: str) -> list:
+    lDefs = []
+    xScope = _xParser.xVarScope
+    xLocScope = xScope.FindLocal(_sName)
+    if xLocScope is not None:
+        lDefs.append(xLocScope.dicLoc[_sName])
+    # endif
+    xFuncLocScope = xScope.FindFuncLocal(_sName)
+    if xFuncLocScope is not None:
+        lDefs.append(xFuncLocScope.dicFuncLoc[_sName])
+    # endif
+    for dicVars in (_xParser.dicVarGlo, _xParser.dicVarRtv, _xParser.dicVarFuncGlo):
+        if _sName in dicVars:
+            lDefs.append(dicVars[_sName])
+        # endif
+    # endfor
+    if not _sName.startswith("@") and _sName in _xParser.dicVarData:
+        lDefs.append(_xParser.dicVarData[_sName])
+    # endif
+
+    return lDefs
+
+
+# enddef
+
+
+################################################################################
+# Test whether a dictionary element can be processed independently of its siblings.
+# This is the case, if neither the element nor the definitions of the variables it
+# references, reference '@top', variables defined by a sibling or impure functions.
+# The references of the variable definitions are stored in '_dicVarRefs' by name.
+def _IsIndependent(_xParser, _xData, _fsSiblingDefs: frozenset, _dicVarRefs: dict) -> bool:
+    setVars = set()
+    setFuncs = set()
+    if not var_deps.CollectAllRefs(_xData, _xParser._GetVarMatchList, _xParser._dicStatic, setVars, setFuncs):
+        return False
+    # endif
+
+    setDone = set()
+    lOpen = list(setVars)
+    while len(lOpen) > 0:
+        sName = lOpen.pop()
+        if sName in setDone:
+            continue
+        # endif
+        setDone.add(sName)
+
+        if sName == "@top" or sName in _fsSiblingDefs:
+            return False
+        # endif
+
+        tRefs = _dicVarRefs.get(sName)
+        if tRefs is None:
+            setDefVars = set()
+            setDefFuncs = set()
+            bIsStatic = True
+            for xDef in _GetVarDefs(_xParser, sName):
+                bIsStatic = bIsStatic and var_deps.CollectAllRefs(
+                    xDef, _xParser._GetVarMatchList, _xParser._dicStatic, setDefVars, setDefFuncs
+                )
+            # endfor
+            tRefs = _dicVarRefs[sName] = (bIsStatic, setDefVars, setDefFuncs)
+        # endif
+
+        bIsStatic, setDefVars, setDefFuncs = tRefs
+        if bIsStatic is False:
+            return False
+        # endif
+        lOpen.extend(setDefVars)
+        setFuncs.update(setDefFuncs)
+    # endwhile
+
+    return all(sFunc in var_deps.fsCodeFuncs or _xParser.IsPureFunc(sFunc) for sFunc in setFuncs)
+
+
+# enddef
+
+
+################################################################################
+# Process the elements of the top level dictionary, that are independent of each other,
+# in parallel worker processes. All other elements are processed by the given parser,
+# in the given order, while the workers are running. The results are merged in the
+# original element order. Returns the result dictionary and its processing state,
+# or None, if the elements cannot be processed in parallel, e.g. because there are
+# less than two independent elements, or the parser state cannot be pickled.
+# Variables are evaluated where they are defined, so this is not used with lazy variables.
+def ProcessDictItemsParallel(_xParser, _dicData: dict, _lOrder: Optional[list[int]]) -> Optional[tuple[dict, bool]]:
+    if _xParser.bLazyVars is True:
+        return None
+    # endif
+
+    iMaxWorkers = _xParser.iMaxWorkers
+    if iMaxWorkers is None:
+        iMaxWorkers = os.cpu_count() or 1
+    # endif
+    if iMaxWorkers <= 1:
+        return None
+    # endif
+
+    lItems = list(_dicData.items())
+    setSiblingDefs = set()
+    for sObjId, xData in lItems:
+        setSiblingDefs.update(_xParser._dicGlobalDefs.get(id(xData), frozenset()))
+    # endfor
+    fsSiblingDefs = frozenset(setSiblingDefs)
+
+    # Static data and elements with variable keys are processed by the parser itself
+    lIsParallel = []
+    dicVarRefs = {}
+    for sObjId, xData in lItems:
+        lIsParallel.append(
+            isinstance(sObjId, str)
+            and "$" not in sObjId
+            and not sObjId.startswith("__")
+            and isinstance(xData, (dict, list, str))
+            and id(xData) not in _xParser._dicStatic
+            and id(xData) not in _xParser._dicGlobalDefs
+            and _IsIndependent(_xParser, xData, fsSiblingDefs, dicVarRefs)
+        )
+    # endfor
+
+    iParallelCnt = sum(lIsParallel)
+    if iParallelCnt < 2:
+        return None
+    # endif
+
+    try:
+        bytState = pickle.dumps(_xParser.GetWorkerState(bTopData=False))
+    except Exception:
+        return None
+    # endtry
+
+    if _lOrder is None:
+        _lOrder = list(range(len(lItems)))
+    # endif
+
+    # The results and warnings of all elements, in the original element order
+    lItemResults = [None] * len(lItems)
+    lItemWarnings = [None] * len(lItems)
+    dicErrors = {}
+    bIsProcessed = True
+    xWarnings = _xParser.xWarnings
+
+    xExecutor = ProcessPoolExecutor(
+        min(iMaxWorkers, iParallelCnt), initializer=_InitWorker, initargs=(type(_xParser), bytState)
+    )
+    with xExecutor:
+        dicFutures = {
+            iIdx: xExecutor.submit(_ProcessItem, sObjId, xData)
+            for iIdx, (sObjId, xData) in enumerate(lItems)
+            if lIsParallel[iIdx] is True
+        }
+
+        try:
+            for iIdx in _lOrder:
+                if lIsParallel[iIdx] is True:
+                    continue
+                # endif
+
+                sObjId, xData = lItems[iIdx]
+                lItemResults[iIdx] = {}
+                lItemWarnings[iIdx] = _xParser.xWarnings = CWarningList()
+                try:
+                    bIsProc = _xParser._ProcessDictItem(lItemResults[iIdx], sObjId, xData)
+                    bIsProcessed = bIsProcessed and bIsProc
+                except Exception as xEx:
+                    dicErrors[iIdx] = xEx
+                    break
+                # endtry
+            # endfor
+        finally:
+            _xParser.xWarnings = xWarnings
+        # endtry
+
+        for iIdx, xFuture in dicFutures.items():
+            dicResult, bIsProc, tError, xItemWarnings, bIsFullyProcessed = xFuture.result()
+            lItemResults[iIdx] = dicResult
+            lItemWarnings[iIdx] = xItemWarnings
+            bIsProcessed = bIsProcessed and bIsProc
+            if bIsFullyProcessed is False:
+                _xParser._bIsFullyProcessed = False
+            # endif
+            if tError is not None:
+                dicErrors[iIdx] = _FromErrorState(tError)
+            # endif
+        # endfor
+    # endwith
+
+    # Warnings and errors are reported as if the elements were processed in the given order
+    for iIdx in _lOrder:
+        if lItemWarnings[iIdx] is not None:
+            xWarnings.AddList(lItemWarnings[iIdx])
+        # endif
+        if iIdx in dicErrors:
+            raise CParserError_DictSel(dicData=_dicData, xId=lItems[iIdx][0], xChildEx=dicErrors[iIdx])
+        # endif
+    # endfor
+
+    dicResult = {}
+    for dicItemResult in lItemResults:
+        if dicItemResult is not None:
+            dicResult.update(dicItemResult)
+        # endif
+    # endfor
+
+    return dicResult, bIsProcessed
+
+
+# enddef
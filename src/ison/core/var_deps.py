@@ -0,0 +1,462 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \var_deps.py
+# Created Date: Friday, October 16th 2026, 3:12:09 pm
+# Author: Christian Perwass
+# <LICENSE id="Apache-2.0">
+#
+#   Functional JSON module
+#   Copyright 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# </LICENSE>
+###
+
+
+# Static dependency analysis between the elements of a dictionary.
+# An element depends on another one, if it references a global variable
+# that is defined in the other element. Elements are then processed in
+# dependency order, so that a single pass suffices to resolve such references.
+
+import heapq
+from typing import Callable, Optional
+
+from ..util import text
+
+_lGlobalVarKeys = ["__globals__", "__eval_globals__", "__func_globals__"]
+_fsEmpty = frozenset()
+
+# Functions that only evaluate code given in the data, whose purity depends on that code
+fsCodeFuncs = frozenset(["", "L", "L*", ">", "!", "!foreach", "!*", "!where", "!?", "!pforeach", "!tforeach"])
+
+
+################################################################################
+# Collect the names of the global and function global variables, which are defined
+# in the given data. The result is stored for each container that defines
+# variables in '_dicDefs' with the id of the container as key.
+# Containers with an id in '_dicStatic' contain no variable definitions.
+def CollectGlobalDefs(_xData, _dicStatic: dict, _dicDefs: dict) -> frozenset:
+    if id(_xData) in _dicStatic:
+        return _fsEmpty
+    # endif
+
+    setDefs = set()
+    if isinstance(_xData, dict):
+        for sKey, xValue in _xData.items():
+            if not isinstance(sKey, str):
+                continue
+            elif sKey in _lGlobalVarKeys:
+                if isinstance(xValue, dict):
+                    setDefs.update(x for x in xValue if isinstance(x, str) and not x.startswith("__"))
+                # endif
+            elif not sKey.startswith("__"):
+                setDefs.update(CollectGlobalDefs(xValue, _dicStatic, _dicDefs))
+            # endif
+        # endfor
+
+    elif isinstance(_xData, list):
+        if len(_xData) > 0 and _xData[0] == "__lambda__":
+            return _fsEmpty
+        # endif
+        for xEl in _xData:
+            setDefs.update(CollectGlobalDefs(xEl, _dicStatic, _dicDefs))
+        # endfor
+    # endif
+
+    if len(setDefs) == 0:
+        return _fsEmpty
+    # endif
+
+    fsDefs = frozenset(setDefs)
+    _dicDefs[id(_xData)] = fsDefs
+    return fsDefs
+
+
+# enddef
+
+
+################################################################################
+# Collect the names of all variables referenced in the given data.
+# For a variable path, only the first element is used. The references
+# of containers are stored in '_dicRefs' with the id of the container as key.
+def CollectVarRefs(_xData, _funcGetVarMatchList: Callable, _dicStatic: dict, _dicRefs: dict) -> frozenset:
+    if isinstance(_xData, str):
+        setRefs = set()
+        _AddStringRefs(_xData, _funcGetVarMatchList, setRefs)
+        return frozenset(setRefs)
+    # endif
+
+    if not isinstance(_xData, dict) and not isinstance(_xData, list):
+        return _fsEmpty
+    # endif
+
+    iId = id(_xData)
+    if iId in _dicStatic:
+        return _fsEmpty
+    # endif
+
+    fsRefs = _dicRefs.get(iId)
+    if fsRefs is not None:
+        return fsRefs
+    # endif
+
+    setRefs = set()
+    if isinstance(_xData, dict):
+        for sKey, xValue in _xData.items():
+            if isinstance(sKey, str):
+                _AddStringRefs(sKey, _funcGetVarMatchList, setRefs)
+            # endif
+            setRefs.update(CollectVarRefs(xValue, _funcGetVarMatchList, _dicStatic, _dicRefs))
+        # endfor
+    else:
+        for xEl in _xData:
+            setRefs.update(CollectVarRefs(xEl, _funcGetVarMatchList, _dicStatic, _dicRefs))
+        # endfor
+    # endif
+
+    fsRefs = frozenset(setRefs)
+    _dicRefs[iId] = fsRefs
+    return fsRefs
+
+
+# enddef
+
+
+################################################################################
+def _AddStringRefs(_sValue: str, _funcGetVarMatchList: Callable, _setRefs: set):
+    if "$" not in _sValue:
+        return
+    # endif
+
+    # Strings that cannot be parsed have no references.
+    # The error is raised when the string is processed.
+    try:
+        lMatch = _funcGetVarMatchList(_sValue)
+    except Exception:
+        return
+    # endtry
+
+    for xMatch in lMatch:
+        lArgs = xMatch["lArgs"]
+        if xMatch["sFunc"] == "" and len(lArgs) > 0 and "$" not in lArgs[0]:
+            try:
+                sName = text.SplitVarPath(lArgs[0])[0]
+            except Exception:
+                continue
+            # endtry
+            if isinstance(sName, str) and not sName.startswith("@"):
+                _setRefs.add(sName)
+            # endif
+        else:
+            for sArg in lArgs:
+                if isinstance(sArg, str):
+                    _AddStringRefs(sArg, _funcGetVarMatchList, _setRefs)
+                # endif
+            # endfor
+        # endif
+    # endfor
+
+
+# enddef
+
+
+################################################################################
+# Collect the names of all variables, including those starting with '@', and of all
+# functions referenced in the given data. Returns False, if the references cannot be
+# determined statically, i.e. if a variable name contains a variable, a string cannot
+# be parsed or the data contains include files or runtime variables.
+def CollectAllRefs(_xData, _funcGetVarMatchList: Callable, _dicStatic: dict, _setVars: set, _setFuncs: set) -> bool:
+    if isinstance(_xData, str):
+        return _AddAllStringRefs(_xData, _funcGetVarMatchList, _setVars, _setFuncs)
+    # endif
+
+    if id(_xData) in _dicStatic:
+        return True
+    # endif
+
+    if isinstance(_xData, dict):
+        for sKey, xValue in _xData.items():
+            if sKey in ("__includes__", "__runtime_vars__"):
+                return False
+            # endif
+            if isinstance(sKey, str) and not _AddAllStringRefs(sKey, _funcGetVarMatchList, _setVars, _setFuncs):
+                return False
+            # endif
+            if not CollectAllRefs(xValue, _funcGetVarMatchList, _dicStatic, _setVars, _setFuncs):
+                return False
+            # endif
+        # endfor
+
+    elif isinstance(_xData, list):
+        for xEl in _xData:
+            if not CollectAllRefs(xEl, _funcGetVarMatchList, _dicStatic, _setVars, _setFuncs):
+                return False
+            # endif
+        # endfor
+    # endif
+
+    return True
+
+
+# enddef
+
+
+################################################################################
+def _AddAllStringRefs(_sValue: str, _funcGetVarMatchList: Callable, _setVars: set, _setFuncs: set) -> bool:
+    if "$" not in _sValue:
+        return True
+    # endif
+
+    try:
+        lMatch = _funcGetVarMatchList(_sValue)
+    except Exception:
+        return False
+    # endtry
+
+    for xMatch in lMatch:
+        lArgs = xMatch["lArgs"]
+        _setFuncs.add(xMatch["sFunc"])
+        if xMatch["sFunc"] == "" and len(lArgs) > 0:
+            if "$" in lArgs[0]:
+                return False
+            # endif
+            try:
+                sName = text.SplitVarPath(lArgs[0])[0]
+            except Exception:
+                return False
+            # endtry
+            if isinstance(sName, str):
+                _setVars.add(sName)
+            # endif
+            lArgs = lArgs[1:]
+        # endif
+
+        for sArg in lArgs:
+            if isinstance(sArg, str) and not _AddAllStringRefs(sArg, _funcGetVarMatchList, _setVars, _setFuncs):
+                return False
+            # endif
+        # endfor
+    # endfor
+
+    return True
+
+
+# enddef
+
+
+################################################################################
+# Returns the order in which the elements are processed. Element 'i' is processed
+# after element 'j', if 'i' references a variable from '_lDefs[j]'.
+# Elements in a dependency cycle keep their original order.
+def GetProcessOrder(_lDefs: list[frozenset], _lRefs: list[frozenset]) -> list[int]:
+    iCnt = len(_lDefs)
+    lDependents: list[list[int]] = [[] for x in range(iCnt)]
+    lInDegree: list[int] = [0] * iCnt
+
+    for iDefIdx, fsDefs in enumerate(_lDefs):
+        if len(fsDefs) == 0:
+            continue
+        # endif
+        for iIdx, fsRefs in enumerate(_lRefs):
+            if iIdx != iDefIdx and not fsDefs.isdisjoint(fsRefs):
+                lDependents[iDefIdx].append(iIdx)
+                lInDegree[iIdx] += 1
+            # endif
+        # endfor
+    # endfor
+
+    lReady = [i for i in range(iCnt) if lInDegree[i] == 0]
+    heapq.heapify(lReady)
+    lDone = [False] * iCnt
+    lOrder = []
+    iNextPending = 0
+
+    while len(lOrder) < iCnt:
+        if len(lReady) > 0:
+            iIdx = heapq.heappop(lReady)
+        else:
+            # Dependency cycle: continue with the first pending element
+            while lDone[iNextPending] is True:
+                iNextPending += 1
+            # endwhile
+            iIdx = iNextPending
+        # endif
+
+        if lDone[iIdx] is True:
+            continue
+        # endif
+        lDone[iIdx] = True
+        lOrder.append(iIdx)
+
+        for iDepIdx in lDependents[iIdx]:
+            lInDegree[iDepIdx] -= 1
+            if lInDegree[iDepIdx] == 0 and lDone[iDepIdx] is False:
+                heapq.heappush(lReady, iDepIdx)
+            # endif
+        # endfor
+    # endwhile
+
+    return lOrder
+
+
+# enddef
+
+
+################################################################################
+# Build the selection tree of the given paths, where each path is a list of dictionary keys.
+# A key maps to the selection of its element, or to None, if the element is selected as a whole.
+# The key '*' selects all elements of a dictionary. Returns None, if everything is selected.
+def MakeSelectTree(_lPaths: list[list]) -> Optional[dict]:
+    dicRoot = {}
+    for lPath in _lPaths:
+        if len(lPath) == 0 or lPath[0] == "*":
+            return None
+        # endif
+
+        dicSel = dicRoot
+        for iIdx, sKey in enumerate(lPath):
+            if iIdx + 1 == len(lPath) or lPath[iIdx + 1] == "*":
+                dicSel[sKey] = None
+                break
+            # endif
+
+            if sKey not in dicSel:
+                dicSel[sKey] = {}
+            elif dicSel[sKey] is None:
+                break
+            # endif
+            dicSel = dicSel[sKey]
+        # endfor
+    # endfor
+
+    return dicRoot
+
+
+# enddef
+
+
+################################################################################
+# Get the elements of a dictionary, which have to be processed for the given selection.
+# These are the selected elements and, transitively, the elements that define global variables
+# they reference. If a selected key is not in the dictionary, the keys with variables are processed,
+# as they may result in it. Elements that include files may define any variable, so they are always
+# processed. If the references of a processed element cannot be determined, all elements are processed.
+# Returns a flag for each item, whether it is processed, and the names of the variables and functions
+# referenced by the processed elements, or None, if they cannot be determined.
+def GetSelectedItems(
+    _lItems: list[tuple], _dicSelect: dict, _funcGetVarMatchList: Callable, _dicStatic: dict, _dicDefs: dict
+) -> tuple[list[bool], Optional[frozenset]]:
+    iCnt = len(_lItems)
+    lProcess = [False] * iCnt
+    lDefs = [None] * iCnt
+    setRefs = set()
+
+    setKeys = set(x[0] for x in _lItems)
+    bMissing = any(sKey not in setKeys for sKey in _dicSelect)
+
+    lPending = []
+    for iIdx, (sKey, xValue) in enumerate(_lItems):
+        if not isinstance(sKey, str) or sKey.startswith("__"):
+            continue
+        elif sKey in _dicSelect or (bMissing is True and "$" in sKey) or _HasIncludes(xValue, _dicStatic):
+            lPending.append(iIdx)
+        else:
+            lDefs[iIdx] = CollectGlobalDefs(xValue, _dicStatic, _dicDefs)
+        # endif
+    # endfor
+
+    while len(lPending) > 0:
+        iIdx = lPending.pop()
+        if lProcess[iIdx] is True:
+            continue
+        # endif
+        lProcess[iIdx] = True
+
+        sKey, xValue = _lItems[iIdx]
+        fsRefs = CollectSelectedRefs(xValue, _dicSelect.get(sKey), _funcGetVarMatchList, _dicStatic, _dicDefs)
+        setKeyFuncs = set()
+        if fsRefs is None or not _AddAllStringRefs(sKey, _funcGetVarMatchList, setRefs, setKeyFuncs):
+            return [True] * iCnt, None
+        # endif
+        fsRefs = fsRefs.union(setKeyFuncs)
+        setRefs.update(fsRefs)
+
+        for iDefIdx, fsDefs in enumerate(lDefs):
+            if fsDefs is not None and lProcess[iDefIdx] is False and not fsDefs.isdisjoint(setRefs):
+                lPending.append(iDefIdx)
+            # endif
+        # endfor
+    # endwhile
+
+    return lProcess, frozenset(setRefs)
+
+
+# enddef
+
+
+################################################################################
+# Collect the names of the variables and functions referenced by the selected part of the data,
+# including the elements the selection depends on (see GetSelectedItems()).
+# Returns None, if the references cannot be determined.
+def CollectSelectedRefs(
+    _xData, _dicSelect: Optional[dict], _funcGetVarMatchList: Callable, _dicStatic: dict, _dicDefs: dict
+) -> Optional[frozenset]:
+    setVars = set()
+    setFuncs = set()
+
+    if _dicSelect is not None and isinstance(_xData, dict) and id(_xData) not in _dicStatic:
+        for sKey, xValue in _xData.items():
+            if isinstance(sKey, str) and sKey.startswith("__"):
+                if sKey in ("__includes__", "__runtime_vars__"):
+                    return None
+                # endif
+                if not CollectAllRefs(xValue, _funcGetVarMatchList, _dicStatic, setVars, setFuncs):
+                    return None
+                # endif
+            # endif
+        # endfor
+
+        lProcess, fsRefs = GetSelectedItems(
+            list(_xData.items()), _dicSelect, _funcGetVarMatchList, _dicStatic, _dicDefs
+        )
+        if fsRefs is None:
+            return None
+        # endif
+        return fsRefs.union(setVars, setFuncs)
+    # endif
+
+    if not CollectAllRefs(_xData, _funcGetVarMatchList, _dicStatic, setVars, setFuncs):
+        return None
+    # endif
+    return frozenset(setVars.union(setFuncs))
+
+
+# enddef
+
+
+################################################################################
+# Test whether the data includes files
+def _HasIncludes(_xData, _dicStatic: dict) -> bool:
+    if id(_xData) in _dicStatic:
+        return False
+    elif isinstance(_xData, dict):
+        return "__includes__" in _xData or any(_HasIncludes(x, _dicStatic) for x in _xData.values())
+    elif isinstance(_xData, list):
+        return any(_HasIncludes(x, _dicStatic) for x in _xData)
+    # endif
+    return False
+
+
+# enddef
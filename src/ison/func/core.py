@@ -28,11 +28,13 @@ import math
 import re
 import json
 
-from ..util import text, convert
+from ..util import text, convert, data
 from ..util.data import RecursiveUpdateDict
 from ..core import lambda_parser as lp
+from ..core import parallel
 from ..core.defines import reLiteralString
 from ..core import var_nt
+from ..core.cls_lazy_seq import CLazySeq
 from ..core.cls_parser_error import (
     CParserError,
     CParserError_Message,
@@ -117,6 +119,9 @@ def Reference(_xParser, _lArgs, _lArgIsProc, *, sFuncName):
         if not all((x for x in lLamParProc)):
             return None, False
         # endif
+
+        # Reference does not support lazy sequences as lambda arguments
+        _xParser.MaterializeArgs(sFuncName, lLamPar)
     # endif
 
     bLiteral = False
@@ -261,32 +266,27 @@ def LambdaCall(_xParser, _lArgs, _lArgIsProc, *, sFuncName):
 
 
 ################################################################################
-@tooltip("Execute lambda function (first argument) for all remaining arguments")
-def LambdaCall_ForEach_Arg(_xParser, _lArgs, _lArgIsProc, *, sFuncName):
-    iArgCnt = len(_lArgs)
-
-    if iArgCnt < 1:
-        raise CParserError_FuncMessage(
-            sFunc=sFuncName,
-            sMsg="Lambda call 'for each' expects at least 1 argument but {0} were given".format(iArgCnt),
-        )
+# A tuple argument of 'for each' calls gives the argument list of a single call
+def _ToLambdaArgList(_xArg) -> list:
+    if isinstance(_xArg, tuple):
+        return list(_xArg)
     # endif
 
-    def SubProcess(_xBody):
-        xResult, bIsProc = _xParser.InnerProcess(_xBody)
-        return xResult
+    return [_xArg]
 
-    # enddef
 
-    lResults = []
-    xFunc = _lArgs[0]
-    lFuncArgs = _lArgs[1:]
+# enddef
 
-    tIsNamedTuple = tuple(var_nt.IsValid(x) for x in lFuncArgs)
+
+################################################################################
+# Returns the argument lists of the calls of a 'for each' lambda call.
+# Named arguments with tuple values are broadcast over the calls.
+def _GetForEachArgLists(_lFuncArgs: list, _sFuncName: str) -> list[list]:
+    tIsNamedTuple = tuple(var_nt.IsValid(x) for x in _lFuncArgs)
     bAllNamedArgs = all(tIsNamedTuple)
     if any(tIsNamedTuple) is True and bAllNamedArgs is False:
         raise CParserError_FuncMessage(
-            sFunc=sFuncName, sMsg="You cannot mix named and unnamed arguments in 'for each' lambda call"
+            sFunc=_sFuncName, sMsg="You cannot mix named and unnamed arguments in 'for each' lambda call"
         )
     # endif
 
@@ -295,7 +295,7 @@ def LambdaCall_ForEach_Arg(_xParser, _lArgs, _lArgIsProc, *, sFuncName):
         lValueLists: list[list] = []
 
         iMinValueCnt: int = None
-        for tFuncArg in lFuncArgs:
+        for tFuncArg in _lFuncArgs:
             dicNT: dict = tFuncArg[1]
             for sKey in dicNT:
                 lKeys.append(sKey)
@@ -318,6 +318,7 @@ def LambdaCall_ForEach_Arg(_xParser, _lArgs, _lArgIsProc, *, sFuncName):
             iMinValueCnt = 1
         # endif
 
+        lArgLists = []
         for iIterIdx in range(iMinValueCnt):
             lNewArg = []
             for iKeyIdx, sKey in enumerate(lKeys):
@@ -330,25 +331,84 @@ def LambdaCall_ForEach_Arg(_xParser, _lArgs, _lArgIsProc, *, sFuncName):
                 lNewArg.append(var_nt.Create(sKey, xValue))
                 # lNewArg.append(f"{sKey}={xValue}")
             # endfor
-
-            xResult = lp.Parse(xFunc, lNewArg, funcProcess=SubProcess)
-            lResults.append(xResult)
+            lArgLists.append(lNewArg)
         # endfor
 
     else:
-        for xArg in _lArgs[1:]:
-            lNewArg = None
-            if isinstance(xArg, tuple):
-                lNewArg = list(xArg)
-            else:
-                lNewArg = [xArg]
-            # endif
-            xResult = lp.Parse(xFunc, lNewArg, funcProcess=SubProcess)
+        lArgLists = [_ToLambdaArgList(xArg) for xArg in _lFuncArgs]
+    # endif
 
-            lResults.append(xResult)
-        # endfor
+
+    return lArgLists
+
+
+# enddef
+
+
+################################################################################
+@tooltip("Execute lambda function (first argument) for all remaining arguments")
+def LambdaCall_ForEach_Arg(_xParser, _lArgs, _lArgIsProc, *, sFuncName):
+    iArgCnt = len(_lArgs)
+
+    if iArgCnt < 1:
+        raise CParserError_FuncMessage(
+            sFunc=sFuncName,
+            sMsg="Lambda call 'for each' expects at least 1 argument but {0} were given".format(iArgCnt),
+        )
     # endif
 
+    def SubProcess(_xBody):
+        xResult, bIsProc = _xParser.InnerProcess(_xBody)
+        return xResult
+
+    # enddef
+
+    xFunc = _lArgs[0]
+    lArgLists = _GetForEachArgLists(_lArgs[1:], sFuncName)
+
+    # The lambda function is prepared once for all argument lists
+    lResults = lp.ParseEach(xFunc, lArgLists, funcProcess=SubProcess)
+
+    return lResults, False
+
+
+# enddef
+
+
+################################################################################
+@tooltip("Execute pure lambda function (first argument) for all remaining arguments on a process pool")
+def LambdaCall_ForEach_Processes(_xParser, _lArgs, _lArgIsProc, *, sFuncName):
+    return _LambdaCall_ForEach_Parallel(_xParser, _lArgs, sFuncName=sFuncName, bThreads=False)
+
+
+# enddef
+
+
+################################################################################
+@tooltip("Execute lambda function (first argument) for all remaining arguments on a thread pool")
+def LambdaCall_ForEach_Threads(_xParser, _lArgs, _lArgIsProc, *, sFuncName):
+    return _LambdaCall_ForEach_Parallel(_xParser, _lArgs, sFuncName=sFuncName, bThreads=True)
+
+
+# enddef
+
+
+################################################################################
+def _LambdaCall_ForEach_Parallel(_xParser, _lArgs, *, sFuncName, bThreads):
+    iArgCnt = len(_lArgs)
+
+    if iArgCnt < 1:
+        raise CParserError_FuncMessage(
+            sFunc=sFuncName,
+            sMsg="Lambda call 'for each' expects at least 1 argument but {0} were given".format(iArgCnt),
+        )
+    # endif
+
+    xFunc = _lArgs[0]
+    lArgLists = _GetForEachArgLists(_lArgs[1:], sFuncName)
+
+    lResults = parallel.ParseEachParallel(_xParser, xFunc, lArgLists, bThreads=bThreads)
+
     return lResults, False
 
 
@@ -378,14 +438,9 @@ def LambdaCall_ForEach_Where(_xParser, _lArgs, _lArgIsProc, *, sFuncName):
 
     lResults = []
     xFunc = _lArgs[0]
-    for xArg in _lArgs[1:]:
-        lNewArg = None
-        if isinstance(xArg, tuple):
-            lNewArg = list(xArg)
-        else:
-            lNewArg = [xArg]
-        # endif
-        xResult = lp.Parse(xFunc, lNewArg, funcProcess=SubProcess)
+    lFuncArgs = _lArgs[1:]
+    lTests = lp.ParseEach(xFunc, [_ToLambdaArgList(xArg) for xArg in lFuncArgs], funcProcess=SubProcess)
+    for xArg, xResult in zip(lFuncArgs, lTests):
         if isinstance(xResult, list):
             if convert.ToBool(xResult[0]):
                 lResults.append(xResult[1])
@@ -469,6 +524,20 @@ def ToStruct(_xParser, _lArgs, _lArgIsProc, *, sFuncName):
         raise CParserError_FuncMessage(sFunc=sFuncName, sMsg="Argument to function '*' must be a string")
     # endif
 
+    # Lambda arguments passed by reference are returned as they are.
+    # Only dictionaries with special keys are changed by the parser, so these are copied.
+    # Static data is registered with the parser, so that it is not processed again.
+    if lp.IsArgRef(sArg):
+        xValue = lp.GetArgRef(sArg)
+        if (isinstance(xValue, dict) or isinstance(xValue, list)) and id(xValue) not in _xParser._dicStatic:
+            xValue = data.CopyDataSpine(xValue, _xParser._dicStatic, bCopyRoot=False)
+            if data.CollectStaticData(xValue, _xParser._dicStatic) is True:
+                _xParser._dicStatic[id(xValue)] = xValue
+            # endif
+        # endif
+        return xValue, False
+    # endif
+
     # Due to the replacement in Lambda functions, there may be mulitply nested strings.
     # To handle this, the lambda parser packs strings in arguments into function blocks $S{}.
     # The top level string blocks need to be replaced by quotes again here.
@@ -612,16 +681,11 @@ def Enumerate(_xParser, _lArgs, _lArgIsProc, *, sFuncName):
     # endif
 
     lArg = _lArgs[0]
-    if not isinstance(lArg, list):
+    if not isinstance(lArg, (list, CLazySeq)):
         raise CParserError_FuncMessage(sFunc=sFuncName, sMsg="Argument to function 'enumerate' must be a list")
     # endif
 
-    lResult = []
-    for iIdx, xArg in enumerate(lArg):
-        lResult.append((iIdx, xArg))
-    # endfor
-
-    return lResult, False
+    return CLazySeq.Enumerate(lArg), False
 
 
 # enddef
@@ -646,14 +710,12 @@ def Group(_xParser, _lArgs, _lArgIsProc, *, sFuncName):
     # endif
 
     for iIdx, xArg in enumerate(_lArgs):
-        if not isinstance(xArg, list):
+        if not isinstance(xArg, (list, CLazySeq)):
             raise CParserError_FuncMessage(sFunc=sFuncName, sMsg=f"Argument {(iIdx+1)} must be a list")
         # endif
     # endfor
 
-    lResult = list(zip(*_lArgs))
-
-    return lResult, False
+    return CLazySeq.Zip(list(_lArgs)), False
 
 
 # enddef
@@ -774,7 +836,7 @@ def ToRange(_xParser, _lArgs, _lArgIsProc, *, sFuncName):
 
     lResult = None
     if iArgCnt == 1:
-        lResult = list(range(iStart))
+        lResult = CLazySeq.FromRange(range(iStart))
 
     elif iArgCnt >= 2:
         try:
@@ -800,7 +862,7 @@ def ToRange(_xParser, _lArgs, _lArgIsProc, *, sFuncName):
             # endtry
         # endif
 
-        lResult = list(range(iStart, iEnd + 1, iStep))
+        lResult = CLazySeq.FromRange(range(iStart, iEnd + 1, iStep))
     # endif
 
     return lResult, False
@@ -826,7 +888,7 @@ def Len(_xParser, _lArgs, _lArgIsProc, *, sFuncName):
     # endif
 
     xArg = _lArgs[0]
-    if not isinstance(xArg, list) and not isinstance(xArg, dict):
+    if not isinstance(xArg, (list, CLazySeq)) and not isinstance(xArg, dict):
         raise CParserError_FuncMessage(sFunc=sFuncName, sMsg="Argument must be a list")
     # endif
 
@@ -862,7 +924,7 @@ def Get(_xParser, _lArgs, _lArgIsProc, *, sFuncName):
             return dicData[xKey], False
         # endif
     
-    elif isinstance(_lArgs[0], list):
+    elif isinstance(_lArgs[0], (list, CLazySeq)):
         try:
             iIdx = int(xKey)
         except Exception as xEx:
@@ -1618,7 +1680,7 @@ def CircularSelect(_xParser, _lArgs, _lArgIsProc, *, sFuncName):
         )
     # endif
 
-    if not isinstance(_lArgs[0], list):
+    if not isinstance(_lArgs[0], (list, CLazySeq)):
         raise CParserError_FuncMessage(sFunc=sFuncName, sMsg="First argument must be a list")
     # endif
 
@@ -1933,65 +1995,70 @@ def RegExFuncGrp(
 
 
 ################################################################################
+# Functions with 'bPure' set, only depend on their arguments and have no side effects.
+# Calls of these functions with constant arguments may be evaluated in advance.
+# Functions with 'bLazyArgs' set, accept lazy sequences (CLazySeq) as arguments.
 __ison_functions__ = {
     #####################################################################
-    "": {"funcExec": Reference, "bLiteralArgs": True},
+    "": {"funcExec": Reference, "bLiteralArgs": True, "bPure": False},
     #####################################################################
     # Lambda function related function
-    "L": {"funcExec": Lambda, "bLiteralArgs": True},
-    "L*": {"funcExec": LambdaDef, "bLiteralArgs": True},
+    "L": {"funcExec": Lambda, "bLiteralArgs": True, "bPure": False},
+    "L*": {"funcExec": LambdaDef, "bLiteralArgs": True, "bPure": False},
     # '>' only kept for backward compatibility.
     # Is replaced by '!', since '>' is replaced by an escaped unicode
     # control value by pyjson5, so that it can be passed in an URL.
-    ">": {"funcExec": LambdaCall, "bLiteralArgs": False},
-    "!": {"funcExec": LambdaCall, "bLiteralArgs": False},
-    "!foreach": {"funcExec": LambdaCall_ForEach_Arg, "bLiteralArgs": False},
-    "!*": {"funcExec": LambdaCall_ForEach_Arg, "bLiteralArgs": False},
-    "!where": {"funcExec": LambdaCall_ForEach_Where, "bLiteralArgs": False},
-    "!?": {"funcExec": LambdaCall_ForEach_Where, "bLiteralArgs": False},
+    ">": {"funcExec": LambdaCall, "bLiteralArgs": False, "bPure": False},
+    "!": {"funcExec": LambdaCall, "bLiteralArgs": False, "bPure": False},
+    "!foreach": {"funcExec": LambdaCall_ForEach_Arg, "bLiteralArgs": False, "bPure": False},
+    "!pforeach": {"funcExec": LambdaCall_ForEach_Processes, "bLiteralArgs": False, "bPure": False},
+    "!tforeach": {"funcExec": LambdaCall_ForEach_Threads, "bLiteralArgs": False, "bPure": False},
+    "!*": {"funcExec": LambdaCall_ForEach_Arg, "bLiteralArgs": False, "bPure": False},
+    "!where": {"funcExec": LambdaCall_ForEach_Where, "bLiteralArgs": False, "bPure": False},
+    "!?": {"funcExec": LambdaCall_ForEach_Where, "bLiteralArgs": False, "bPure": False},
     #####################################################################
     # Data Structure functions
-    "enumerate": {"funcExec": Enumerate, "bLiteralArgs": False},
-    "group": {"funcExec": Group, "bLiteralArgs": False},
-    "union": {"funcExec": ToUnion, "bLiteralArgs": False},
-    "runion": {"funcExec": ToRecursiveUnion, "bLiteralArgs": False},
-    "range": {"funcExec": ToRange, "bLiteralArgs": False},
-    "sort": {"funcExec": Sort, "bLiteralArgs": False},
-    "len": {"funcExec": Len, "bLiteralArgs": False},
-    "circularselect": {"funcExec": CircularSelect, "bLiteralArgs": False},
-    "get": {"funcExec": Get, "bLiteralArgs": False},
+    "enumerate": {"funcExec": Enumerate, "bLiteralArgs": False, "bPure": True, "bLazyArgs": True},
+    "group": {"funcExec": Group, "bLiteralArgs": False, "bPure": True, "bLazyArgs": True},
+    "union": {"funcExec": ToUnion, "bLiteralArgs": False, "bPure": True},
+    "runion": {"funcExec": ToRecursiveUnion, "bLiteralArgs": False, "bPure": True},
+    "range": {"funcExec": ToRange, "bLiteralArgs": False, "bPure": True},
+    "sort": {"funcExec": Sort, "bLiteralArgs": False, "bPure": True},
+    "len": {"funcExec": Len, "bLiteralArgs": False, "bPure": True, "bLazyArgs": True},
+    "circularselect": {"funcExec": CircularSelect, "bLiteralArgs": False, "bPure": True, "bLazyArgs": True},
+    "get": {"funcExec": Get, "bLiteralArgs": False, "bPure": True, "bLazyArgs": True},
     #####################################################################
     # Logic Functions
-    "and": {"funcExec": BoolAnd, "bLiteralArgs": False},
-    "eq": {"funcExec": TestEqual, "bLiteralArgs": False},
-    "neq": {"funcExec": TestNotEqual, "bLiteralArgs": False},
-    "gt": {"funcExec": TestGreater, "bLiteralArgs": False},
-    "ge": {"funcExec": TestGreaterEqual, "bLiteralArgs": False},
-    "lt": {"funcExec": TestLess, "bLiteralArgs": False},
-    "le": {"funcExec": TestLessEqual, "bLiteralArgs": False},
-    "in": {"funcExec": TestContains, "bLiteralArgs": False},
-    "if": {"funcExec": IfCall, "bLiteralArgs": True},
-    "or": {"funcExec": BoolOr, "bLiteralArgs": False},
-    "not": {"funcExec": BoolNot, "bLiteralArgs": False},
+    "and": {"funcExec": BoolAnd, "bLiteralArgs": False, "bPure": True},
+    "eq": {"funcExec": TestEqual, "bLiteralArgs": False, "bPure": True},
+    "neq": {"funcExec": TestNotEqual, "bLiteralArgs": False, "bPure": True},
+    "gt": {"funcExec": TestGreater, "bLiteralArgs": False, "bPure": True},
+    "ge": {"funcExec": TestGreaterEqual, "bLiteralArgs": False, "bPure": True},
+    "lt": {"funcExec": TestLess, "bLiteralArgs": False, "bPure": True},
+    "le": {"funcExec": TestLessEqual, "bLiteralArgs": False, "bPure": True},
+    "in": {"funcExec": TestContains, "bLiteralArgs": False, "bPure": True},
+    "if": {"funcExec": IfCall, "bLiteralArgs": True, "bPure": True},
+    "or": {"funcExec": BoolOr, "bLiteralArgs": False, "bPure": True},
+    "not": {"funcExec": BoolNot, "bLiteralArgs": False, "bPure": True},
     #####################################################################
     # String
-    "join": {"funcExec": JoinStrings, "bLiteralArgs": False},
-    "str": {"funcExec": ToString, "bLiteralArgs": False},
+    "join": {"funcExec": JoinStrings, "bLiteralArgs": False, "bPure": True},
+    "str": {"funcExec": ToString, "bLiteralArgs": False, "bPure": True},
     #####################################################################
     # RegEx
-    "re.*": {"funcExec": RegExFuncGrp, "bLiteralArgs": False},
+    "re.*": {"funcExec": RegExFuncGrp, "bLiteralArgs": False, "bPure": True},
     #####################################################################
     # Conversion functions
-    "bool": {"funcExec": ToBool, "bLiteralArgs": False},
-    "float": {"funcExec": ToFloat, "bLiteralArgs": False},
-    "int": {"funcExec": ToInt, "bLiteralArgs": False},
-    "json": {"funcExec": ToJson, "bLiteralArgs": False},
-    "to-ref-path": {"funcExec": ToRefPath, "bLiteralArgs": False},
+    "bool": {"funcExec": ToBool, "bLiteralArgs": False, "bPure": True},
+    "float": {"funcExec": ToFloat, "bLiteralArgs": False, "bPure": True},
+    "int": {"funcExec": ToInt, "bLiteralArgs": False, "bPure": True},
+    "json": {"funcExec": ToJson, "bLiteralArgs": False, "bPure": True},
+    "to-ref-path": {"funcExec": ToRefPath, "bLiteralArgs": False, "bPure": True},
     #####################################################################
     # Special functions
-    "*": {"funcExec": ToStruct, "bLiteralArgs": False},
-    "S": {"funcExec": AsString, "bLiteralArgs": True},
-    "Sb": {"funcExec": AsStringBackQuote, "bLiteralArgs": True},
-    "print": {"funcExec": Print, "bLiteralArgs": False},
-    "set-log-path": {"funcExec": SetLogPath, "bLiteralArgs": False},
+    "*": {"funcExec": ToStruct, "bLiteralArgs": False, "bPure": True},
+    "S": {"funcExec": AsString, "bLiteralArgs": True, "bPure": True},
+    "Sb": {"funcExec": AsStringBackQuote, "bLiteralArgs": True, "bPure": True},
+    "print": {"funcExec": Print, "bLiteralArgs": False, "bPure": False},
+    "set-log-path": {"funcExec": SetLogPath, "bLiteralArgs": False, "bPure": False},
 }
@@ -92,15 +92,14 @@ def ReadFile_Text(_xParser, _lArgs, _lArgIsProc, *, sFuncName):
 
     try:
         if pathFile.suffix in ["", ".json", ".json5", ".ison"]:
-            xData = io.LoadJson(pathFile)
+            pathFile = io.ResolveJsonPath(pathFile)
+            xData = _xParser.ReadFile(pathFile, bJson=True)
         else:
             if not pathFile.exists():
                 raise CParserError_FuncMessage(sFunc=sFuncName, sMsg="File not found: {}".format(pathFile.as_posix()))
             # endif
 
-            with open(pathFile, "r") as xFile:
-                xData = xFile.read()
-            # endwith
+            xData = _xParser.ReadFile(pathFile, bJson=False)
         # endif
     except Exception as xEx:
         raise CParserError_FuncMessage(
@@ -109,6 +108,8 @@ def ReadFile_Text(_xParser, _lArgs, _lArgIsProc, *, sFuncName):
         )
     # endtry
 
+    _xParser.AddFileDependency(pathFile)
+
     return xData, False
 
 
@@ -266,6 +267,8 @@ def DirectoryList(_xParser, _lArgs, _lArgIsProc, *, sFuncName):
         )
     # endtry
 
+    _xParser.AddFileDependency(pathDir)
+
     lPaths = glob(pathDir.as_posix(), recursive=True)
     if lPaths is not None:
         xResult = [io.ToNormPath(x) for x in lPaths]
@@ -381,8 +384,8 @@ def PathFuncGrp(_xParser, _lArgs, _lArgIsProc, *, sFuncName, lFuncParts):
 
 ################################################################################
 __ison_functions__ = {
-    "read": {"funcExec": ReadFile_Text, "bLiteralArgs": False},
-    "write": {"funcExec": WriteFile_Text, "bLiteralArgs": False},
-    "dir": {"funcExec": DirectoryList, "bLiteralArgs": False},
-    "path.*": {"funcExec": PathFuncGrp, "bLiteralArgs": False},
+    "read": {"funcExec": ReadFile_Text, "bLiteralArgs": False, "bPure": False, "bRecordsDeps": True},
+    "write": {"funcExec": WriteFile_Text, "bLiteralArgs": False, "bPure": False},
+    "dir": {"funcExec": DirectoryList, "bLiteralArgs": False, "bPure": False, "bRecordsDeps": True},
+    "path.*": {"funcExec": PathFuncGrp, "bLiteralArgs": False, "bPure": True},
 }
@@ -952,10 +952,10 @@ def RandomFuncGrp(
 
 ################################################################################
 __ison_functions__ = {
-    "sum": {"funcExec": SumValues, "bLiteralArgs": False},
-    "sub": {"funcExec": SubValues, "bLiteralArgs": False},
-    "div": {"funcExec": DivValues, "bLiteralArgs": False},
-    "prod": {"funcExec": ProdValues, "bLiteralArgs": False},
-    "mod": {"funcExec": ModValues, "bLiteralArgs": False},
-    "rand.*": {"funcExec": RandomFuncGrp, "bLiteralArgs": False},
+    "sum": {"funcExec": SumValues, "bLiteralArgs": False, "bPure": True},
+    "sub": {"funcExec": SubValues, "bLiteralArgs": False, "bPure": True},
+    "div": {"funcExec": DivValues, "bLiteralArgs": False, "bPure": True},
+    "prod": {"funcExec": ProdValues, "bLiteralArgs": False, "bPure": True},
+    "mod": {"funcExec": ModValues, "bLiteralArgs": False, "bPure": True},
+    "rand.*": {"funcExec": RandomFuncGrp, "bLiteralArgs": False, "bPure": False},
 }
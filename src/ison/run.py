@@ -27,9 +27,17 @@
 
 import os
 import sys
+import copy
+import glob
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor
 
 from .core.cls_parser import CParser as Parser
 from .core.cls_parser_error import CParserError
+from .core.cls_prepared_doc import CPreparedDocument
+from .core.cls_server import CServer
+from .core.cls_client import CClient
 from .util import io, text, data
 from pathlib import Path
 
@@ -43,7 +51,24 @@ def ToString(_dicData: dict, iIndent=4):
 
 
 ######################################################################
-def Run(*, xData, dicConstVars={}, sResultKey=None, bStripVars=True, sImportPath=None, bPrintWarnings=False):
+# Process the data and return the result. If 'lSelectPaths' is given, only the elements at these paths,
+# like 'a/b', and the elements they depend on are processed, and the result only contains the selected
+# elements. If a result key is given, only that element is processed and the paths are relative to it.
+def Run(
+    *,
+    xData,
+    dicConstVars={},
+    sResultKey=None,
+    lSelectPaths=None,
+    bStripVars=True,
+    sImportPath=None,
+    bPrintWarnings=False,
+    bLazyVars=False,
+    bExprVM=False,
+    iMaxWorkers=None,
+    bParallelKeys=False,
+    bCacheReads=True,
+):
 
     try:
         if isinstance(xData, str):
@@ -52,61 +77,731 @@ def Run(*, xData, dicConstVars={}, sResultKey=None, bStripVars=True, sImportPath
             dicData = xData
         # endif
 
-        xParse = Parser(dicConstVars)
-        xResult = xParse.Process(dicData, sImportPath=sImportPath)
+        xParse = Parser(
+            dicConstVars,
+            bLazyVars=bLazyVars,
+            bExprVM=bExprVM,
+            iMaxWorkers=iMaxWorkers,
+            bParallelKeys=bParallelKeys,
+            bCacheReads=bCacheReads,
+        )
+        return _RunParser(xParse, dicData, sResultKey, lSelectPaths, bStripVars, sImportPath, bPrintWarnings)
+
+    except Exception as xEx:
+        raise _ToRunError(xEx)
+    # endtry
+
+
+# enddef
 
-        xWarnings = xParse.GetWarnings()
-        if bPrintWarnings is True and xWarnings.bHasWarnings is True:
-            sys.stderr.write("WARNINGS:\n")
-            sys.stderr.write(str(xWarnings))
-            sys.stderr.flush()
+
+######################################################################
+# Process the data with the given parser and return the selected result
+def _RunParser(xParse, dicData, sResultKey, lSelectPaths, bStripVars, sImportPath, bPrintWarnings):
+    xResult = xParse.Process(
+        dicData, sImportPath=sImportPath, lSelectPaths=data.MakeSelectPaths(sResultKey, lSelectPaths)
+    )
+
+    xWarnings = xParse.GetWarnings()
+    if bPrintWarnings is True and xWarnings.bHasWarnings is True:
+        sys.stderr.write("WARNINGS:\n")
+        sys.stderr.write(str(xWarnings))
+        sys.stderr.flush()
+    # endif
+
+    return _SelectResult(xResult, sResultKey, bStripVars)
+
+
+# enddef
+
+
+######################################################################
+def _ToRunError(xEx):
+    if isinstance(xEx, CParserError):
+        sText = xEx.ToString()
+    else:
+        sText = str(xEx)
+    # endif
+
+    return RuntimeError("Error running ISON parser:\n{}".format(sText))
+
+
+# enddef
+
+
+######################################################################
+# Process the elements of a JSON list, or the lines of an NDJSON file, one after the other
+# and yield their results, so that only one element is held in memory at a time.
+# 'xInput' is a filename, a text or binary stream, or an iterable of decoded elements.
+# A file with the extension '.ndjson' or '.jsonl' is read as NDJSON, if 'bLines' is None.
+# All other files and streams are read as JSON list, unless 'bLines' is True.
+# A list is decoded as JSON5, if 'bJson5' is True, or if it is None and the file has the extension
+# '.json5' or '.ison'. Streams are decoded as standard JSON by default, which is faster.
+# If the first element only has keys that start with '__', like '__globals__' or '__includes__',
+# it is the header of all elements and is processed only once (see CParser.ProcessEach()).
+def RunStream(
+    *,
+    xInput,
+    dicConstVars={},
+    sResultKey=None,
+    bStripVars=True,
+    sImportPath=None,
+    bLines=None,
+    bJson5=None,
+    bPrintWarnings=False,
+    bLazyVars=False,
+    bExprVM=False,
+    iMaxWorkers=None,
+    bCacheReads=True,
+):
+    xFile = None
+    if isinstance(xInput, (str, Path)):
+        pathFile = Path(io.ToAbsPath(str(xInput)))
+        if bLines is None:
+            bLines = pathFile.suffix in [".ndjson", ".jsonl"]
         # endif
+        if bJson5 is None:
+            bJson5 = pathFile.suffix in [".json5", ".ison"]
+        # endif
+        if sImportPath is None:
+            sImportPath = pathFile.parent.as_posix()
+        # endif
+        xInput = xFile = open(pathFile, "r")
+    # endif
 
-        if sResultKey is not None:
-            if not isinstance(xResult, dict):
-                raise RuntimeError(
-                    "Result key '{}' given, but result is not a dictionary:\n{}".format(
-                        sResultKey, io.encode_json(xResult, iIndent=4)
-                    )
+    try:
+        if not hasattr(xInput, "read"):
+            iterData = xInput
+        elif bLines is True:
+            iterData = io.decode_ndjson_io(xInput)
+        else:
+            iterData = io.decode_json_list_io(xInput, bJson5=bJson5 is True)
+        # endif
+
+        xParse = Parser(
+            dicConstVars, bLazyVars=bLazyVars, bExprVM=bExprVM, iMaxWorkers=iMaxWorkers, bCacheReads=bCacheReads
+        )
+
+        iIdx = 0
+        iterResults = xParse.ProcessEach(iterData, sImportPath=sImportPath)
+        while True:
+            try:
+                xResult = next(iterResults)
+
+                xWarnings = xParse.GetWarnings()
+                if bPrintWarnings is True and xWarnings.bHasWarnings is True:
+                    sys.stderr.write("WARNINGS of element {}:\n".format(iIdx))
+                    sys.stderr.write(str(xWarnings))
+                    sys.stderr.flush()
+                # endif
+
+                xResult = _SelectResult(xResult, sResultKey, bStripVars)
+
+            except StopIteration:
+                break
+
+            except Exception as xEx:
+                if isinstance(xEx, CParserError):
+                    sText = xEx.ToString()
+                else:
+                    sText = str(xEx)
+                # endif
+
+                sMsg = "Error running ISON parser on element {}:\n{}".format(iIdx, sText)
+                raise RuntimeError(sMsg)
+            # endtry
+
+            yield xResult
+            iIdx += 1
+        # endwhile
+
+    finally:
+        if xFile is not None:
+            xFile.close()
+        # endif
+    # endtry
+
+
+# enddef
+
+
+######################################################################
+def _SelectResult(xResult, sResultKey, bStripVars):
+    if sResultKey is not None:
+        if not isinstance(xResult, dict):
+            raise RuntimeError(
+                "Result key '{}' given, but result is not a dictionary:\n{}".format(
+                    sResultKey, io.encode_json(xResult, iIndent=4)
                 )
-            # endif
+            )
+        # endif
 
-            if sResultKey not in xResult:
-                raise RuntimeError(
-                    "Result key '{}' not found in result:\n{}".format(
-                        sResultKey, io.encode_json(xResult, iIndent=4)
-                    )
+        if sResultKey not in xResult:
+            raise RuntimeError(
+                "Result key '{}' not found in result:\n{}".format(
+                    sResultKey, io.encode_json(xResult, iIndent=4)
                 )
+            )
+        # endif
+
+        xResult = xResult[sResultKey]
+    # endif
+
+    # strip all variable definition blocks from result data
+    # if flag is set.
+    if bStripVars is True and isinstance(xResult, dict):
+        xResult = data.StripVarsFromData(xResult)
+    # endif
+
+    return xResult
+
+
+# enddef
+
+
+######################################################################
+# Write the result to the file or to stdout. The JSON text is written while the result is walked,
+# so it is never held in memory as a whole. If 'bStripVars' is True, the variable definitions of
+# a dictionary result are left out while writing, as with _SelectResult().
+def _WriteResult(xResult, sFilenameOut, iIndent, bStripVars=False):
+    if not isinstance(xResult, str):
+        io.encode_json_stream(
+            xResult, sFilenameOut, iIndent=iIndent, bStripVars=bStripVars and isinstance(xResult, dict)
+        )
+
+    elif sFilenameOut is not None:
+        with open(sFilenameOut, "w") as xFile:
+            xFile.write(xResult)
+        # endwith
+
+    else:
+        # print to stdout
+        sys.stdout.write(xResult)
+        sys.stdout.flush()
+    # endif
+
+
+# enddef
+
+
+######################################################################
+# Write the results of RunStream() to the file or to stdout, as JSON list or as NDJSON.
+def _WriteStream(iterResults, sFilenameOut, iIndent, bLines):
+    xFile = sys.stdout if sFilenameOut is None else open(sFilenameOut, "w")
+    try:
+        if bLines is True:
+            io.encode_ndjson_io(iterResults, xFile)
+        else:
+            io.encode_json_list_io(iterResults, xFile, iIndent=iIndent)
+        # endif
+        xFile.flush()
+    finally:
+        if xFile is not sys.stdout:
+            xFile.close()
+        # endif
+    # endtry
+
+
+# enddef
+
+
+######################################################################
+# Process the input file, write the result, and process it again whenever the input file,
+# one of its include files or a file read by '$read' or listed by '$dir' changes.
+# Files are watched by polling their modification time and size every 'fPollInterval' seconds.
+# A change of an include or read file only processes the top level elements again, that depend
+# on it (see CParser.Reprocess()). The time of each build is written to 'xLogStream'.
+# Errors are reported and the files are watched further. Returns after 'iMaxBuilds' builds,
+# if given, or when interrupted.
+def Watch(
+    *,
+    sFileIn,
+    sFileOut=None,
+    dicConstVars={},
+    sResultKey=None,
+    bStripVars=True,
+    iIndent=-1,
+    bLazyVars=False,
+    bExprVM=False,
+    iMaxWorkers=None,
+    fPollInterval=0.5,
+    iMaxBuilds=None,
+    xLogStream=sys.stderr,
+    bCacheReads=True,
+):
+    pathFileIn = Path(io.ToAbsPath(sFileIn))
+    sFpIn = pathFileIn.as_posix()
+    sImportPath = pathFileIn.parent.as_posix()
+
+    xParse = Parser(
+        dicConstVars,
+        bLazyVars=bLazyVars,
+        bExprVM=bExprVM,
+        iMaxWorkers=iMaxWorkers,
+        bTrackDeps=True,
+        bCacheReads=bCacheReads,
+    )
+
+    iBuildCnt = 0
+    lChangedFiles = []
+    dicStamps = {sFpIn: io.GetFileStamp(sFpIn)}
+    # The input file is loaded again after an error, as it may be the cause
+    bReload = True
+    try:
+        while True:
+            dtStart = time.perf_counter()
+            bOk = True
+            try:
+                if bReload is True or sFpIn in lChangedFiles:
+                    with open(sFpIn, "r") as xFile:
+                        xData = io.decode_json(xFile.read())
+                    # endwith
+                    xResult = xParse.Process(xData, sImportPath=sImportPath)
+                else:
+                    xResult = xParse.Reprocess(lChangedFiles=lChangedFiles)
+                # endif
+
+                _WriteResult(_SelectResult(xResult, sResultKey, False), sFileOut, iIndent, bStripVars)
+                dtBuild = time.perf_counter() - dtStart
+                xLogStream.write("Built '{}' in {:.1f} ms\n".format(sFileOut or "<stdout>", dtBuild * 1e3))
+
+            except Exception as xEx:
+                bOk = False
+                if isinstance(xEx, CParserError):
+                    sText = xEx.ToString()
+                else:
+                    sText = str(xEx)
+                # endif
+                xLogStream.write("Error running ISON parser:\n{}\n".format(sText))
+            # endtry
+            xLogStream.flush()
+            bReload = not bOk
+
+            iBuildCnt += 1
+            if iMaxBuilds is not None and iBuildCnt >= iMaxBuilds:
+                break
             # endif
 
-            xResult = xResult[sResultKey]
+            # After an error, the dependencies are incomplete, so the previous files are watched as well.
+            # Files that were watched during the build keep their stamps from before the build, and
+            # new dependencies get the stamps from when they were first read, so that changes during
+            # the build are not missed.
+            setFiles = set([sFpIn])
+            setFiles.update(xParse.GetFileDependencies())
+            if bOk is False:
+                setFiles.update(dicStamps.keys())
+            # endif
+            dicReadStamps = xParse.GetFileStamps()
+            dicNewStamps = {}
+            for sFile in setFiles:
+                if sFile in dicStamps:
+                    dicNewStamps[sFile] = dicStamps[sFile]
+                elif sFile in dicReadStamps:
+                    dicNewStamps[sFile] = dicReadStamps[sFile]
+                else:
+                    dicNewStamps[sFile] = io.GetFileStamp(sFile)
+                # endif
+            # endfor
+            dicStamps = dicNewStamps
+
+            lChangedFiles = []
+            while len(lChangedFiles) == 0:
+                time.sleep(fPollInterval)
+                for sFile, tStamp in dicStamps.items():
+                    tNewStamp = io.GetFileStamp(sFile)
+                    if tNewStamp != tStamp:
+                        dicStamps[sFile] = tNewStamp
+                        lChangedFiles.append(sFile)
+                    # endif
+                # endfor
+            # endwhile
+        # endwhile
+    except KeyboardInterrupt:
+        pass
+    # endtry
+
+    return iBuildCnt
+
+
+# enddef
+
+
+######################################################################
+# Prepare the data for repeated processing with different constant variables.
+# See CPreparedDocument.Execute().
+def Prepare(xData, *, sImportPath=None, bLazyVars=False, bExprVM=False, bFoldConstants=True) -> CPreparedDocument:
+    return CPreparedDocument(
+        xData, sImportPath=sImportPath, bLazyVars=bLazyVars, bExprVM=bExprVM, bFoldConstants=bFoldConstants
+    )
+
+
+# enddef
+
+
+######################################################################
+# Returns the absolute paths of the documents given by a list of files, by a glob pattern or by
+# a list file, which contains one path per line. A '.json', '.json5' or '.ison' file is a document itself.
+# Empty lines and lines starting with '#' are ignored in a list file. Relative paths are relative to the
+# current working directory.
+def GetDocumentFiles(xFiles):
+    if isinstance(xFiles, (list, tuple)):
+        lFiles = [str(x) for x in xFiles]
+
+    elif glob.has_magic(str(xFiles)):
+        lFiles = sorted(glob.glob(io.ToAbsPath(str(xFiles)), recursive=True))
+
+    elif Path(xFiles).suffix in [".json", ".json5", ".ison"]:
+        lFiles = [str(xFiles)]
+
+    else:
+        with open(io.ToAbsPath(str(xFiles)), "r") as xFile:
+            lFiles = [x.strip() for x in xFile.read().splitlines()]
+        # endwith
+        lFiles = [x for x in lFiles if len(x) > 0 and not x.startswith("#")]
+    # endif
+
+    return [Path(io.ToAbsPath(x)).as_posix() for x in lFiles]
+
+
+# enddef
+
+
+######################################################################
+# Returns the output file of each document in the output directory. The folders of the documents
+# relative to their common folder are created in the output directory, and each output file has the
+# name of its document with the extension '.json'.
+def _GetOutputFiles(lFiles, sOutDir):
+    if len(lFiles) == 0:
+        return []
+    # endif
+
+    sBaseDir = os.path.commonpath([os.path.dirname(x) for x in lFiles])
+    pathOutDir = Path(io.ToAbsPath(sOutDir))
+    dicOutFiles = {}
+    for sFile in lFiles:
+        pathRel = Path(os.path.relpath(sFile, sBaseDir))
+        sFileOut = (pathOutDir / pathRel.parent / (pathRel.stem + ".json")).as_posix()
+        if sFileOut in dicOutFiles:
+            raise RuntimeError(
+                "Documents '{}' and '{}' have the same output file '{}'".format(dicOutFiles[sFileOut], sFile, sFileOut)
+            )
         # endif
+        dicOutFiles[sFileOut] = sFile
+    # endfor
+
+    return list(dicOutFiles.keys())
+
+
+# enddef
+
+
+# The parser of a RunMany() worker process, created once by _InitRunManyWorker()
+_xRunManyParser = None
+
+
+######################################################################
+# The parser is reused for all documents, so that the function table and the cache of read files
+# are only created once. Its variables are reset for each document.
+def _CreateRunManyParser(dicArgs):
+    return Parser(
+        {},
+        bLazyVars=dicArgs["bLazyVars"],
+        bExprVM=dicArgs["bExprVM"],
+        iMaxWorkers=1,
+        bCacheReads=dicArgs["bCacheReads"],
+    )
+
+
+# enddef
+
+
+######################################################################
+def _InitRunManyWorker(dicArgs):
+    global _xRunManyParser
+    _xRunManyParser = _CreateRunManyParser(dicArgs)
+
+
+# enddef
+
+
+######################################################################
+def _RunManyWorkerDocument(sFileIn, sFileOut, dicArgs):
+    return _RunManyDocument(sFileIn, sFileOut, dicArgs, _xRunManyParser)
+
+
+# enddef
+
+
+######################################################################
+# Process a document of RunMany(). Returns the error message, if any, the result, if it is not
+# written to a file, and the duration. Parallel calls of the document are not distributed further,
+# as the documents are already processed in parallel.
+def _RunManyDocument(sFileIn, sFileOut, dicArgs, xParse):
+    dtStart = time.perf_counter()
+    sError = None
+    xResult = None
+    try:
+        pathFileIn = Path(sFileIn)
+        try:
+            with open(sFileIn, "r") as xFile:
+                xData = io.decode_json(xFile.read())
+            # endwith
+        except Exception as xEx:
+            raise RuntimeError("Error loading file '{}' as json/json5\n{}".format(sFileIn, str(xEx)))
+        # endtry
 
-        # strip all variable definition blocks from result data
-        # if flag is set.
-        if bStripVars is True and isinstance(xResult, dict):
-            xResult = data.StripVarsFromData(xResult)
+        dicConstVars = dicArgs["dicConstVars"]
+        if dicArgs["bFileVars"] is True:
+            dicConstVars = copy.deepcopy(dicConstVars)
+            dicConstVars.setdefault("run", {})["file"] = _GetFileVars(pathFileIn)
         # endif
 
-        return xResult
+        try:
+            xParse.ResetVariables(dicConstVars)
+            xResult = _RunParser(
+                xParse,
+                xData,
+                dicArgs["sResultKey"],
+                dicArgs["lSelectPaths"],
+                dicArgs["bStripVars"] and sFileOut is None,
+                pathFileIn.parent.as_posix(),
+                False,
+            )
+        except Exception as xEx:
+            raise _ToRunError(xEx)
+        # endtry
 
-    except Exception as xEx:
-        if isinstance(xEx, CParserError):
-            sText = xEx.ToString()
-        else:
-            sText = str(xEx)
+        if sFileOut is not None:
+            os.makedirs(os.path.dirname(sFileOut), exist_ok=True)
+            _WriteResult(xResult, sFileOut, dicArgs["iIndent"], dicArgs["bStripVars"])
+            xResult = None
         # endif
 
-        sMsg = "Error running ISON parser:\n{}".format(sText)
-        raise RuntimeError(sMsg)
+    except Exception as xEx:
+        sError = str(xEx)
+    # endtry
+
+    return sError, xResult, time.perf_counter() - dtStart
+
+
+# enddef
+
+
+######################################################################
+# Process many documents on a pool of worker processes. The documents are given as for
+# GetDocumentFiles(). Each worker processes many documents with one parser, so the interpreter start,
+# the imports, the function table and the caches of include files, read files and parsed expressions
+# are shared by its documents.
+# If an output directory is given, the results are written to it (see _GetOutputFiles()).
+# Otherwise, they are returned. An error of a document does not stop the other documents.
+# If 'bFileVars' is True, the variable 'run:file' is set to the file of each document, like the CLI does.
+# Errors and a summary are written to 'xLogStream', if given.
+# Returns a dictionary with the file, the result, the error message and the duration of each document
+# in 'lDocs', and the number of documents, of errors, the total duration and the documents per second.
+def RunMany(
+    *,
+    xFiles,
+    sOutDir=None,
+    dicConstVars={},
+    sResultKey=None,
+    lSelectPaths=None,
+    bStripVars=True,
+    iIndent=-1,
+    bLazyVars=False,
+    bExprVM=False,
+    bCacheReads=True,
+    bFileVars=False,
+    iMaxWorkers=None,
+    xLogStream=None,
+):
+    dtStart = time.perf_counter()
+
+    lFiles = GetDocumentFiles(xFiles)
+    iDocCnt = len(lFiles)
+    if sOutDir is None:
+        lFilesOut = [None] * iDocCnt
+    else:
+        lFilesOut = _GetOutputFiles(lFiles, sOutDir)
+    # endif
+
+    dicArgs = {
+        "dicConstVars": dicConstVars,
+        "sResultKey": sResultKey,
+        "lSelectPaths": lSelectPaths,
+        "bStripVars": bStripVars,
+        "iIndent": iIndent,
+        "bLazyVars": bLazyVars,
+        "bExprVM": bExprVM,
+        "bCacheReads": bCacheReads,
+        "bFileVars": bFileVars,
+    }
+
+    if iMaxWorkers is None:
+        iMaxWorkers = os.cpu_count() or 1
+    # endif
+    iWorkerCnt = max(1, min(iMaxWorkers, iDocCnt))
+
+    lDocs = []
+    iErrorCnt = 0
+    if iWorkerCnt <= 1:
+        xParse = _CreateRunManyParser(dicArgs)
+        iterResults = map(_RunManyDocument, lFiles, lFilesOut, [dicArgs] * iDocCnt, [xParse] * iDocCnt)
+        xExecutor = None
+    else:
+        # Several chunks per worker balance the load
+        iChunkSize = max(1, math.ceil(iDocCnt / (4 * iWorkerCnt)))
+        xExecutor = ProcessPoolExecutor(iWorkerCnt, initializer=_InitRunManyWorker, initargs=(dicArgs,))
+        iterResults = xExecutor.map(
+            _RunManyWorkerDocument, lFiles, lFilesOut, [dicArgs] * iDocCnt, chunksize=iChunkSize
+        )
+    # endif
+
+    try:
+        for sFileIn, sFileOut, tDocResult in zip(lFiles, lFilesOut, iterResults):
+            sError, xResult, dtDoc = tDocResult
+            lDocs.append(
+                {"sFileIn": sFileIn, "sFileOut": sFileOut, "xResult": xResult, "sError": sError, "fDuration": dtDoc}
+            )
+            if sError is not None:
+                iErrorCnt += 1
+                if xLogStream is not None:
+                    xLogStream.write("Error processing '{}':\n{}\n".format(sFileIn, sError))
+                    xLogStream.flush()
+                # endif
+            # endif
+        # endfor
+    finally:
+        if xExecutor is not None:
+            xExecutor.shutdown()
+        # endif
     # endtry
 
+    dtTotal = time.perf_counter() - dtStart
+    fDocsPerSec = iDocCnt / dtTotal if dtTotal > 0.0 else 0.0
+    if xLogStream is not None:
+        xLogStream.write(
+            "Processed {} documents with {} worker(s) in {:.2f} s ({:.1f} documents/s), {} failed\n".format(
+                iDocCnt, iWorkerCnt, dtTotal, fDocsPerSec, iErrorCnt
+            )
+        )
+        xLogStream.flush()
+    # endif
+
+    return {
+        "lDocs": lDocs,
+        "iDocCnt": iDocCnt,
+        "iErrorCnt": iErrorCnt,
+        "fDuration": dtTotal,
+        "fDocsPerSec": fDocsPerSec,
+    }
+
+
+# enddef
+
+
+######################################################################
+# Run an ISON server on the unix socket, until it is shut down by a client or interrupted (see CServer).
+# The given document files are prepared, before the worker processes are forked.
+def Serve(
+    *,
+    sSocketPath,
+    iWorkers=0,
+    lPreloadFiles=None,
+    bLazyVars=False,
+    bExprVM=False,
+    iMaxDocs=256,
+    xLogStream=sys.stderr,
+):
+    xServer = CServer(
+        sSocketPath, iWorkers=iWorkers, bLazyVars=bLazyVars, bExprVM=bExprVM, iMaxDocs=iMaxDocs, xLogStream=xLogStream
+    )
+    if lPreloadFiles is not None:
+        xServer.Preload(lPreloadFiles)
+    # endif
+    xServer.Start()
+    xServer.ServeForever()
+
+
+# enddef
+
+
+######################################################################
+# Returns the file variables of the input file, or of stdin, if no file is given.
+def _GetFileVars(pathFileIn):
+    if pathFileIn is None:
+        return {"source": "stdin"}
+    # endif
+
+    return {
+        "source": "local",
+        "path": pathFileIn.as_posix(),
+        "dir": pathFileIn.parent.as_posix(),
+        "folder": pathFileIn.parent.name,
+        "ext": pathFileIn.suffix,
+        "name": pathFileIn.name,
+        "basename": pathFileIn.stem,
+    }
+
+
+# enddef
+
+
+######################################################################
+# Returns the constant variables of the command line, with the arguments given with '--args'
+# in 'run:args' and 'run:kwargs'. An argument value '-' is read from stdin.
+def _MakeRunVars(lVarArgs, pathFileIn, bUsesStdIn):
+    dicConstVars = {}
+    dicRun = dicConstVars["run"] = {}
+    lVars = dicRun["args"] = []
+    dicVars = dicRun["kwargs"] = {}
+    dicRun["file"] = _GetFileVars(pathFileIn)
+    dicRun["cwd"] = os.getcwd()
+
+    if lVarArgs is not None:
+
+        for iIdx, sVar in enumerate(lVarArgs):
+            lParts = text.SplitArgs(sVar, sSplitChar="=")[0]
+
+            if len(lParts) == 1:
+                sKey = None
+                sValue = lParts[0].strip(" '")
+            else:
+                sKey = lParts[0].strip(" '")
+                sValue = lParts[1].strip(" '")
+            # endif
+
+            if sValue == "-":
+                if bUsesStdIn is True:
+                    raise RuntimeError("'<stdin>' already used to read ison file")
+                # endif
+
+                sValue = sys.stdin.read()
+            # endif
+
+            if sKey is None:
+                lVars.append(sValue)
+            else:
+                dicVars[sKey] = sValue
+            # endif
+        # endfor
+    # endif
+
+    return dicConstVars
+
 
 # enddef
 
 
 ######################################################################
 def RunCli():
+    if len(sys.argv) > 1 and sys.argv[1] == "batch":
+        return RunBatchCli(sys.argv[2:])
+    elif len(sys.argv) > 1 and sys.argv[1] == "serve":
+        return RunServeCli(sys.argv[2:])
+    elif len(sys.argv) > 1 and sys.argv[1] == "client":
+        return RunClientCli(sys.argv[2:])
+    # endif
+
     try:
         import argparse
 
@@ -132,7 +827,81 @@ def RunCli():
         xArgParse.add_argument(
             "-r", "--result-key", nargs=1, dest="reskey", default=None
         )
+        xArgParse.add_argument(
+            "--select",
+            dest="select",
+            action="append",
+            default=None,
+            help="Only process the element at the given path, like 'a/b', and the elements it depends on. "
+            "Can be given several times. The paths are relative to the result key, if one is given.",
+        )
         xArgParse.add_argument("--strip-vars", dest="stripvars", action="store_true")
+        xArgParse.add_argument(
+            "--lazy-vars",
+            dest="lazyvars",
+            action="store_true",
+            help="Only evaluate variables when they are referenced. "
+            "Variables that are never referenced, are not evaluated.",
+        )
+        xArgParse.add_argument(
+            "--expr-vm",
+            dest="exprvm",
+            action="store_true",
+            help="Compile expressions and execute them with the expression VM.",
+        )
+        xArgParse.add_argument(
+            "--workers",
+            nargs=1,
+            dest="workers",
+            default=None,
+            help="Maximal number of workers of parallel 'for each' calls. Defaults to the number of CPUs.",
+        )
+        xArgParse.add_argument(
+            "--parallel-keys",
+            dest="parallelkeys",
+            action="store_true",
+            help="Process the top level elements, that are independent of each other, in parallel worker processes.",
+        )
+        xArgParse.add_argument(
+            "--no-read-cache",
+            dest="readcache",
+            action="store_false",
+            help="Do not cache the files read with '$read'. Use this, if files are changed while they are processed.",
+        )
+        xArgParse.add_argument(
+            "--stream",
+            dest="stream",
+            action="store_true",
+            help="Process the elements of the top level list of the input, or the lines of an NDJSON input, one "
+            "after the other. A first element with only keys like '__globals__' is the header of all elements.",
+        )
+        xArgParse.add_argument(
+            "--ndjson",
+            dest="ndjson",
+            action="store_true",
+            help="With '--stream', read the input as NDJSON, also if it is no '.ndjson' or '.jsonl' file.",
+        )
+        xArgParse.add_argument(
+            "--json5",
+            dest="json5",
+            action="store_true",
+            help="With '--stream', read the list from stdin as JSON5. "
+            "Lists in '.json5' and '.ison' files are always read as JSON5, all others as standard JSON.",
+        )
+        xArgParse.add_argument(
+            "--watch",
+            dest="watch",
+            action="store_true",
+            help="Process the input file again, whenever it, one of its include files or a file read with "
+            "'$read' or listed with '$dir' changes. The output file is rewritten after each change.",
+        )
+        xArgParse.add_argument(
+            "--watch-interval",
+            nargs=1,
+            dest="watchinterval",
+            default=None,
+            help="Interval in seconds in which the watched files are polled. Defaults to 0.5.",
+        )
         xArgParse.add_argument("-a", "--args", nargs="*", dest="vars")
         xArgs = xArgParse.parse_args()
 
@@ -148,89 +917,81 @@ def RunCli():
             )
         # endtry
 
+        try:
+            if xArgs.workers is None:
+                iMaxWorkers = None
+            else:
+                iMaxWorkers = int(xArgs.workers[0])
+            # endif
+        except Exception:
+            raise RuntimeError(
+                "Given number of workers '{}' is not an integer".format(xArgs.workers)
+            )
+        # endtry
+
+        try:
+            if xArgs.watchinterval is None:
+                fWatchInterval = 0.5
+            else:
+                fWatchInterval = float(xArgs.watchinterval[0])
+            # endif
+        except Exception:
+            raise RuntimeError(
+                "Given watch interval '{}' is not a number".format(xArgs.watchinterval)
+            )
+        # endtry
+
         sFilenameOut = xArgs.filename_out
         if sFilenameOut == "-":
             sFilenameOut = None
         # endif
 
+        if xArgs.watch is True and xArgs.filename_in == "-":
+            raise RuntimeError("An input file has to be given to watch it")
+        # endif
+
+        if xArgs.watch is True and xArgs.stream is True:
+            raise RuntimeError("Options '--watch' and '--stream' cannot be combined")
+        # endif
+
+        if xArgs.select is not None and (xArgs.watch is True or xArgs.stream is True):
+            raise RuntimeError("Option '--select' cannot be combined with '--watch' or '--stream'")
+        # endif
+
         try:
-            sTextIn = None
+            # In stream mode, the input is read while it is processed
+            xData = None
             bUsesStdIn = False
             sFpIn = xArgs.filename_in
             if sFpIn == "-":
                 bUsesStdIn = True
                 sFpIn = "<stdin>"
-                sTextIn = sys.stdin.read()
+                if xArgs.stream is False:
+                    xData = io.decode_json(sys.stdin.read())
+                # endif
             else:
                 pathFileIn = Path(io.ToAbsPath(sFpIn))
                 sFpIn = pathFileIn.as_posix()
                 if not pathFileIn.exists():
                     raise RuntimeError("Input file '{}' does not exist".format(sFpIn))
                 # endif
-                with open(sFpIn, "r") as xFile:
-                    sTextIn = xFile.read()
-                # endwith
+                if xArgs.stream is False:
+                    with open(sFpIn, "r") as xFile:
+                        xData = io.decode_json(xFile.read())
+                    # endwith
+                # endif
             # endif
-            xData = io.decode_json(sTextIn)
         except Exception as xEx:
             raise RuntimeError(
                 "Error loading file '{}' as json/json5\n{}".format(sFpIn, str(xEx))
             )
         # endtry
 
-        dicConstVars = {}
-        dicRun = dicConstVars["run"] = {}
-        lVars = dicRun["args"] = []
-        dicVars = dicRun["kwargs"] = {}
-        dicFile = dicRun["file"] = {}
-
-        dicRun["cwd"] = os.getcwd()
-
         sImportPath = None
-        if bUsesStdIn is True:
-            dicFile["source"] = "stdin"
-
-        else:
+        if bUsesStdIn is False:
             sImportPath = pathFileIn.parent.as_posix()
-            dicFile = {
-                "source": "local",
-                "path": pathFileIn.as_posix(),
-                "dir": pathFileIn.parent.as_posix(),
-                "folder": pathFileIn.parent.name,
-                "ext": pathFileIn.suffix,
-                "name": pathFileIn.name,
-                "basename": pathFileIn.stem,
-            }
-        # endif
-
-        if xArgs.vars is not None:
-
-            for iIdx, sVar in enumerate(xArgs.vars):
-                lParts = text.SplitArgs(sVar, sSplitChar="=")[0]
-
-                if len(lParts) == 1:
-                    sKey = None
-                    sValue = lParts[0].strip(" '")
-                else:
-                    sKey = lParts[0].strip(" '")
-                    sValue = lParts[1].strip(" '")
-                # endif
-
-                if sValue == "-":
-                    if bUsesStdIn is True:
-                        raise RuntimeError("'<stdin>' already used to read ison file")
-                    # endif
-
-                    sValue = sys.stdin.read()
-                # endif
-
-                if sKey is None:
-                    lVars.append(sValue)
-                else:
-                    dicVars[sKey] = sValue
-                # endif
-            # endfor
         # endif
+        dicConstVars = _MakeRunVars(xArgs.vars, None if bUsesStdIn is True else pathFileIn, bUsesStdIn)
 
         if xArgs.reskey is not None:
             sResultKey = xArgs.reskey[0]
@@ -238,30 +999,314 @@ def RunCli():
             sResultKey = None
         # endif
 
+        if xArgs.stream is True:
+            bLines = True if xArgs.ndjson is True else None
+            bJson5 = True if xArgs.json5 is True else None
+            iterResults = RunStream(
+                xInput=sys.stdin if bUsesStdIn is True else sFpIn,
+                dicConstVars=dicConstVars,
+                sResultKey=sResultKey,
+                sImportPath=sImportPath,
+                bStripVars=xArgs.stripvars,
+                bLines=bLines,
+                bJson5=bJson5,
+                bLazyVars=xArgs.lazyvars,
+                bExprVM=xArgs.exprvm,
+                iMaxWorkers=iMaxWorkers,
+                bCacheReads=xArgs.readcache,
+            )
+            if bLines is None and bUsesStdIn is False:
+                bLines = Path(sFpIn).suffix in [".ndjson", ".jsonl"]
+            # endif
+            _WriteStream(iterResults, sFilenameOut, iIndent, bLines is True)
+            return 0
+        # endif
+
+        if xArgs.watch is True:
+            Watch(
+                sFileIn=sFpIn,
+                sFileOut=sFilenameOut,
+                dicConstVars=dicConstVars,
+                sResultKey=sResultKey,
+                bStripVars=xArgs.stripvars,
+                iIndent=iIndent,
+                bLazyVars=xArgs.lazyvars,
+                bExprVM=xArgs.exprvm,
+                iMaxWorkers=iMaxWorkers,
+                fPollInterval=fWatchInterval,
+                bCacheReads=xArgs.readcache,
+            )
+            return 0
+        # endif
+
         xResult = Run(
             xData=xData,
             dicConstVars=dicConstVars,
             sResultKey=sResultKey,
+            lSelectPaths=xArgs.select,
             sImportPath=sImportPath,
+            bStripVars=False,
+            bLazyVars=xArgs.lazyvars,
+            bExprVM=xArgs.exprvm,
+            iMaxWorkers=iMaxWorkers,
+            bParallelKeys=xArgs.parallelkeys,
+            bCacheReads=xArgs.readcache,
+        )
+
+        _WriteResult(xResult, sFilenameOut, iIndent, xArgs.stripvars)
+
+        return 0
+
+    except Exception as xEx:
+        sys.stderr.write(str(xEx))
+    # endtry
+
+    return 1
+
+
+# enddef
+
+
+######################################################################
+# Command line of the batch mode: 'ison batch <glob|list-file> --out-dir <dir> -j <workers>'
+def RunBatchCli(lArgs=None):
+    try:
+        import argparse
+
+        xArgParse = argparse.ArgumentParser(prog="ison batch", description="Run ISON parsing for many documents")
+
+        xArgParse.add_argument(
+            "files",
+            help="Glob pattern of the documents, like 'configs/**/*.json', or a file that lists one document per line.",
+        )
+        xArgParse.add_argument(
+            "-o", "--out-dir", nargs=1, dest="outdir", required=True, help="The directory to write the results to."
+        )
+        xArgParse.add_argument(
+            "-j",
+            "--jobs",
+            nargs=1,
+            dest="jobs",
+            default=None,
+            help="Number of worker processes. Defaults to the number of CPUs.",
+        )
+        xArgParse.add_argument("-i", "--indent-output", nargs=1, dest="indent", default=None)
+        xArgParse.add_argument("-r", "--result-key", nargs=1, dest="reskey", default=None)
+        xArgParse.add_argument(
+            "--select",
+            dest="select",
+            action="append",
+            default=None,
+            help="Only process the element at the given path, like 'a/b', and the elements it depends on.",
+        )
+        xArgParse.add_argument("--strip-vars", dest="stripvars", action="store_true")
+        xArgParse.add_argument("--lazy-vars", dest="lazyvars", action="store_true")
+        xArgParse.add_argument("--expr-vm", dest="exprvm", action="store_true")
+        xArgParse.add_argument("--no-read-cache", dest="readcache", action="store_false")
+        xArgParse.add_argument("-a", "--args", nargs="*", dest="vars")
+        xArgs = xArgParse.parse_args(lArgs)
+
+        try:
+            iIndent = -1 if xArgs.indent is None else int(xArgs.indent[0])
+        except Exception:
+            raise RuntimeError("Given indent '{}' is not an integer".format(xArgs.indent))
+        # endtry
+
+        try:
+            iMaxWorkers = None if xArgs.jobs is None else int(xArgs.jobs[0])
+        except Exception:
+            raise RuntimeError("Given number of jobs '{}' is not an integer".format(xArgs.jobs))
+        # endtry
+
+        dicResult = RunMany(
+            xFiles=xArgs.files,
+            sOutDir=xArgs.outdir[0],
+            dicConstVars=_MakeRunVars(xArgs.vars, None, False),
+            sResultKey=None if xArgs.reskey is None else xArgs.reskey[0],
+            lSelectPaths=xArgs.select,
             bStripVars=xArgs.stripvars,
+            iIndent=iIndent,
+            bLazyVars=xArgs.lazyvars,
+            bExprVM=xArgs.exprvm,
+            bCacheReads=xArgs.readcache,
+            bFileVars=True,
+            iMaxWorkers=iMaxWorkers,
+            xLogStream=sys.stderr,
         )
 
-        if isinstance(xResult, str):
-            sResult = xResult
-        else:
-            sResult = io.encode_json(xResult, iIndent=iIndent)
-        # endif
+        return 0 if dicResult["iErrorCnt"] == 0 else 1
 
-        if sFilenameOut is not None:
-            with open(sFilenameOut, "w") as xFile:
-                xFile.write(sResult)
-            # endwith
+    except Exception as xEx:
+        sys.stderr.write(str(xEx))
+    # endtry
 
-        else:
-            # print to stdout
-            sys.stdout.write(sResult)
+    return 1
+
+
+# enddef
+
+
+######################################################################
+# Command line of the server: 'ison serve --socket <path>'
+def RunServeCli(lArgs=None):
+    try:
+        import argparse
+
+        xArgParse = argparse.ArgumentParser(
+            prog="ison serve",
+            description="Run an ISON server, which processes the documents sent with 'ison client'",
+        )
+        xArgParse.add_argument("--socket", nargs=1, dest="socket", required=True, help="Path of the unix socket.")
+        xArgParse.add_argument(
+            "-j",
+            "--workers",
+            nargs=1,
+            dest="workers",
+            default=None,
+            help="Number of worker processes, which are forked after the server is prepared. "
+            "By default, the requests are processed in the server process.",
+        )
+        xArgParse.add_argument(
+            "--preload",
+            nargs="*",
+            dest="preload",
+            default=None,
+            help="Document files, which are prepared before the workers are forked.",
+        )
+        xArgParse.add_argument(
+            "--max-docs",
+            nargs=1,
+            dest="maxdocs",
+            default=None,
+            help="Maximal number of prepared documents kept by each process. Defaults to 256.",
+        )
+        xArgParse.add_argument("--lazy-vars", dest="lazyvars", action="store_true")
+        xArgParse.add_argument("--expr-vm", dest="exprvm", action="store_true")
+        xArgs = xArgParse.parse_args(lArgs)
+
+        try:
+            iWorkers = 0 if xArgs.workers is None else int(xArgs.workers[0])
+            iMaxDocs = 256 if xArgs.maxdocs is None else int(xArgs.maxdocs[0])
+        except Exception:
+            raise RuntimeError("Given number of workers or documents is not an integer")
+        # endtry
+
+        Serve(
+            sSocketPath=xArgs.socket[0],
+            iWorkers=iWorkers,
+            lPreloadFiles=xArgs.preload,
+            bLazyVars=xArgs.lazyvars,
+            bExprVM=xArgs.exprvm,
+            iMaxDocs=iMaxDocs,
+        )
+        return 0
+
+    except Exception as xEx:
+        sys.stderr.write(str(xEx))
+    # endtry
+
+    return 1
+
+
+# enddef
+
+
+######################################################################
+# Command line of the client: 'ison client --socket <path> [filename_in] [filename_out]'
+def RunClientCli(lArgs=None):
+    try:
+        import argparse
+
+        xArgParse = argparse.ArgumentParser(prog="ison client", description="Process a document on an ISON server")
+        xArgParse.add_argument(
+            "filename_in",
+            nargs="?",
+            default="-",
+            help="The file to parse. If not specified or set to '-', the document is read from stdin "
+            "and sent to the server. Otherwise, the server reads the file and keeps it prepared.",
+        )
+        xArgParse.add_argument(
+            "filename_out",
+            nargs="?",
+            default="-",
+            help="The file to write the output to. If not specified or set to '-' uses stdout",
+        )
+        xArgParse.add_argument("--socket", nargs=1, dest="socket", required=True, help="Path of the unix socket.")
+        xArgParse.add_argument("-i", "--indent-output", nargs=1, dest="indent", default=None)
+        xArgParse.add_argument("-r", "--result-key", nargs=1, dest="reskey", default=None)
+        xArgParse.add_argument(
+            "--select",
+            dest="select",
+            action="append",
+            default=None,
+            help="Only process the element at the given path, like 'a/b', and the elements it depends on.",
+        )
+        xArgParse.add_argument("--strip-vars", dest="stripvars", action="store_true")
+        xArgParse.add_argument(
+            "--timeout", nargs=1, dest="timeout", default=None, help="Timeout in seconds of the request."
+        )
+        xArgParse.add_argument(
+            "--command",
+            nargs=1,
+            dest="command",
+            default=None,
+            choices=["ping", "stats", "shutdown"],
+            help="Send a command to the server, instead of a document.",
+        )
+        xArgParse.add_argument("-a", "--args", nargs="*", dest="vars")
+        xArgs = xArgParse.parse_args(lArgs)
+
+        try:
+            iIndent = -1 if xArgs.indent is None else int(xArgs.indent[0])
+            fTimeout = None if xArgs.timeout is None else float(xArgs.timeout[0])
+        except Exception:
+            raise RuntimeError("Given indent or timeout is not a number")
+        # endtry
+
+        sFilenameOut = xArgs.filename_out
+        if sFilenameOut == "-":
+            sFilenameOut = None
         # endif
 
+        with CClient(xArgs.socket[0], fTimeout=fTimeout) as xClient:
+            if xArgs.command is not None:
+                dicResponse = xClient.Request({"sCmd": xArgs.command[0]})
+                if dicResponse.get("bOk") is not True:
+                    raise RuntimeError(dicResponse["dicError"]["sMessage"])
+                # endif
+                _WriteResult(dicResponse["xResult"], sFilenameOut, iIndent)
+                return 0
+            # endif
+
+            sFile = None
+            xData = None
+            sImportPath = None
+            pathFileIn = None
+            bUsesStdIn = xArgs.filename_in == "-"
+            if bUsesStdIn is True:
+                # Imports of a document read from stdin are relative to the working directory of the client
+                xData = sys.stdin.read()
+                sImportPath = Path(os.getcwd()).as_posix()
+            else:
+                pathFileIn = Path(io.ToAbsPath(xArgs.filename_in))
+                if not pathFileIn.exists():
+                    raise RuntimeError("Input file '{}' does not exist".format(pathFileIn.as_posix()))
+                # endif
+                sFile = pathFileIn.as_posix()
+            # endif
+
+            xResult = xClient.Run(
+                xData=xData,
+                sFile=sFile,
+                dicConstVars=_MakeRunVars(xArgs.vars, pathFileIn, bUsesStdIn),
+                sResultKey=None if xArgs.reskey is None else xArgs.reskey[0],
+                lSelectPaths=xArgs.select,
+                bStripVars=xArgs.stripvars,
+                sImportPath=sImportPath,
+            )
+        # endwith
+
+        _WriteResult(xResult, sFilenameOut, iIndent)
         return 0
 
     except Exception as xEx:
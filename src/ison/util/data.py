@@ -54,6 +54,9 @@ def RecursiveUpdateDict(_dicTrg, _dicSrc):
             and isinstance(_dicTrg[sSrcKey], dict)
             and isinstance(_dicSrc[sSrcKey], dict)
         ):
+            # The target element may be shared with a source dictionary
+            # of a previous update, so it is copied before it is changed.
+            _dicTrg[sSrcKey] = dict(_dicTrg[sSrcKey])
             RecursiveUpdateDict(_dicTrg[sSrcKey], _dicSrc[sSrcKey])
         else:
             _dicTrg[sSrcKey] = _dicSrc[sSrcKey]
@@ -64,7 +67,10 @@ def RecursiveUpdateDict(_dicTrg, _dicSrc):
 # enddef
 
 ################################################################################
-# update dictionary and potentially throw exception when overwriting a variable
+# update dictionary and potentially throw exception when overwriting a variable.
+# With 'bCopyOnWrite' set, the source elements are not copied but shared with the target.
+# Target sub-dictionaries are then copied before they are updated, so that
+# data that is shared with other dictionaries is never changed.
 def UpdateDict(
     _dicTrg,
     _dicSrc,
@@ -74,7 +80,12 @@ def UpdateDict(
     bPrintWarnings=True,
     bIgnoreSpecialVars=False,
     bCopyData=True,
+    bCopyOnWrite=False,
 ):
+    if bCopyOnWrite is True:
+        bCopyData = False
+    # endif
+
     for sId, xSrcEl in _dicSrc.items():
         if bIgnoreSpecialVars is True and sId.startswith("__"):
             continue
@@ -82,6 +93,10 @@ def UpdateDict(
 
         if sId in _dicTrg:
             if isinstance(_dicTrg[sId], dict) and isinstance(xSrcEl, dict):
+                if bCopyOnWrite is True:
+                    _dicTrg[sId] = dict(_dicTrg[sId])
+                # endif
+
                 # Recursively update dictionaries if they are present in source and target
                 UpdateDict(
                     _dicTrg[sId],
@@ -90,6 +105,7 @@ def UpdateDict(
                     bAllowOverwrite=bAllowOverwrite,
                     bThrowOnDisallow=bThrowOnDisallow,
                     bPrintWarnings=bPrintWarnings,
+                    bCopyOnWrite=bCopyOnWrite,
                 )
             else:
                 if bAllowOverwrite is False:
@@ -145,6 +161,7 @@ def AddVarsToData(
     bAllowOverwrite=False,
     bThrowOnDisallow=True,
     bPrintWarnings=True,
+    bCopyOnWrite=False,
 ):
     if isinstance(dicLocals, dict):
         if "__locals__" in _xData:
@@ -155,6 +172,7 @@ def AddVarsToData(
                 bAllowOverwrite=bAllowOverwrite,
                 bThrowOnDisallow=bThrowOnDisallow,
                 bPrintWarnings=bPrintWarnings,
+                bCopyOnWrite=bCopyOnWrite,
             )
         else:
             _xData["__locals__"] = dicLocals
@@ -170,6 +188,7 @@ def AddVarsToData(
                 bAllowOverwrite=bAllowOverwrite,
                 bThrowOnDisallow=bThrowOnDisallow,
                 bPrintWarnings=bPrintWarnings,
+                bCopyOnWrite=bCopyOnWrite,
             )
         else:
             _xData["__eval_locals__"] = dicEvalLocals
@@ -185,6 +204,7 @@ def AddVarsToData(
                 bAllowOverwrite=bAllowOverwrite,
                 bThrowOnDisallow=bThrowOnDisallow,
                 bPrintWarnings=bPrintWarnings,
+                bCopyOnWrite=bCopyOnWrite,
             )
         else:
             _xData["__globals__"] = dicGlobals
@@ -200,6 +220,7 @@ def AddVarsToData(
                 bAllowOverwrite=bAllowOverwrite,
                 bThrowOnDisallow=bThrowOnDisallow,
                 bPrintWarnings=bPrintWarnings,
+                bCopyOnWrite=bCopyOnWrite,
             )
         else:
             _xData["__eval_globals__"] = dicEvalGlobals
@@ -215,6 +236,7 @@ def AddVarsToData(
                 bAllowOverwrite=bAllowOverwrite,
                 bThrowOnDisallow=bThrowOnDisallow,
                 bPrintWarnings=bPrintWarnings,
+                bCopyOnWrite=bCopyOnWrite,
             )
         else:
             _xData["__func_globals__"] = dicFuncGlobals
@@ -230,6 +252,7 @@ def AddVarsToData(
                 bAllowOverwrite=bAllowOverwrite,
                 bThrowOnDisallow=bThrowOnDisallow,
                 bPrintWarnings=bPrintWarnings,
+                bCopyOnWrite=bCopyOnWrite,
             )
         else:
             _xData["__func_locals__"] = dicFuncLocals
@@ -342,19 +365,21 @@ def GetPlatformDict(_dicData):
 # enddef
 
 
+# Keys of the variable definition blocks, which are removed by StripVarsFromData()
+lVarKeys = [
+    "__globals__",
+    "__eval_globals__",
+    "__locals__",
+    "__eval_locals__",
+    "__func_globals__",
+    "__func_locals__",
+    "__runtime_vars__",
+]
+
+
 ################################################################################
 # Strip variables from dictionary recursively
 def StripVarsFromData(_xData):
-    lVarKeys = [
-        "__globals__",
-        "__eval_globals__",
-        "__locals__",
-        "__eval_locals__",
-        "__func_globals__",
-        "__func_locals__",
-        "__runtime_vars__",
-    ]
-
     if isinstance(_xData, dict):
         xResult = {}
         for sKey in _xData:
@@ -378,3 +403,238 @@ def StripVarsFromData(_xData):
 
 
 # enddef
+
+
+################################################################################
+# Returns the paths of the elements to process, as lists of keys, or None, if all elements are processed.
+# Paths given as strings, like 'a/b', are split at '/'. The paths are relative to the result key, if given.
+def MakeSelectPaths(_sResultKey: str, _lSelectPaths: list):
+    if _lSelectPaths is None:
+        return None if _sResultKey is None else [[_sResultKey]]
+    # endif
+
+    lPaths = [x.split("/") if isinstance(x, str) else list(x) for x in _lSelectPaths]
+    if _sResultKey is not None:
+        lPaths = [[_sResultKey] + x for x in lPaths]
+    # endif
+    return lPaths
+
+
+# enddef
+
+
+################################################################################
+# Get the part of the data along the given path of dictionary keys, as dictionary that only
+# contains the elements of the path. The part of the data at the end of the path, or at a key '*',
+# is returned as a whole. Returns None for the first key of the path that is not in the data.
+def GetSelectedPath(_xData, _lPath: list):
+    if len(_lPath) == 0 or _lPath[0] == "*" or not isinstance(_xData, dict):
+        return _xData
+    # endif
+
+    if _lPath[0] not in _xData:
+        return None
+    # endif
+
+    return {_lPath[0]: GetSelectedPath(_xData[_lPath[0]], _lPath[1:])}
+
+
+# enddef
+
+
+################################################################################
+# A string is static, if processing it returns the string unchanged,
+# i.e. it contains no variable or function and is not enclosed in backquotes.
+def IsStaticString(_sValue: str) -> bool:
+    return "$" not in _sValue and not _sValue.startswith("`") and not _sValue.startswith("\\`")
+
+
+# enddef
+
+
+################################################################################
+# Collect the largest dictionaries and lists below the given data that contain no ISON syntax.
+# These are stored in '_dicStatic' with their id as key. Processing such a
+# container returns an identical copy, so that it can be used by reference instead.
+# Containers below special '__' keys are not collected, as they are changed during processing.
+# Included data is merged with copy-on-write, so it does not change collected containers.
+# The given data itself is never collected. Returns True, if it is static.
+def CollectStaticData(_xData, _dicStatic: dict) -> bool:
+    bStatic = _DoCollectStaticData(_xData, _dicStatic)
+    if bStatic is True:
+        if isinstance(_xData, dict):
+            _AddStaticContainers(_xData.values(), _dicStatic)
+        elif isinstance(_xData, list):
+            _AddStaticContainers(_xData, _dicStatic)
+        # endif
+    # endif
+
+    return bStatic
+
+
+# enddef
+
+
+################################################################################
+def _AddStaticContainers(_iterData, _dicStatic: dict):
+    for xData in _iterData:
+        if isinstance(xData, dict) or isinstance(xData, list):
+            _dicStatic[id(xData)] = xData
+        # endif
+    # endfor
+
+
+# enddef
+
+
+################################################################################
+# Returns True, if the data is static. If not, its static child containers are collected.
+def _DoCollectStaticData(_xData, _dicStatic: dict) -> bool:
+    if isinstance(_xData, str):
+        return IsStaticString(_xData)
+
+    elif isinstance(_xData, dict):
+        lStaticChildren = []
+        bStatic = True
+        for sKey, xValue in _xData.items():
+            if not isinstance(sKey, str) or "$" in sKey or sKey.startswith("__"):
+                bStatic = False
+            elif _DoCollectStaticData(xValue, _dicStatic) is True:
+                lStaticChildren.append(xValue)
+            else:
+                bStatic = False
+            # endif
+        # endfor
+
+    elif isinstance(_xData, list):
+        if len(_xData) > 0 and _xData[0] == "__lambda__":
+            return False
+        # endif
+
+        lStaticChildren = []
+        bStatic = True
+        for xEl in _xData:
+            if _DoCollectStaticData(xEl, _dicStatic) is True:
+                lStaticChildren.append(xEl)
+            else:
+                bStatic = False
+            # endif
+        # endfor
+
+    else:
+        return True
+    # endif
+
+    if bStatic is False:
+        _AddStaticContainers(lStaticChildren, _dicStatic)
+    # endif
+
+    return bStatic
+
+
+# enddef
+
+
+################################################################################
+# Data is static, if processing it returns the data unchanged.
+def IsStaticData(_xData) -> bool:
+    return _DoCollectStaticData(_xData, {})
+
+
+# enddef
+
+
+################################################################################
+# Copy those parts of the data that are changed during processing and share the rest.
+# Dictionaries with special '__' keys are changed, when their includes and
+# variable definitions are applied. The same holds for dictionaries that are
+# directly stored under a special key, like the variable definitions themselves.
+# Containers on the path to a copied dictionary are copied as well.
+# All other containers are only read by the parser. Containers whose id is
+# in '_dicShared' are known to contain no special keys and are not traversed.
+def CopyDataSpine(_xData, _dicShared: dict = None, *, bCopyRoot: bool = True):
+    if _dicShared is not None and id(_xData) in _dicShared:
+        return _xData
+    # endif
+
+    if isinstance(_xData, dict):
+        bCopy = bCopyRoot
+        dicChanged = {}
+        for sKey, xValue in _xData.items():
+            bIsSpecial = isinstance(sKey, str) and sKey.startswith("__")
+            bCopy = bCopy or bIsSpecial
+            xCopy = CopyDataSpine(xValue, _dicShared, bCopyRoot=bIsSpecial)
+            if xCopy is not xValue:
+                dicChanged[sKey] = xCopy
+            # endif
+        # endfor
+
+        if bCopy is False and len(dicChanged) == 0:
+            return _xData
+        # endif
+
+        dicCopy = dict(_xData)
+        dicCopy.update(dicChanged)
+        return dicCopy
+
+    elif isinstance(_xData, list):
+        lCopy = None
+        for iIdx, xEl in enumerate(_xData):
+            xCopy = CopyDataSpine(xEl, _dicShared, bCopyRoot=False)
+            if xCopy is not xEl:
+                if lCopy is None:
+                    lCopy = list(_xData)
+                # endif
+                lCopy[iIdx] = xCopy
+            # endif
+        # endfor
+
+        if lCopy is None:
+            return _xData
+        # endif
+        return lCopy
+    # endif
+
+    return _xData
+
+
+# enddef
+
+
+################################################################################
+# Copy the containers of the data, that are shared with data outside of it, like the data
+# of cached files, so that the data can be changed without changing the shared containers.
+# Containers whose id is in '_dicShared' are copied deeply. Containers whose id is in
+# '_dicKeep' are returned as they are. All other containers are changed in place.
+def CopySharedData(_xData, _dicShared: dict, _dicKeep: dict = None):
+    if id(_xData) in _dicShared:
+        return copy.deepcopy(_xData)
+    elif _dicKeep is not None and id(_xData) in _dicKeep:
+        return _xData
+    # endif
+
+    if isinstance(_xData, dict):
+        for sKey, xValue in _xData.items():
+            if isinstance(xValue, dict) or isinstance(xValue, list):
+                xCopy = CopySharedData(xValue, _dicShared, _dicKeep)
+                if xCopy is not xValue:
+                    _xData[sKey] = xCopy
+                # endif
+            # endif
+        # endfor
+
+    elif isinstance(_xData, list):
+        for iIdx, xValue in enumerate(_xData):
+            if isinstance(xValue, dict) or isinstance(xValue, list):
+                xCopy = CopySharedData(xValue, _dicShared, _dicKeep)
+                if xCopy is not xValue:
+                    _xData[iIdx] = xCopy
+                # endif
+            # endif
+        # endfor
+    # endif
+
+    return _xData
+
+
+# enddef
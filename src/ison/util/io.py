@@ -26,16 +26,22 @@
 
 import re
 import os
+import sys
 
 try:
     import pyjson5
 except Exception:
+    pyjson5 = None
     print("Module 'pyjson5' not installed. JSON5 files will not be supported.")
 # endtry
 
+import io as pyio
 import json
+import glob
+import codecs
 from pathlib import Path
 from . import path
+from . import data
 
 from ..core.cls_parser_error import CParserError, CParserError_Message
 
@@ -111,6 +117,361 @@ def encode_json(_xData, iIndent=-1):
 # enddef
 
 
+#######################################################################
+# Write the data as JSON to a text or binary stream, while the data is walked.
+# The text is the same as that of encode_json(), but it is written in chunks
+# and never held in memory as a whole.
+# If 'bStripVars' is True, the variable definitions of all dictionaries are
+# left out, as with data.StripVarsFromData().
+# If the data is written as element of a container, 'iLevel' is the indentation level of the element.
+def encode_json_io(_xData, _xStream, iIndent=-1, bStripVars=False, iChunkSize=65536, iLevel=0):
+
+    if pyjson5 is not None and iIndent < 0:
+        funcEncode = pyjson5.encode
+        sKeySep = ":"
+        sIndent = None
+    else:
+        funcEncode = json.dumps
+        sKeySep = ": "
+        sIndent = " " * iIndent
+    # endif
+
+    setStripKeys = frozenset(data.lVarKeys) if bStripVars is True else frozenset()
+    bBinary = isinstance(_xStream, (pyio.RawIOBase, pyio.BufferedIOBase))
+    lChunk = []
+    iChunkLen = 0
+
+    ###################################################################
+    def Write(_sText):
+        nonlocal iChunkLen
+
+        lChunk.append(_sText)
+        iChunkLen += len(_sText)
+        if iChunkLen >= iChunkSize:
+            Flush()
+        # endif
+
+    # enddef
+
+    ###################################################################
+    def Flush():
+        nonlocal iChunkLen
+
+        sText = "".join(lChunk)
+        lChunk.clear()
+        iChunkLen = 0
+        if bBinary is True:
+            _xStream.write(sText.encode("utf-8"))
+        else:
+            _xStream.write(sText)
+        # endif
+
+    # enddef
+
+    ###################################################################
+    def WriteElements(_iterEls, _sOpen, _sClose, _iLevel):
+        if sIndent is not None:
+            sElSep = ",\n" + sIndent * (_iLevel + 1)
+            sFirstSep = "\n" + sIndent * (_iLevel + 1)
+            sCloseSep = "\n" + sIndent * _iLevel
+        else:
+            sElSep = ","
+            sFirstSep = ""
+            sCloseSep = ""
+        # endif
+
+        sSep = _sOpen + sFirstSep
+        for sKey, xValue in _iterEls:
+            Write(sSep)
+            sSep = sElSep
+            if sKey is not None:
+                Write(sKey)
+                Write(sKeySep)
+            # endif
+            WriteValue(xValue, _iLevel + 1)
+        # endfor
+
+        if sSep is sElSep:
+            Write(sCloseSep + _sClose)
+        else:
+            Write(_sOpen + _sClose)
+        # endif
+
+    # enddef
+
+    ###################################################################
+    def WriteValue(_xValue, _iLevel):
+        if isinstance(_xValue, dict):
+            if sIndent is None and not all(isinstance(sKey, str) for sKey in _xValue):
+                # Let the JSON5 encoder handle keys that are not strings
+                if bStripVars is True:
+                    _xValue = data.StripVarsFromData(_xValue)
+                # endif
+                Write(funcEncode(_xValue))
+                return
+            # endif
+
+            # The json module converts keys like 1, 1.5, true or null to strings
+            WriteElements(
+                (
+                    (funcEncode(sKey) if isinstance(sKey, str) else json.dumps(json.dumps(sKey)), xValue)
+                    for sKey, xValue in _xValue.items()
+                    if sKey not in setStripKeys
+                ),
+                "{",
+                "}",
+                _iLevel,
+            )
+
+        elif isinstance(_xValue, (list, tuple)):
+            WriteElements(((None, xEl) for xEl in _xValue), "[", "]", _iLevel)
+
+        else:
+            Write(funcEncode(_xValue))
+        # endif
+
+    # enddef
+
+    WriteValue(_xData, iLevel)
+    Flush()
+
+
+# enddef
+
+
+#######################################################################
+# Write the data as JSON to the file, or to stdout if no filename is given.
+# See encode_json_io().
+def encode_json_stream(_xData, _sFilePath=None, iIndent=-1, bStripVars=False):
+
+    if _sFilePath is None:
+        encode_json_io(_xData, sys.stdout, iIndent=iIndent, bStripVars=bStripVars)
+        sys.stdout.flush()
+    else:
+        with open(_sFilePath, "w") as xFile:
+            encode_json_io(_xData, xFile, iIndent=iIndent, bStripVars=bStripVars)
+        # endwith
+    # endif
+
+
+# enddef
+
+
+#######################################################################
+# Write the data of the iterable as JSON list to a text or binary stream, one element after
+# the other. The text is the same as that of encode_json() for the list of all elements.
+def encode_json_list_io(_iterData, _xStream, iIndent=-1):
+
+    if pyjson5 is not None and iIndent < 0:
+        sFirstSep = ""
+        sElSep = ","
+        sClose = "]"
+    else:
+        sFirstSep = "\n" + " " * iIndent
+        sElSep = ",\n" + " " * iIndent
+        sClose = "\n]"
+    # endif
+
+    bBinary = isinstance(_xStream, (pyio.RawIOBase, pyio.BufferedIOBase))
+    sSep = "[" + sFirstSep
+    for xEl in _iterData:
+        _xStream.write(sSep.encode("utf-8") if bBinary is True else sSep)
+        sSep = sElSep
+        encode_json_io(xEl, _xStream, iIndent=iIndent, iLevel=1)
+    # endfor
+
+    sEnd = sClose if sSep is sElSep else "[]"
+    _xStream.write(sEnd.encode("utf-8") if bBinary is True else sEnd)
+
+
+# enddef
+
+
+#######################################################################
+# Write the data of the iterable to a text or binary stream with one JSON value per line (NDJSON).
+def encode_ndjson_io(_iterData, _xStream):
+
+    bBinary = isinstance(_xStream, (pyio.RawIOBase, pyio.BufferedIOBase))
+    for xEl in _iterData:
+        if pyjson5 is not None:
+            encode_json_io(xEl, _xStream)
+            _xStream.write(b"\n" if bBinary is True else "\n")
+        else:
+            sLine = json.dumps(xEl) + "\n"
+            _xStream.write(sLine.encode("utf-8") if bBinary is True else sLine)
+        # endif
+    # endfor
+
+
+# enddef
+
+
+#######################################################################
+# Read a stream, that contains a JSON list, and yield its elements one after the other.
+# Only the text of the current element is held in memory. The elements must be standard JSON,
+# unless 'bJson5' is True, in which case the list is decoded as JSON5, if pyjson5 is installed.
+def decode_json_list_io(_xStream, iChunkSize=65536, bJson5=False):
+
+    if bJson5 is True and pyjson5 is None:
+        bJson5 = False
+    # endif
+
+    xDecoder = json.JSONDecoder()
+    tDecodeErrors = (pyjson5.Json5DecoderException,) if bJson5 is True else (json.JSONDecodeError,)
+    xTextDecoder = codecs.getincrementaldecoder("utf-8")()
+    sBuffer = ""
+    xBuffer = None
+    iPos = 0
+    bEof = False
+
+    ###################################################################
+    # Read more text and drop the text before the current position
+    def Read(_iMinSize):
+        nonlocal sBuffer, xBuffer, iPos, bEof
+
+        xText = _xStream.read(max(iChunkSize, _iMinSize))
+        if isinstance(xText, bytes):
+            xText = xTextDecoder.decode(xText, final=len(xText) == 0)
+        # endif
+        bEof = len(xText) == 0
+        sBuffer = sBuffer[iPos:] + xText
+        xBuffer = None
+        iPos = 0
+
+    # enddef
+
+    ###################################################################
+    # Returns the next character that is not white space, or an empty string at the end of the stream.
+    # Comments are skipped for JSON5.
+    def Peek():
+        nonlocal iPos
+
+        while True:
+            while iPos < len(sBuffer) and sBuffer[iPos] in " \t\n\r":
+                iPos += 1
+            # endwhile
+            if bJson5 is True and sBuffer.startswith("/", iPos) and (iPos + 1 < len(sBuffer) or bEof is False):
+                if iPos + 1 == len(sBuffer):
+                    iEnd = -1
+                elif sBuffer[iPos + 1] == "/":
+                    iEnd = sBuffer.find("\n", iPos)
+                    iEnd = len(sBuffer) - 1 if iEnd < 0 and bEof is True else iEnd
+                elif sBuffer[iPos + 1] == "*":
+                    iEnd = sBuffer.find("*/", iPos + 2)
+                    iEnd = iEnd + 1 if iEnd >= 0 else iEnd
+                else:
+                    return "/"
+                # endif
+                if iEnd >= 0:
+                    iPos = iEnd + 1
+                    continue
+                elif bEof is True:
+                    raise CParserError_Message(sMsg="Unterminated comment in JSON5 list")
+                # endif
+            elif iPos < len(sBuffer) or bEof is True:
+                return sBuffer[iPos : iPos + 1]
+            # endif
+            Read(0)
+        # endwhile
+
+    # enddef
+
+    ###################################################################
+    # Decode the element at the current position and return it with the position after it
+    def Decode():
+        nonlocal xBuffer
+
+        if bJson5 is False:
+            return xDecoder.raw_decode(sBuffer, iPos)
+        # endif
+
+        if xBuffer is None:
+            xBuffer = pyio.StringIO(sBuffer)
+        # endif
+        xBuffer.seek(iPos)
+        try:
+            xEl = pyjson5.decode_io(xBuffer, some=True)
+            iEnd = xBuffer.tell()
+        except pyjson5.Json5ExtraData as xEx:
+            # A number or literal is delimited by the following character, which has been read as well
+            xEl = xEx.result
+            iEnd = xBuffer.tell() - 1
+        # endtry
+
+        return xEl, iEnd
+
+    # enddef
+
+    if Peek() != "[":
+        raise CParserError_Message(sMsg="Expected a JSON list at start of stream")
+    # endif
+    iPos += 1
+
+    if Peek() == "]":
+        return
+    # endif
+
+    while True:
+        # A number is only complete, if it is followed by a delimiter
+        while True:
+            try:
+                xEl, iEnd = Decode()
+                if bEof is True or (iEnd < len(sBuffer) and sBuffer[iEnd] in " \t\n\r,]/"):
+                    break
+                # endif
+            except tDecodeErrors as xEx:
+                if bEof is True:
+                    raise CParserError_Message(sMsg="Error decoding element of JSON list:\n> {}".format(str(xEx)))
+                # endif
+            # endtry
+            Read(len(sBuffer) - iPos)
+        # endwhile
+
+        iPos = iEnd
+        yield xEl
+
+        sNext = Peek()
+        iPos += 1
+        if sNext == "]":
+            break
+        elif sNext != ",":
+            raise CParserError_Message(sMsg="Expected ',' or ']' after element of JSON list")
+        # endif
+
+        # JSON5 allows a comma after the last element
+        if Peek() == "]" and bJson5 is True:
+            iPos += 1
+            break
+        # endif
+    # endwhile
+
+    if Peek() != "":
+        raise CParserError_Message(sMsg="Unexpected text after end of JSON list")
+    # endif
+
+
+# enddef
+
+
+#######################################################################
+# Read a stream with one JSON value per line (NDJSON) and yield the values one after the other.
+# Empty lines are skipped.
+def decode_ndjson_io(_xStream):
+
+    for xLine in _xStream:
+        if isinstance(xLine, bytes):
+            xLine = xLine.decode("utf-8")
+        # endif
+        if len(xLine.strip()) == 0:
+            continue
+        # endif
+        yield decode_json(xLine)
+    # endfor
+
+
+# enddef
+
+
 #######################################################################
 def decode_json(_sData):
 
@@ -127,8 +488,9 @@ def decode_json(_sData):
 
 
 #######################################################################
-# Load JSON file from path
-def LoadJson(_xFilePath) -> dict:
+# Resolve the path of a json file. If the path has no suffix, the first
+# existing file with suffix '.json', '.json5' or '.ison' is used.
+def ResolveJsonPath(_xFilePath) -> Path:
 
     pathFile = path.MakeNormPath(_xFilePath)
 
@@ -155,6 +517,18 @@ def LoadJson(_xFilePath) -> dict:
         )
     # endif
 
+    return pathFile
+
+
+# enddef
+
+
+#######################################################################
+# Load JSON file from path
+def LoadJson(_xFilePath) -> dict:
+
+    pathFile = ResolveJsonPath(_xFilePath)
+
     if pyjson5 is None:
         return decode_json_file(pathFile.as_posix())
     # endif
@@ -246,3 +620,27 @@ def SaveJson(_xFilePath, _dicData, iIndent=-1):
 
 
 # enddef
+
+
+#######################################################################
+# Returns a stamp of the file, which changes when the file changes, or None if it does not exist.
+# For a path with wildcards, like the pattern of '$dir', the stamps of all matching paths are used.
+def GetFileStamp(_sPath):
+    if glob.has_magic(_sPath):
+        lStamps = []
+        for sMatch in sorted(glob.glob(_sPath, recursive=True)):
+            lStamps.append((sMatch, GetFileStamp(sMatch)))
+        # endfor
+        return tuple(lStamps)
+    # endif
+
+    try:
+        xStat = os.stat(_sPath)
+    except OSError:
+        return None
+    # endtry
+
+    return (xStat.st_mtime_ns, xStat.st_size)
+
+
+# enddef
@@ -24,23 +24,34 @@
 # </LICENSE>
 ###
 
+import re
 import json
+import functools
 
-from ..core.cls_parser_error import CParserError_Message, CParserError_ProcArgStr
+from ..core.cls_parser_error import CParserError_Message
+from ..core import expr_lexer
 
 
 ################################################################################
 # Find balanced closed element
 # The element of _sValue at _iStartIdx defines the start character.
 # _sEndChar defines the end character.
-# If a balanced end character cannot be found, None is returned.
+# If a balanced end character cannot be found, an exception is raised.
 def FindBalancedChar(_sValue, _iStartIdx, _sEndChar):
     iStartCnt = 1
     sStartChar = _sValue[_iStartIdx]
 
+    # Only visit the start and end characters
+    reChars = _GetBalancedCharRegEx(sStartChar, _sEndChar)
     iIdx = _iStartIdx + 1
     iCnt = len(_sValue)
     while iIdx < iCnt:
+        xMatch = reChars.search(_sValue, iIdx)
+        if xMatch is None:
+            iIdx = iCnt
+            break
+        # endif
+        iIdx = xMatch.start()
         sChar = _sValue[iIdx]
         if sChar == _sEndChar:
             iStartCnt -= 1
@@ -66,86 +77,20 @@ def FindBalancedChar(_sValue, _iStartIdx, _sEndChar):
 
 
 ################################################################################
-# Split Arguments in string accounting for brackets.
-# For example, the string "a, (b, c), d" is split into ["a", "(b, c)", "d"].
-# All types of brackets are taken into account "()", "[]", "{}"
-def SplitArgs(_sValue, sSplitChar=","):
-    lArgs = []
-    sOpen = "([{"
-    sClose = ")]}"
-    lBrkCnt = [0, 0, 0]
-
-    sStringChars = "'`\""
-    sActStrChar = None
-
-    lEndIdx = []
-    iStart = 0
-    iIdx = 0
-    sChar = None
-    for iIdx in range(len(_sValue)):
-        sPrevChar = sChar
-        sChar = _sValue[iIdx]
-        if sChar in sStringChars and sPrevChar != "\\":
-            if sActStrChar is None:
-                sActStrChar = sChar
-            elif sActStrChar == sChar:
-                sActStrChar = None
-            # endif
-        # endif
+@functools.lru_cache(maxsize=64)
+def _GetBalancedCharRegEx(_sStartChar, _sEndChar):
+    return re.compile("[{}]".format(re.escape(_sStartChar + _sEndChar)))
 
-        if sActStrChar is not None:
-            continue
-        # endif
-
-        iOpenIdx = sOpen.find(sChar)
-        iCloseIdx = sClose.find(sChar)
-
-        if sChar == sSplitChar and all((x == 0 for x in lBrkCnt)):
-            sArg = _sValue[iStart:iIdx].strip()
-            lArgs.append(sArg)
-            lEndIdx.append(iIdx + 1)
-            iStart = iIdx + 1
-
-        elif iOpenIdx >= 0:
-            lBrkCnt[iOpenIdx] += 1
-
-        elif iCloseIdx >= 0:
-            if lBrkCnt[iCloseIdx] == 0:
-                raise CParserError_Message(
-                    sMsg="Unexpected close bracket '{0}' at index {1} in: {2}>>{3}<<{4}".format(
-                        sClose[iCloseIdx],
-                        iIdx,
-                        _sValue[0:iIdx],
-                        _sValue[iIdx],
-                        _sValue[iIdx + 1 :],
-                    )
-                )
-            # endif
-            lBrkCnt[iCloseIdx] -= 1
-        # endif
-    # endfor
 
-    if sActStrChar is not None:
-        raise CParserError_Message(sMsg="Missing closed string symbol >{0}< in: {1}".format(sActStrChar, _sValue))
-    # endif
-
-    iOpenIdx = -1
-    if lBrkCnt[0] > 0:
-        iOpenIdx = 0
-    elif lBrkCnt[1] > 0:
-        iOpenIdx = 1
-    elif lBrkCnt[2] > 0:
-        iOpenIdx = 2
-    # endif
-    if iOpenIdx >= 0:
-        raise CParserError_Message(sMsg="Missing closed bracket '{0}' in: {1}".format(sClose[iOpenIdx], _sValue))
-    # endif
+# enddef
 
-    sArg = _sValue[iStart:].strip()
-    lArgs.append(sArg)
-    lEndIdx.append(len(_sValue))
 
-    return lArgs, lEndIdx
+################################################################################
+# Split Arguments in string accounting for brackets.
+# For example, the string "a, (b, c), d" is split into ["a", "(b, c)", "d"].
+# All types of brackets are taken into account "()", "[]", "{}"
+def SplitArgs(_sValue, sSplitChar=","):
+    return expr_lexer.SplitArgs(_sValue, sSplitChar=sSplitChar)
 
 
 # enddef
@@ -155,8 +100,7 @@ def SplitArgs(_sValue, sSplitChar=","):
 # Split a variable path, honoring embedded functions.
 # For example, "id:!ref(id:hello:name):value" is split into ["id", "!ref(id:hello:name)", "value"]
 def SplitVarPath(_sPath):
-    lArgs, lEndIdx = SplitArgs(_sPath, sSplitChar=":")
-    return lArgs
+    return expr_lexer.SplitVarPath(_sPath)
 
 
 # enddef
@@ -170,54 +114,7 @@ def SplitVarPath(_sPath):
 #   {"sFunc": "fab", "lArgs": ["cameras"], "iStart": 40, "iEnd": 52}
 # ]
 def GetVarMatchList(_sValue, _reVarStart, *, lSingleArgsFuncs=[]):
-    lMatch = []
-    iSearchIdx = 0
-    while True:
-        xMatch = _reVarStart.search(_sValue, iSearchIdx)
-        if xMatch is None:
-            break
-        # endif
-
-        sFunc = xMatch.group("func")
-        if sFunc is not None:
-            iEnd = FindBalancedChar(_sValue, xMatch.end() - 1, "}")
-
-            sMatch = _sValue[xMatch.start() : iEnd + 1]
-            sArgs = _sValue[xMatch.end() : iEnd]
-
-            if sFunc in lSingleArgsFuncs:
-                lArgs = [sArgs]
-            else:
-                try:
-                    lArgs, lEndIdx = SplitArgs(sArgs)
-                except Exception as xEx:
-                    raise CParserError_ProcArgStr(sString=sArgs, xChildEx=xEx)
-                # endtry
-            # endif
-
-        else:
-            # pure variable reference, e.g. "$var"
-            # use reference function
-            sFunc = ""
-            lArgs = [xMatch.group("var")]
-            iEnd = xMatch.end() - 1
-            sMatch = _sValue[xMatch.start() : xMatch.end()]
-        # endif
-
-        lMatch.append(
-            {
-                "sFunc": sFunc,
-                "lArgs": lArgs,
-                "iStart": xMatch.start(),
-                "iEnd": iEnd + 1,
-                "sMatch": sMatch,
-            }
-        )
-
-        iSearchIdx = iEnd + 1
-    # endwhile
-
-    return lMatch
+    return expr_lexer.GetVarMatchList(_sValue, _reVarStart, lSingleArgsFuncs=lSingleArgsFuncs)
 
 
 # enddef
@@ -284,7 +181,13 @@ def StripString(_sValue, _sChar):
     elif _sValue[0] != _sChar:
         return _sValue
     else:
-        iClosedIdx = FindBalancedChar(_sValue, 0, _sChar)
+        iClosedIdx = expr_lexer.FindStringEnd(_sValue, _sChar)
+        if iClosedIdx < 0:
+            raise CParserError_Message(
+                sMsg="Closing '{}' missing: {}".format(_sChar, HighlightStringPart(_sValue, 0, 1))
+            )
+        # endif
+
         if iClosedIdx + 1 == len(_sValue):
             sValue = _sValue[1:iClosedIdx]
             sValue = sValue.replace(f"\\{_sChar}", _sChar)
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \test_batch-01.py
+# Created Date: Monday, October 19th 2026, 11:07:24 am
+# Author: Christian Perwass
+# <LICENSE id="Apache-2.0">
+#
+#   Functional JSON module
+#   Copyright 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# </LICENSE>
+###
+
+import json
+
+import ison
+
+
+class TestClass:
+
+    ################################################################################
+    def test_run_many_01(self, tmp_path):
+        (tmp_path / "cfg" / "sub").mkdir(parents=True)
+        (tmp_path / "cfg" / "common.json").write_text('{"__globals__": {"iBase": 10}}')
+        lFiles = []
+        for iIdx in range(6):
+            pathDoc = tmp_path / "cfg" / ("sub" if iIdx % 2 == 1 else "") / "doc{}.json".format(iIdx)
+            sInc = "../common.json" if iIdx % 2 == 1 else "common.json"
+            pathDoc.write_text(
+                json.dumps({"__includes__": [sInc], "iValue": "$sum{${iBase}, %d}" % iIdx, "sName": "${run:file:name}"})
+            )
+            lFiles.append(pathDoc.as_posix())
+        # endfor
+        (tmp_path / "cfg" / "bad.json").write_text('{"iValue": "$div{1, 0}"}')
+        (tmp_path / "list.txt").write_text("\n".join(lFiles[:2] + ["# comment", ""]))
+
+        # An error of a document does not stop the other documents
+        for iMaxWorkers in [1, 2]:
+            dicResult = ison.run.RunMany(
+                xFiles=(tmp_path / "cfg" / "**" / "*.json").as_posix(),
+                sOutDir=(tmp_path / "out").as_posix(),
+                dicConstVars={"run": {}},
+                bStripVars=True,
+                bFileVars=True,
+                iMaxWorkers=iMaxWorkers,
+            )
+            assert dicResult["iDocCnt"] == 8
+            assert dicResult["iErrorCnt"] == 1
+            assert [x["sFileIn"] for x in dicResult["lDocs"] if x["sError"] is not None] == [
+                (tmp_path / "cfg" / "bad.json").as_posix()
+            ]
+            xOut = json.loads((tmp_path / "out" / "sub" / "doc3.json").read_text())
+            assert xOut == {"iValue": 13, "sName": "doc3.json"}
+        # endfor
+
+        dicResult = ison.run.RunMany(xFiles=(tmp_path / "list.txt").as_posix(), sResultKey="iValue")
+        assert [x["xResult"] for x in dicResult["lDocs"]] == [10, 11]
+
+    # enddef
+
+    ################################################################################
+    def test_run_many_02(self, tmp_path):
+        # The parser of a worker is reused, but the variables of a document are not visible in the next one
+        (tmp_path / "a.json").write_text('{"__globals__": {"iOnlyA": 1}, "iValue": "${iOnlyA}"}')
+        (tmp_path / "b.json").write_text('{"iValue": "${iOnlyA}"}')
+        (tmp_path / "c.json").write_text('{"__globals__": {"iOnlyA": 2}, "iValue": "${iOnlyA}"}')
+
+        for iMaxWorkers in [1, 2]:
+            dicResult = ison.run.RunMany(
+                xFiles=(tmp_path / "*.json").as_posix(), sResultKey="iValue", iMaxWorkers=iMaxWorkers
+            )
+            assert [x["xResult"] for x in dicResult["lDocs"]] == [1, "${iOnlyA}", 2]
+        # endfor
+
+    # enddef
+
+
+# endclass
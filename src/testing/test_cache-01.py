@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \test_cache-01.py
+# Created Date: Monday, October 19th 2026, 5:34:51 pm
+# Author: Christian Perwass
+# <LICENSE id="Apache-2.0">
+#
+#   Functional JSON module
+#   Copyright 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# </LICENSE>
+###
+
+import ison
+
+
+class TestClass:
+
+    ################################################################################
+    def test_include_cache_01(self, tmp_path):
+        (tmp_path / "lib.json").write_text('{"dicLib": {"lValues": [1, 2]}, "sName": "lib"}')
+        dicData = {"__includes__": ["lib"], "dicLib": {"lValues": [3]}, "a": 1}
+
+        ison.Parser.ClearIncludeCache()
+        dicResult1: dict = ison.run.Run(xData=dicData, sImportPath=tmp_path.as_posix())
+        assert dicResult1 == {"dicLib": {"lValues": [3]}, "sName": "lib", "a": 1}
+
+        # The cached data is not changed by processing it
+        dicResult2: dict = ison.run.Run(xData=dicData, sImportPath=tmp_path.as_posix())
+        assert dicResult2 == dicResult1
+        dicStats = ison.Parser.GetIncludeCacheStats()
+        assert dicStats["iHits"] == 1 and dicStats["iMisses"] == 1
+        assert dicStats["fHitRate"] == 0.5
+
+        # A changed include file is loaded again
+        (tmp_path / "lib.json").write_text('{"dicLib": {"lValues": [1, 2]}, "sName": "lib2"}')
+        assert ison.run.Run(xData=dicData, sImportPath=tmp_path.as_posix())["sName"] == "lib2"
+        assert ison.Parser.GetIncludeCacheStats()["iMisses"] == 2
+
+        # Files larger than the cache are not kept
+        ison.Parser.xIncludeCache.SetMaxBytes(10)
+        assert ison.Parser.GetIncludeCacheStats()["iSize"] == 0
+        ison.Parser.xIncludeCache.SetMaxBytes(256 * 1024 * 1024)
+
+    # enddef
+
+    ################################################################################
+    def test_include_cache_02(self, tmp_path):
+        (tmp_path / "lib.json").write_text('{"__globals__": {"lG": [1]}, "dicLib": {"lValues": [1, 2]}}')
+        dicData = {"__includes__": ["lib"], "a": "${lG}"}
+        dicExpect = {"__globals__": {"lG": [1]}, "dicLib": {"lValues": [1, 2]}, "a": [1], "__func_globals__": {}}
+
+        # Changing a result does not change the cached include data
+        ison.Parser.ClearIncludeCache()
+        for bExprVM in [False, True]:
+            for iIdx in range(2):
+                dicResult: dict = ison.Parser({}, sImportPath=tmp_path.as_posix(), bExprVM=bExprVM).Process(dicData)
+                assert dicResult == dicExpect
+                dicResult["dicLib"]["lValues"].append(3)
+                dicResult["__globals__"]["lG"].append(2)
+
+                dicResult = ison.run.Run(xData=dicData, sImportPath=tmp_path.as_posix(), bStripVars=False)
+                assert dicResult == dicExpect
+                dicResult["dicLib"]["lValues"].append(3)
+                dicResult["__globals__"]["lG"].append(2)
+
+                lResult: list = ison.Parser({}, sImportPath=tmp_path.as_posix()).Process(
+                    dicData, lProcessPaths=["dicLib/lValues"]
+                )
+                assert lResult == [{"dicLib": {"lValues": [1, 2]}}]
+                lResult[0]["dicLib"]["lValues"].append(3)
+            # endfor
+        # endfor
+        assert ison.Parser.GetIncludeCacheStats()["iMisses"] == 1
+
+    # enddef
+
+    ################################################################################
+    def test_read_cache_01(self, tmp_path):
+        (tmp_path / "preset.json").write_text('{"__globals__": {"iP": 3}, "dicA": {"iV": "${iP}", "lS": [1, 2]}}')
+        (tmp_path / "text.txt").write_text("hello")
+        dicData = {
+            "lPresets": "$!foreach{$L{$read{preset.json}}, *$range{0, 3}}",
+            "sText": "$read{text.txt}",
+        }
+        dicExpect = {"lPresets": [{"dicA": {"iV": 3, "lS": [1, 2]}}] * 4, "sText": "hello"}
+
+        xParser = ison.Parser({}, sImportPath=tmp_path.as_posix())
+        assert ison.util.data.StripVarsFromData(xParser.Process(dicData)) == dicExpect
+        dicStats = xParser.GetReadCacheStats()
+        assert dicStats["iMisses"] == 2 and dicStats["iHits"] == 3
+
+        # A changed file is read again
+        (tmp_path / "text.txt").write_text("hello world")
+        assert xParser.Process(dicData)["sText"] == "hello world"
+        assert xParser.GetReadCacheStats()["iMisses"] == 3
+
+        xParser = ison.Parser({}, sImportPath=tmp_path.as_posix(), bCacheReads=False)
+        assert xParser.Process(dicData)["sText"] == "hello world"
+        assert xParser.GetReadCacheStats() is None
+
+    # enddef
+
+    ################################################################################
+    def test_read_cache_02(self, tmp_path):
+        (tmp_path / "values.json").write_text('{"lValues": [1, 2], "dicSub": {"lValues": [3]}}')
+        dicData = {"a": "$read{values.json}", "b": ["$read{values.json}"]}
+
+        # Changing a result does not change the cached file data
+        for bExprVM in [False, True]:
+            xParser = ison.Parser({}, sImportPath=tmp_path.as_posix(), bExprVM=bExprVM)
+            for iIdx in range(2):
+                dicResult: dict = xParser.Process(dicData)
+                dicValues = {"lValues": [1, 2], "dicSub": {"lValues": [3]}}
+                assert dicResult["a"] == dicValues and dicResult["b"] == [dicValues]
+                dicResult["a"]["lValues"].append(3)
+                dicResult["b"][0]["dicSub"]["lValues"].append(4)
+            # endfor
+            assert xParser.GetReadCacheStats()["iMisses"] == 1
+        # endfor
+
+    # enddef
+
+
+# endclass
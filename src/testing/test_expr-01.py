@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \test_expr-01.py
+# Created Date: Monday, October 12th 2026, 11:02:17 am
+# Author: Christian Perwass
+# <LICENSE id="Apache-2.0">
+#
+#   Functional JSON module
+#   Copyright 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# </LICENSE>
+###
+
+import ison
+
+
+class TestClass:
+
+    ################################################################################
+    def test_cache_01(self):
+        dicData = {
+            "__globals__": {
+                "iA": 2,
+            },
+            "lValues": ["$sum{${iA}, 1}", "$sum{${iA}, 1}", "$sum{${iA}, 1}"],
+        }
+
+        ison.Parser.ClearExprCache()
+        xResult: dict = ison.run.Run(xData=dicData)
+        dicStats = ison.Parser.GetExprCacheStats()
+
+        assert xResult["lValues"] == [3, 3, 3]
+        assert dicStats["iHits"] >= 2
+        assert dicStats["iMisses"] <= dicStats["iSize"]
+
+        # Processing the same data again must only hit the cache
+        xResult = ison.run.Run(xData=dicData)
+        assert xResult["lValues"] == [3, 3, 3]
+        assert ison.Parser.GetExprCacheStats()["iMisses"] == dicStats["iMisses"]
+
+    # enddef
+
+    ################################################################################
+    def test_vm_01(self):
+        dicData = {
+            "__globals__": {
+                "iA": 2,
+                "lValues": [1, 2, 3],
+                "greet": "$L{Hello %0}",
+            },
+            "iValue": "$sum{$prod{${iA}, 3}, *${lValues}}",
+            "sText": "`value: ${iA}, $len{${lValues}}`",
+            "sGreet": "${greet, World}",
+            "lEach": "$!foreach{$L{$prod{%0, 2}}, *${lValues}}",
+            "bTest": "$if{$gt{${iA}, 1}, true, false}",
+        }
+
+        xResult = ison.run.Run(xData=dicData)
+        assert ison.run.Run(xData=dicData, bExprVM=True) == xResult
+
+        # Errors are reported with the same context
+        dicError = {"iValue": "$sum{1, $div{${iB}, 0}}", "__globals__": {"iB": 1}}
+        lMessages = []
+        for bExprVM in [False, True]:
+            try:
+                ison.run.Run(xData=dicError, bExprVM=bExprVM)
+            except RuntimeError as xEx:
+                lMessages.append(str(xEx))
+            # endtry
+        # endfor
+        assert len(lMessages) == 2
+        assert lMessages[0] == lMessages[1]
+
+    # enddef
+
+    ################################################################################
+    def test_lazy_seq_01(self):
+        dicData = {
+            "__globals__": {
+                "lValues": [10, 20, 30, 40, 50],
+            },
+            "iLen": "$len{$range{0, 100000000}}",
+            "iLast": "$get{$range{0, 100000000}, 100000000, 0}",
+            "iSel": "$circularselect{$range{0, 4}, 12}",
+            "tEl": "$get{$enumerate{${lValues}}, 2, 0}",
+            "lSlice": "${lValues:1~3}",
+            "iSliceLen": "$len{${lValues:0~4+2}}",
+            "lGroup": "$group{${lValues}, $range{2}}",
+            "lEach": "$!foreach{$L{$sum{%0, 1}}, *$range{3}}",
+        }
+
+        for bExprVM in [False, True]:
+            xResult = ison.run.Run(xData=dicData, bExprVM=bExprVM)
+            assert xResult["iLen"] == 100000001
+            assert xResult["iLast"] == 100000000
+            assert xResult["iSel"] == 2
+            assert xResult["tEl"] == (2, 30)
+            assert xResult["lSlice"] == [20, 30, 40]
+            assert type(xResult["lSlice"]) is list
+            assert xResult["iSliceLen"] == 3
+            assert xResult["lGroup"] == [(10, 0), (20, 1)]
+            assert xResult["lEach"] == [1, 2, 3]
+        # endfor
+
+        # Error messages do not evaluate the whole sequence
+        sMsg = None
+        try:
+            ison.run.Run(xData={"iValue": "$get{$range{0, 100000000}, 1}"})
+        except RuntimeError as xEx:
+            sMsg = str(xEx)
+        # endtry
+        assert "[0, 1, 2, 3, 4, 5, 6, 7, 8, 9, ...] (100000001 elements)" in sMsg
+
+    # enddef
+
+
+# endclass
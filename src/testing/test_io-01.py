@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \test_io-01.py
+# Created Date: Sunday, October 18th 2026, 11:48:19 pm
+# Author: Christian Perwass
+# <LICENSE id="Apache-2.0">
+#
+#   Functional JSON module
+#   Copyright 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# </LICENSE>
+###
+
+import io
+import json
+
+import ison
+from ison.util import io as ison_io
+
+
+class TestClass:
+
+    ################################################################################
+    def test_stream_encode_01(self):
+        dicData = {
+            "__globals__": {"iA": 1},
+            "sText": "ä\n",
+            "lValues": [1, 2.5, None, True, [], {}, {"__locals__": {"iB": 2}, "iC": 3}],
+            "dicEmpty": {"__globals__": {}},
+        }
+
+        for iIndent in [-1, 0, 4]:
+            for bStripVars in [False, True]:
+                xData = ison.util.data.StripVarsFromData(dicData) if bStripVars is True else dicData
+                sExpect = ison_io.encode_json(xData, iIndent=iIndent)
+
+                # Small chunks, so that the text is written in many parts
+                xText = io.StringIO()
+                ison_io.encode_json_io(dicData, xText, iIndent=iIndent, bStripVars=bStripVars, iChunkSize=8)
+                assert xText.getvalue() == sExpect
+
+                xBytes = io.BytesIO()
+                ison_io.encode_json_io(dicData, xBytes, iIndent=iIndent, bStripVars=bStripVars)
+                assert xBytes.getvalue().decode("utf-8") == sExpect
+            # endfor
+        # endfor
+
+    # enddef
+
+    ################################################################################
+    def test_stream_run_01(self):
+        lData = [
+            {"__globals__": {"sBase": "/data", "job": "$L{`${sBase}/%0`}"}},
+            {"__globals__": {"iX": 1}, "sPath": "${job, a}"},
+            {"sPath": "${job, b}", "iN": "${cnt}"},
+            None,
+        ]
+        lExpect = [{"sPath": "/data/a"}, {"sPath": "/data/b", "iN": 2}, None]
+
+        # JSON list
+        xText = io.StringIO(ison_io.encode_json(lData, iIndent=2))
+        iterResults = ison.run.RunStream(xInput=xText, dicConstVars={"cnt": 2})
+        assert list(iterResults) == lExpect
+
+        # NDJSON lines, written while the results are created
+        xLines = io.BytesIO()
+        ison_io.encode_ndjson_io(lData, xLines)
+        xLines.seek(0)
+        xOut = io.StringIO()
+        ison_io.encode_json_list_io(ison.run.RunStream(xInput=xLines, dicConstVars={"cnt": 2}, bLines=True), xOut)
+        assert json.loads(xOut.getvalue()) == lExpect
+
+        # Variables of an element are not visible in the following elements
+        lResults = list(ison.run.RunStream(xInput=lData[:2] + [{"iX": "${iX}"}], dicConstVars={"cnt": 2}))
+        assert lResults[1] == {"iX": "${iX}"}
+
+        # The variables of the header are not repeated in the results
+        lResults = list(ison.run.RunStream(xInput=lData[:3], dicConstVars={"cnt": 2}, bStripVars=False))
+        assert lResults[0]["__globals__"] == {"iX": 1}
+        assert lResults[1]["__globals__"] == {}
+
+    # enddef
+
+    ################################################################################
+    def test_stream_json5_01(self, tmp_path):
+        sText = "// Elements\n[{__globals__: {iA: 1}}, {a: '${iA}', /* b */ b: 0x10}, 2.5e1, [1, 2,],]"
+        lExpect = [{"a": 1, "b": 16}, 25.0, [1, 2]]
+
+        # Small chunks, so that elements and comments are split across reads
+        for iChunkSize in [1, 7, 65536]:
+            lData = list(ison_io.decode_json_list_io(io.StringIO(sText), iChunkSize=iChunkSize, bJson5=True))
+            assert lData == [{"__globals__": {"iA": 1}}, {"a": "${iA}", "b": 16}, 25.0, [1, 2]]
+        # endfor
+
+        # Files with the extension '.json5' are read as JSON5
+        (tmp_path / "doc.json5").write_text(sText)
+        assert list(ison.run.RunStream(xInput=(tmp_path / "doc.json5").as_posix())) == lExpect
+        assert list(ison.run.RunStream(xInput=io.StringIO(sText), bJson5=True)) == lExpect
+
+    # enddef
+
+
+# endclass
@@ -110,4 +110,246 @@ class TestClass:
     # enddef
 
 
+    ################################################################################
+    def test_template_01(self):
+        from ison.core import lambda_parser as lp
+
+        xTemplate = lp.GetLambdaTemplate("%1 and %~0 $L{%0} %name%")
+        assert xTemplate is lp.GetLambdaTemplate("%1 and %~0 $L{%0} %name%")
+        assert xTemplate.bHasPars is True
+
+        setIdx = set()
+        setName = set()
+        sB, bChanged = xTemplate.Bind(["a"], {"name": "b"}, setIdx, setName)
+        assert sB == "%1 and  $L{%0} b"
+        assert bChanged is True
+        assert setIdx == {0}
+        assert setName == {"name"}
+
+        assert lp.Parse("$L{%0 %1}", ["x"]) == "$L{x %0}"
+
+    # enddef
+
+    ################################################################################
+    def test_arg_ref_01(self):
+        from ison.core import lambda_parser as lp
+        from ison.core.cls_lambda_arg_refs import CLambdaArgRefs
+
+        dicData = {
+            "__globals__": {
+                "lData": [{"a": 1}, {"a": 2}, {"a": 3}],
+            },
+            "__func_globals__": {
+                "cnt": "$L{$len{%0}}",
+                "get": "$L{${%0:%1:a}}",
+            },
+            "count": "${cnt, ${lData}}",
+            "values": "$!foreach{$L{${get, ${lData}, %0}}, 0, 2}",
+            "lambda": "${get, ${lData}}",
+        }
+
+        xResult: dict = ison.run.Run(xData=dicData)
+
+        assert xResult["count"] == 3
+        assert xResult["values"] == [1, 3]
+        # References do not leave the lambda call
+        assert xResult["lambda"] == "$L{${$*{^[{$S{a}: 1}, {$S{a}: 2}, {$S{a}: 3}]}:%0:a}}"
+        assert CLambdaArgRefs.GetActiveCount() == 0
+
+        # References of a finished call cannot be resolved anymore
+        with CLambdaArgRefs() as xArgRefs:
+            sRef = xArgRefs.Add(dicData["__globals__"]["lData"])
+            assert lp.GetArgRef(sRef[4:-1]) is dicData["__globals__"]["lData"]
+            with CLambdaArgRefs() as xInnerRefs:
+                assert xInnerRefs.Add(dicData["__globals__"]["lData"]) == sRef
+            # endwith
+        # endwith
+
+        try:
+            lp.GetArgRef(sRef[4:-1])
+            bValid = True
+        except Exception:
+            bValid = False
+        # endtry
+        assert bValid is False
+
+    # enddef
+
+    ################################################################################
+    def test_arg_ref_02(self):
+        from ison.core.cls_parser import CParser
+
+        dicData = {
+            "__globals__": {"lData": [10, 20, 30]},
+            "__func_globals__": {
+                "get": "$L{${%0:%1}}",
+                "inc": "$L{$!tforeach{$L{$sum{${%0:%1}, 1}}, (%0, 0), (%0, 2)}}",
+            },
+            "values": "$!foreach{$L{${get, ${lData}, 1}}, *$range{0,99}}",
+            "threads": "${inc, ${lData}}",
+        }
+
+        xResult: dict = ison.run.Run(xData=dicData, iMaxWorkers=2)
+        iCacheSize = CParser.GetExprCacheStats()["iSize"]
+        xResult: dict = ison.run.Run(xData=dicData, iMaxWorkers=2)
+
+        # References do not depend on the call, so that the parsed bodies are reused
+        assert CParser.GetExprCacheStats()["iSize"] == iCacheSize
+        assert xResult["values"] == [20] * 100
+        # References are resolved before they are passed to other threads
+        assert xResult["threads"] == [11, 31]
+
+    # enddef
+
+    ################################################################################
+    def test_plain_bind_01(self):
+        from ison.core import lambda_parser as lp
+
+        # Plain text bodies and arguments are bound without the lambda string conversion
+        assert lp.Parse("$L{%0 and %1}", ["x", "y"]) == "x and y"
+        assert lp.Parse("$L{%0 and %1}", ["x", 'say "y"']) == 'x and say "y"'
+        assert lp.Parse("$L{say `%0`}", ["x"]) == "say `x`"
+
+        # Other bodies are bound on their lambda string, whose conversion back to data
+        # depends on the nesting of the string blocks
+        assert lp.Parse('$L{say "%0"}', ['my "x"']) == 'say "my $S{x}"'
+        assert lp.Parse('$L{a "b `%0`"}', ["y"]) == 'a "b $Sb{y}"'
+
+        dicData = {
+            "__func_globals__": {
+                "cnt": "$L{$if{$gt{%0, 0}, ${cnt, $sub{%0, 1}}, done}}",
+                "last": "$L{$if{$gt{%1, 0}, ${last, %0, $sub{%1, 1}}, ${%0:-1}}}",
+            },
+            "cnt": "${cnt, 10}",
+            "last": '${last, $*{^[1, "a b"]}, 5}',
+        }
+
+        xResult: dict = ison.run.Run(xData=dicData)
+
+        assert xResult["cnt"] == "done"
+        assert xResult["last"] == "a b"
+
+    # enddef
+
+    ################################################################################
+    def test_lazy_args_01(self):
+        dicData = {
+            "__func_globals__": {"fLen": "$L{$len{%0}}"},
+            "n": "${fLen, $range{7}}",
+            "each": "$!foreach{$L{$len{%0}}, $range{3}, $range{5}}",
+            "tuple": "$!foreach{$L{$str{%0}}, ($range{2}, x)}",
+        }
+
+        # Lazy sequences are passed to lambda functions as lists
+        for bExprVM in [False, True]:
+            xResult: dict = ison.run.Run(xData=dicData, bExprVM=bExprVM)
+
+            assert xResult["n"] == 7
+            assert xResult["each"] == [3, 5]
+            assert xResult["tuple"] == ["[0, 1]"]
+        # endfor
+
+    # enddef
+
+    ################################################################################
+    def test_foreach_01(self):
+        dicData = {
+            "__globals__": {
+                "lData": [{"a": 1}, {"a": 2}],
+            },
+            "plus": "$!foreach{$L{$sum{%0, 1}}, *$range{0,3}}",
+            "pairs": "$!foreach{$L{$str{%0-%1}}, (a, 1), (b, ${lData})}",
+            "named": "$!foreach{$L{$sum{%x%, %y%}}, x=*$range{0,3}, y=10}",
+            "values": "$!foreach{$L{${%0:a}}, *${lData}}",
+            "where": "$!where{$L{$gt{%0, 1}}, *$range{0,4}}",
+        }
+
+        xResult: dict = ison.run.Run(xData=dicData)
+
+        assert xResult["plus"] == [1, 2, 3, 4]
+        assert xResult["pairs"] == ["a-1", 'b-[{"a": 1}, {"a": 2}]']
+        assert xResult["named"] == [10, 11, 12, 13]
+        assert xResult["values"] == [1, 2]
+        assert xResult["where"] == [2, 3, 4]
+
+    # enddef
+
+    ################################################################################
+    def test_foreach_error_01(self):
+        dicData = {"error": "$!foreach{$L{$undefined{%0}}, *$range{7,8}}"}
+
+        try:
+            ison.run.Run(xData=dicData)
+        except Exception as xEx:
+            sMsg = str(xEx)
+        # endtry
+
+        # Errors show the argument values, not their references
+        assert "$*{^7}" in sMsg
+        assert "@arg." not in sMsg
+
+    # enddef
+
+    ################################################################################
+    def test_pforeach_01(self):
+        dicData = {
+            "__globals__": {"dicBase": {"iWidth": 640}},
+            "procs": "$!pforeach{$L{$sum{%0, ${dicBase:iWidth}}}, *$range{0,9}}",
+            "threads": "$!tforeach{$L{$str{f%0}}, *$range{0,4}}",
+            "named": "$!pforeach{$L{$sum{%x%, %y%}}, x=*$range{0,3}, y=10}",
+        }
+
+        xResult: dict = ison.run.Run(xData=dicData, iMaxWorkers=2)
+
+        assert xResult["procs"] == [640 + i for i in range(10)]
+        assert xResult["threads"] == ["f0", "f1", "f2", "f3", "f4"]
+        assert xResult["named"] == [10, 11, 12, 13]
+
+        xParser = ison.Parser({}, iMaxWorkers=3)
+        try:
+            xParser.Process({"error": "$!pforeach{$L{$int{%0}}, 1, 2, x, 4}"})
+        except Exception as xEx:
+            sMsg = str(xEx)
+        # endtry
+
+        # Errors are reported for the first failing element
+        assert "Parallel call with arguments 2 -> list" in sMsg
+        assert "Error converting 'x' to integer" in sMsg
+
+    # enddef
+
+    ################################################################################
+    def test_pforeach_error_01(self):
+        from ison.core.cls_parser_error import CParserError_ListSel, CParserError_ProcLambdaPart
+
+        def GetErrorChain(_sFunc):
+            xParser = ison.Parser({}, iMaxWorkers=3)
+            try:
+                xParser.Process({"error": f"$!{_sFunc}{{$L{{$int{{%0}}}}, 1, 2, x, 4}}"})
+            except Exception as xEx:
+                xError = xEx
+            # endtry
+
+            lChain = []
+            while xError is not None:
+                lChain.append(xError)
+                xError = getattr(xError, "xChildEx", None)
+            # endwhile
+            return lChain
+
+        # enddef
+
+        lForeach = GetErrorChain("foreach")
+        lPForeach = GetErrorChain("pforeach")
+
+        # Errors of worker processes keep their types and context,
+        # with the index of the failing call added.
+        assert isinstance(lPForeach[4], CParserError_ListSel)
+        lPForeach = lPForeach[:4] + lPForeach[5:]
+        assert [type(x) for x in lPForeach] == [type(x) for x in lForeach]
+        assert [str(x) for x in lPForeach[4:]] == [str(x) for x in lForeach[4:]]
+        assert isinstance(lPForeach[4], CParserError_ProcLambdaPart)
+
+    # enddef
+
 # endclass
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \test_prepare-01.py
+# Created Date: Sunday, October 18th 2026, 11:02:40 am
+# Author: Christian Perwass
+# <LICENSE id="Apache-2.0">
+#
+#   Functional JSON module
+#   Copyright 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# </LICENSE>
+###
+
+
+import pickle
+import ison
+
+
+class TestClass:
+
+    ################################################################################
+    def test_prepare_01(self, tmp_path):
+        (tmp_path / "inc.json").write_text('{"__globals__": {"iBase": 10}, "lStatic": [1, 2, 3]}')
+
+        dicData = {
+            "__includes__": ["inc.json"],
+            "iValue": "$sum{${iBase}, ${iScale}}",
+            "sName": "${sName}",
+        }
+
+        xPrep = ison.Prepare(dicData, sImportPath=tmp_path.as_posix())
+        assert xPrep.iIncludeCount == 1
+        assert xPrep.iExprCount >= 2
+
+        # The include file is not read again, when the document is executed
+        (tmp_path / "inc.json").unlink()
+
+        xResult = xPrep.Execute({"iScale": 1, "sName": "a"})
+        assert xResult == {"lStatic": [1, 2, 3], "iValue": 11, "sName": "a"}
+
+        xPrep = pickle.loads(pickle.dumps(xPrep))
+        xResult = xPrep.Execute({"iScale": 2, "sName": "b"})
+        assert xResult == {"lStatic": [1, 2, 3], "iValue": 12, "sName": "b"}
+
+        assert xPrep.Execute({"iScale": 3, "sName": "c"}, sResultKey="iValue") == 13
+        assert dicData["iValue"] == "$sum{${iBase}, ${iScale}}"
+
+    # enddef
+
+    ################################################################################
+    def test_fold_01(self):
+        dicData = {
+            "__globals__": {
+                "lNames": ["a", "b"],
+                "lIdx": "$range{0, 3}",
+            },
+            "iSum": "$sum{2, 3}",
+            "sNames": "$join{${lNames}, _}",
+            "lIdx": "${lIdx}",
+            "iScaled": "$prod{${iScale}, 2}",
+            "fRand": "$rand.uniform{0, 1}",
+            "dicStatic": {"sName": "${sName}"},
+        }
+
+        xPrep = ison.Prepare(dicData)
+        assert xPrep.iFoldCount == 4
+
+        xResult = xPrep.Execute({"iScale": 3, "sName": "x"})
+        assert xResult["iSum"] == 5
+        assert xResult["sNames"] == "a_b"
+        assert xResult["lIdx"] == [0, 1, 2, 3]
+        assert xResult["iScaled"] == 6
+        assert xResult["dicStatic"] == {"sName": "x"}
+        assert isinstance(xResult["fRand"], float)
+
+        # The folded document gives the same result as the original one
+        xExpect = ison.Prepare(dicData, bFoldConstants=False).Execute({"iScale": 3, "sName": "x"})
+        assert xExpect.keys() == xResult.keys()
+        assert all(xExpect[sKey] == xResult[sKey] for sKey in xResult if sKey != "fRand")
+
+        # Global variables that are defined more than once are not folded
+        dicData["dicStatic"]["__locals__"] = {"lNames": ["c"]}
+        assert ison.Prepare(dicData).iFoldCount == 3
+
+        # The bodies of lambda functions are not folded
+        for xLambda in [["__lambda__", "$sum{2, 3}"], {"__lambda__": True, "iSum": "$sum{2, 3}"}]:
+            dicData = {"__globals__": {"funcA": xLambda}, "sFunc": "${funcA}"}
+            xPrep = ison.Prepare(dicData)
+            assert xPrep.iFoldCount == 0
+            assert xPrep.Execute({}) == ison.Prepare(dicData, bFoldConstants=False).Execute({})
+        # endfor
+
+    # enddef
+
+
+# endclass
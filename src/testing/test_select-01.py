@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \test_select-01.py
+# Created Date: Monday, October 19th 2026, 9:41:52 am
+# Author: Christian Perwass
+# <LICENSE id="Apache-2.0">
+#
+#   Functional JSON module
+#   Copyright 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# </LICENSE>
+###
+
+import ison
+
+
+class TestClass:
+
+    ################################################################################
+    def test_select_01(self):
+        dicData = {
+            "__globals__": {"iBase": 2},
+            "dicP": {"__globals__": {"iP": 7}},
+            "dicG": {"__globals__": {"iG": "$sum{${iP}, ${iBase}}"}},
+            "dicA": {
+                "iB": "$prod{${iG}, 10}",
+                "dicC": {"iD": "${iBase}", "iE": "$div{1, 0}"},
+                "iX": "$div{1, 0}",
+            },
+            "iFail": "$div{1, 0}",
+        }
+
+        # Elements that are not selected and not referenced are not processed
+        for bExprVM in [False, True]:
+            xParser = ison.Parser({}, bExprVM=bExprVM)
+            xResult = xParser.Process(dicData, lSelectPaths=["dicA/iB", "dicA/dicC/iD"])
+            assert xResult == {"dicA": {"iB": 90, "dicC": {"iD": 2}}}
+
+            lResults = xParser.Process(dicData, lProcessPaths=["dicA/iB", "dicA/dicC/iD", "dicX"])
+            assert lResults == [{"dicA": {"iB": 90}}, {"dicA": {"dicC": {"iD": 2}}}, None]
+        # endfor
+
+        assert ison.run.Run(xData=dicData, sResultKey="dicA", lSelectPaths=["iB"]) == {"iB": 90}
+        assert ison.run.Run(xData=dicData, sResultKey="dicG") == {}
+
+    # enddef
+
+
+# endclass
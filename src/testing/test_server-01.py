@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \test_server-01.py
+# Created Date: Monday, October 19th 2026, 4:41:09 pm
+# Author: Christian Perwass
+# <LICENSE id="Apache-2.0">
+#
+#   Functional JSON module
+#   Copyright 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# </LICENSE>
+###
+
+import threading
+
+import pytest
+
+import ison
+
+
+class TestClass:
+
+    ################################################################################
+    def test_server_01(self, tmp_path):
+        (tmp_path / "inc.json").write_text('{"__globals__": {"iBase": 10}}')
+        pathDoc = tmp_path / "doc.json5"
+        pathDoc.write_text('{__includes__: ["inc.json"], a: "$sum{${iBase}, 1}", b: "${iBase}", c: "${run:args:0}"}')
+
+        sSocketPath = (tmp_path / "ison.sock").as_posix()
+        xServer = ison.Server(sSocketPath)
+        xServer.Preload([pathDoc.as_posix()])
+        xServer.Start()
+        xThread = threading.Thread(target=xServer.ServeForever, daemon=True)
+        xThread.start()
+
+        try:
+            with ison.Client(sSocketPath, fTimeout=30.0) as xClient:
+                assert xClient.Ping() is True
+
+                dicConstVars = {"run": {"args": ["x"]}}
+                xResult = xClient.Run(sFile=pathDoc.as_posix(), dicConstVars=dicConstVars)
+                assert xResult == {"a": 11, "b": 10, "c": "x"}
+
+                xResult = xClient.Run(sFile=pathDoc.as_posix(), dicConstVars=dicConstVars, lSelectPaths=["b"])
+                assert xResult == {"b": 10}
+
+                # A changed include file invalidates the prepared document
+                (tmp_path / "inc.json").write_text('{"__globals__": {"iBase": 20}}        ')
+                xResult = xClient.Run(sFile=pathDoc.as_posix(), dicConstVars=dicConstVars, sResultKey="a")
+                assert xResult == 21
+
+                xResult = xClient.Run(
+                    xData='{__includes__: ["inc.json"], d: "${iBase}"}', sImportPath=tmp_path.as_posix()
+                )
+                assert xResult == {"d": 20}
+
+                # An error of a request does not close the connection
+                with pytest.raises(RuntimeError) as xEx:
+                    xClient.Run(xData={"e": "$div{1, 0}"})
+                # endwith
+                assert str(xEx.value).startswith("Error running ISON parser:")
+                assert "Dictionary element 'e'" in str(xEx.value)
+
+                dicStats = xClient.GetStats()
+                assert dicStats["iRequests"] == 7
+                assert dicStats["iErrors"] == 1
+                assert dicStats["iDocuments"] == 3
+
+                xClient.Shutdown()
+            # endwith
+
+            xThread.join(30.0)
+            assert xThread.is_alive() is False
+            assert (tmp_path / "ison.sock").exists() is False
+
+        finally:
+            xServer.Shutdown()
+        # endtry
+
+    # enddef
+
+
+# endclass
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \test_static-01.py
+# Created Date: Wednesday, October 14th 2026, 10:21:05 am
+# Author: Christian Perwass
+# <LICENSE id="Apache-2.0">
+#
+#   Functional JSON module
+#   Copyright 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# </LICENSE>
+###
+
+import ison
+
+
+class TestClass:
+
+    ################################################################################
+    def test_static_01(self):
+        dicData = {
+            "__globals__": {
+                "iA": 2,
+                "lTable": [1, 2],
+            },
+            "dicMesh": {"lVertices": [[0, 0, 0], [1, 0, 0]], "sName": "mesh"},
+            "dicMixed": {"lStatic": [1, 2, 3], "iValue": "$sum{${iA}, 1}"},
+            "lTable": "${lTable}",
+            "sText": "`quoted`",
+        }
+
+        xParser = ison.Parser({})
+        xResult: dict = xParser.Process(dicData)
+
+        assert xResult["dicMixed"] == {"lStatic": [1, 2, 3], "iValue": 3}
+        assert xResult["lTable"] == [1, 2]
+        assert xResult["sText"] == "quoted"
+
+        # Static subtrees are shared with the input data
+        assert xResult["dicMesh"] is dicData["dicMesh"]
+        assert xResult["dicMixed"]["lStatic"] is dicData["dicMixed"]["lStatic"]
+
+        # Variable definitions are not shared, as they are changed during processing
+        assert xResult["__globals__"] is not dicData["__globals__"]
+        assert dicData["lTable"] == "${lTable}"
+
+    # enddef
+
+    ################################################################################
+    def test_copy_on_write_01(self):
+        dicShared = {"dicA": {"iX": 1}, "lB": [1, 2]}
+        dicTrg = {"dicShared": dicShared}
+        ison.util.data.UpdateDict(dicTrg, {"dicShared": {"dicA": {"iY": 2}}}, "test", bCopyOnWrite=True)
+
+        assert dicTrg["dicShared"] == {"dicA": {"iX": 1, "iY": 2}, "lB": [1, 2]}
+        assert dicTrg["dicShared"]["lB"] is dicShared["lB"]
+        assert dicShared == {"dicA": {"iX": 1}, "lB": [1, 2]}
+
+        # Processing must not change the input data
+        dicData = {
+            "__locals__": {"dicV": {"__locals__": {"iA": 1}, "iB": "${iA}"}},
+            "dicC": {"__globals__": {"iG": 3}, "lD": [1, 2]},
+            "iE": "${dicV:iB}",
+        }
+        sData = str(dicData)
+        xResult = ison.run.Run(xData=dicData)
+        assert xResult == {"dicC": {"lD": [1, 2]}, "iE": 1}
+        assert str(dicData) == sData
+
+    # enddef
+
+
+# endclass
@@ -24,6 +24,8 @@
 # </LICENSE>
 ###
 
+import copy
+
 import ison
 
 
@@ -88,5 +90,180 @@ class TestClass:
 
     # enddef
 
+    ################################################################################
+    def test_scope_01(self):
+        dicData = {
+            "__globals__": {"iA": 0},
+            "mOuter": {
+                "__locals__": {"iA": 1, "iB": "$sum{${iA}, 10}"},
+                "__func_locals__": {"sF": "outer"},
+                "mInner": {
+                    "__locals__": {"iA": 2},
+                    "mDeep": {"lX": ["${iA}", "${iB}", "${sF}"]},
+                    "iB": "${iB}",
+                },
+                "iA": "${iA}",
+            },
+            "iA": "${iA}",
+        }
+
+        xResult: dict = ison.run.Run(xData=dicData)
+
+        assert xResult["iA"] == 0
+        assert xResult["mOuter"]["iA"] == 1
+        assert xResult["mOuter"]["mInner"]["iB"] == 11
+        assert xResult["mOuter"]["mInner"]["mDeep"]["lX"] == [2, 11, "outer"]
+
+    # enddef
+
+    ################################################################################
+    def test_lazy_01(self):
+        dicData = {
+            "__globals__": {
+                "iError": "$sum{1, a}",
+                "iUsed": 1,
+            },
+            "mLib": {
+                "__locals__": {"iA": 10},
+                "__globals__": {"iB": "$sum{${iA}, ${iUsed}}"},
+            },
+            "mDoc": {
+                "__locals__": {"iA": 20},
+                "iB": "${iB}",
+            },
+        }
+
+        # Unreferenced variables are not evaluated in lazy mode
+        xResult: dict = ison.run.Run(xData=dicData, bLazyVars=True)
+        # Globals are evaluated in the scope where they are defined
+        assert xResult["mDoc"]["iB"] == 11
+
+        bError = False
+        try:
+            ison.run.Run(xData=dicData)
+        except RuntimeError:
+            bError = True
+        # endtry
+        assert bError is True
+
+    # enddef
+
+    ################################################################################
+    def test_deps_01(self):
+        # Elements that define globals are processed before the elements referencing them
+        dicData = {
+            "x": "${iG}",
+            "mA": {"__globals__": {"iG": "${iH}"}},
+            "mB": {"__globals__": {"iH": 2}},
+        }
+
+        xParser = ison.Parser({})
+        xResult: dict = xParser.Process(dicData)
+        assert xParser.bIsFullyProcessed is True
+        assert list(xResult.keys())[0:3] == ["x", "mA", "mB"]
+        assert xResult["x"] == 2
+
+    # enddef
+
+    ################################################################################
+    def test_cycle_01(self):
+        dicData = {
+            "__globals__": {"iA": "$sum{${iB}, 1}", "iB": "${iA}"},
+            "x": "${iA}",
+        }
+
+        sError = ""
+        try:
+            ison.run.Run(xData=dicData)
+        except RuntimeError as xEx:
+            sError = str(xEx)
+        # endtry
+        assert "Cyclic variable reference: iA -> iB -> iA" in sError
+
+    # enddef
+
+    ################################################################################
+    def test_parallel_keys_01(self):
+        # Independent elements are processed in workers, the others in dependency order
+        dicData = {
+            "__locals__": {"iN": 3, "fInc": "$L{$sum{%0, 1}}"},
+            "a": {"lV": "$!foreach{$fInc, *$range{1, ${iN}}}"},
+            "b": "${iG}",
+            "c": {"__globals__": {"iG": 7}},
+            "d": {"lT": "${@top:a:lV}"},
+            "e": "$!{$fInc, ${iN}}",
+        }
+
+        xParser = ison.Parser({}, iMaxWorkers=2, bParallelKeys=True)
+        xResult: dict = xParser.Process(copy.deepcopy(dicData))
+        assert xParser.bIsFullyProcessed is True
+        assert xResult == ison.Parser({}).Process(copy.deepcopy(dicData))
+        assert list(xResult.keys())[1:6] == ["a", "b", "c", "d", "e"]
+        assert xResult["a"]["lV"] == [2, 3, 4]
+        assert xResult["b"] == 7
+        assert xResult["d"]["lT"] == [2, 3, 4]
+
+        sError = ""
+        try:
+            ison.run.Run(xData={"x": 1, "y": {"z": "$int{a}"}, "w": "$str{b}"}, iMaxWorkers=2, bParallelKeys=True)
+        except RuntimeError as xEx:
+            sError = str(xEx)
+        # endtry
+        assert "Dictionary element 'y' -> dictionary" in sError
+        assert "Dictionary element 'z' -> string" in sError
+        assert "Error converting 'a' to integer" in sError
+
+    # enddef
+
+    ################################################################################
+    def test_reprocess_01(self):
+        dicData = {
+            "a": {"iV": "$sum{${cfg:iA}, 1}"},
+            "b": {"__globals__": {"iG": "${cfg:iB}"}},
+            "c": "$sum{${iG}, 100}",
+            "d": {"lStatic": [1, 2, 3], "sName": "d"},
+            "t": "${@top:a:iV}",
+        }
+
+        xParser = ison.Parser({"cfg": {"iA": 1, "iB": 2}}, bTrackDeps=True)
+        dicResult1: dict = xParser.Process(dicData)
+        assert dicResult1["a"]["iV"] == 2
+        assert dicResult1["c"] == 102
+
+        # Only the elements that depend on 'cfg:iA' are processed again
+        dicResult2: dict = xParser.Reprocess(dicConstVars={"cfg": {"iA": 5}})
+        assert dicResult2["a"]["iV"] == 6
+        assert dicResult2["t"] == 6
+        assert dicResult2["c"] == 102
+        assert dicResult2["d"] is dicResult1["d"]
+
+        # Elements reading a global of an invalid element are invalid themselves
+        dicResult3: dict = xParser.Reprocess(dicConstVars={"cfg": {"iB": 7}})
+        assert dicResult3["c"] == 107
+        assert dicResult3["a"] is dicResult2["a"]
+        assert dicResult3 == ison.Parser({"cfg": {"iA": 5, "iB": 7}}).Process(dicData)
+
+    # enddef
+
+    ################################################################################
+    def test_reprocess_02(self):
+        dicData = {"a": "${cfg:iA}", "r": "$rand.int{0, 1000000000}", "s": "$sum{${cfg:iB}, 1}"}
+
+        # Elements calling impure functions are processed again, also by the expression VM
+        for bExprVM in [False, True]:
+            xParser = ison.Parser({"cfg": {"iA": 1, "iB": 2}}, bTrackDeps=True, bExprVM=bExprVM)
+            dicResult: dict = xParser.Process(dicData)
+            setValues = {dicResult["r"]}
+            for iIdx in range(5):
+                dicResult = xParser.Reprocess(dicConstVars={"cfg": {"iA": iIdx + 2}})
+                assert dicResult["a"] == iIdx + 2
+                assert dicResult["s"] == 3
+                setValues.add(dicResult["r"])
+            # endfor
+            assert len(setValues) > 1
+        # endfor
+
+    # enddef
+
 
 # endclass
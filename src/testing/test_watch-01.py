@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: \test_watch-01.py
+# Created Date: Monday, October 19th 2026, 5:32:18 pm
+# Author: Christian Perwass
+# <LICENSE id="Apache-2.0">
+#
+#   Functional JSON module
+#   Copyright 2022 Robert Bosch GmbH and its subsidiaries
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# </LICENSE>
+###
+
+import io
+import json
+import time
+import tempfile
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+import ison
+
+
+class TestClass:
+
+    ################################################################################
+    def test_watch_01(self):
+        with tempfile.TemporaryDirectory() as sDir:
+            pathDir = Path(sDir)
+            (pathDir / "lib.json").write_text('{"__globals__": {"iLib": 1}}')
+            (pathDir / "in.json").write_text('{"__includes__": ["lib"], "a": "${iLib}", "b": 2}')
+            pathOut = pathDir / "out.json"
+
+            # Change the include file after the first build
+            def Change():
+                while not pathOut.exists():
+                    time.sleep(0.01)
+                # endwhile
+                (pathDir / "lib.json").write_text('{"__globals__": {"iLib": 12}}')
+
+            # enddef
+
+            xThread = threading.Thread(target=Change)
+            xThread.start()
+            xLog = io.StringIO()
+            iBuildCnt = ison.run.Watch(
+                sFileIn=(pathDir / "in.json").as_posix(),
+                sFileOut=pathOut.as_posix(),
+                fPollInterval=0.01,
+                iMaxBuilds=2,
+                xLogStream=xLog,
+            )
+            xThread.join()
+
+            assert iBuildCnt == 2
+            assert json.loads(pathOut.read_text()) == {"a": 12, "b": 2}
+            assert xLog.getvalue().count("Built ") == 2
+        # endwith
+
+    # enddef
+
+    ################################################################################
+    def test_watch_02(self):
+        with tempfile.TemporaryDirectory() as sDir:
+            pathDir = Path(sDir)
+            (pathDir / "lib.json").write_text('{"__globals__": {"iLib": 1}}')
+            (pathDir / "in.json").write_text('{"__includes__": ["lib"], "a": "${iLib}"}')
+            pathOut = pathDir / "out.json"
+
+            # The include file is changed after it has been read by the first build,
+            # but before the build has finished.
+            lLog = []
+
+            def Write(_sText):
+                if len(lLog) == 0:
+                    (pathDir / "lib.json").write_text('{"__globals__": {"iLib": 12}}')
+                # endif
+                lLog.append(_sText)
+
+            # enddef
+
+            iBuildCnt = ison.run.Watch(
+                sFileIn=(pathDir / "in.json").as_posix(),
+                sFileOut=pathOut.as_posix(),
+                fPollInterval=0.01,
+                iMaxBuilds=2,
+                xLogStream=SimpleNamespace(write=Write, flush=lambda: None),
+            )
+
+            assert iBuildCnt == 2
+            assert json.loads(pathOut.read_text()) == {"a": 12}
+            assert "".join(lLog).count("Built ") == 2
+        # endwith
+
+    # enddef
+
+
+# endclass